@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from django.core.management.base import BaseCommand
+
+from weblate.accounts.models import PendingNotification
+from weblate.accounts.notificationqueue import process_notifications
+
+
+class Command(BaseCommand):
+    help = 'delivers queued notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--status',
+            action='store_true',
+            dest='status',
+            default=False,
+            help='only display number of pending and failing notifications'
+        )
+
+    def handle(self, *args, **options):
+        if options['status']:
+            self.stdout.write(
+                'pending: {0}'.format(PendingNotification.objects.count())
+            )
+            self.stdout.write(
+                'failing: {0}'.format(
+                    PendingNotification.objects.filter(attempts__gt=0).count()
+                )
+            )
+            return
+
+        while process_notifications():
+            continue
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.10 on 2018-02-06 09:21
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trans', '0123_pendingupdate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('accounts', '0036_auto_20180201_1059'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingNotification',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.IntegerField(choices=[(1, 'new translation'), (2, 'new contributor')])),
+                ('target', models.TextField(blank=True)),
+                ('old_target', models.TextField(blank=True)),
+                ('old_state', models.IntegerField(default=0)),
+                ('timestamp', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('unit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='trans.Unit')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
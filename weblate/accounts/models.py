@@ -22,11 +22,12 @@ from __future__ import unicode_literals
 
 import datetime
 
-from django.db import models
+from django.db import models, transaction
 from django.dispatch import receiver
 from django.conf import settings
 from django.contrib.auth.signals import user_logged_in
 from django.core.exceptions import ValidationError
+from django.db.models import F
 from django.db.models.signals import post_save
 from django.utils.translation import ugettext_lazy as _
 from django.utils.encoding import python_2_unicode_compatible
@@ -508,6 +509,110 @@ class Profile(models.Model):
             })
 
 
+class PendingNotificationManager(models.Manager):
+    # pylint: disable=no-init
+
+    def enqueue(self, action, unit, user, oldunit=None):
+        """Store notification to be delivered in background.
+
+        This is called within the transaction saving the change, so the
+        notification is stored only together with it.
+        """
+        kwargs = {}
+        if oldunit is not None:
+            kwargs['target'] = unit.target
+            kwargs['old_target'] = oldunit.target
+            kwargs['old_state'] = oldunit.state
+        return self.create(action=action, unit=unit, user=user, **kwargs)
+
+    def claim(self, limit):
+        """Claim batch of due notifications for delivery.
+
+        Claimed entries are leased for NOTIFICATION_TIMEOUT, so that other
+        senders skip them and they are retried in case the sender dies.
+        They are removed only after successful delivery, see finish.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            result = list(
+                self.select_for_update().filter(
+                    next_attempt__lte=now
+                ).select_related(
+                    'user',
+                    'unit__translation__language',
+                    'unit__translation__subproject__project',
+                ).order_by(
+                    'pk'
+                )[:limit]
+            )
+            self.filter(pk__in=[item.pk for item in result]).update(
+                attempts=F('attempts') + 1,
+                next_attempt=now + datetime.timedelta(
+                    seconds=settings.NOTIFICATION_TIMEOUT
+                ),
+            )
+        for item in result:
+            item.attempts += 1
+        return result
+
+    def finish(self, notifications):
+        """Remove delivered notifications."""
+        self.filter(pk__in=[item.pk for item in notifications]).delete()
+
+    def fail(self, notifications):
+        """Schedule retry of failed notifications with exponential backoff.
+
+        Notifications which have reached NOTIFICATION_RETRIES are removed,
+        returns number of these.
+        """
+        now = timezone.now()
+        attempts = {}
+        for item in notifications:
+            attempts.setdefault(item.attempts, []).append(item.pk)
+        removed = 0
+        for count, pks in attempts.items():
+            if count >= settings.NOTIFICATION_RETRIES:
+                removed += self.filter(pk__in=pks).delete()[0]
+                continue
+            delay = settings.NOTIFICATION_BACKOFF * 2 ** (count - 1)
+            self.filter(pk__in=pks).update(
+                next_attempt=now + datetime.timedelta(seconds=delay)
+            )
+        return removed
+
+
+@python_2_unicode_compatible
+class PendingNotification(models.Model):
+    """Notification waiting for delivery."""
+    ACTION_NEW_TRANSLATION = 1
+    ACTION_NEW_CONTRIBUTOR = 2
+
+    ACTION_CHOICES = (
+        (ACTION_NEW_TRANSLATION, 'new translation'),
+        (ACTION_NEW_CONTRIBUTOR, 'new contributor'),
+    )
+
+    action = models.IntegerField(choices=ACTION_CHOICES)
+    unit = models.ForeignKey(
+        'trans.Unit', on_delete=models.deletion.CASCADE,
+    )
+    user = models.ForeignKey(
+        User, on_delete=models.deletion.CASCADE,
+    )
+    # Translation at time of the change, the unit might change meanwhile
+    target = models.TextField(blank=True)
+    old_target = models.TextField(blank=True)
+    old_state = models.IntegerField(default=0)
+    timestamp = models.DateTimeField(default=timezone.now, db_index=True)
+    next_attempt = models.DateTimeField(default=timezone.now, db_index=True)
+    attempts = models.IntegerField(default=0)
+
+    objects = PendingNotificationManager()
+
+    def __str__(self):
+        return '{0}:{1}'.format(self.get_action_display(), self.unit_id)
+
+
 def set_lang(request, profile):
     """Set session language based on user preferences."""
     if profile.language:
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Background delivery of notifications stored in the outbox."""
+
+from __future__ import unicode_literals
+
+from copy import copy
+from datetime import timedelta
+import sys
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from weblate.accounts.models import Profile, PendingNotification
+from weblate.accounts.notifications import get_notification_email, send_mails
+from weblate.permissions.helpers import can_access_project
+from weblate.utils.backgroundqueue import QueueWorkers
+from weblate.utils.errors import report_error
+from weblate.logger import LOGGER
+
+
+def queue_notification(action, unit, user, oldunit=None):
+    """Store notification and wake sender once it is committed.
+
+    Nothing is stored when nobody is subscribed to the notification.
+    """
+    if not get_subscriptions(action, unit.translation, user).exists():
+        return
+    PendingNotification.objects.enqueue(action, unit, user, oldunit)
+    transaction.on_commit(SENDER.wake)
+
+
+def get_subscriptions(action, translation, user):
+    """Return profiles subscribed to the notification."""
+    if action == PendingNotification.ACTION_NEW_TRANSLATION:
+        subscribed = Profile.objects.subscribed_any_translation
+    else:
+        subscribed = Profile.objects.subscribed_new_contributor
+    return subscribed(
+        translation.subproject.project, translation.language, user
+    )
+
+
+def get_event_context(event):
+    """Return template name and context for rendering the notification."""
+    if event.action == PendingNotification.ACTION_NEW_CONTRIBUTOR:
+        return 'new_contributor', {'user': event.user}
+    unit = event.unit
+    oldunit = copy(unit)
+    unit.target = event.target
+    oldunit.target = event.old_target
+    oldunit.state = event.old_state
+    if oldunit.translated:
+        template = 'changed_translation'
+    else:
+        template = 'new_translation'
+    return template, {'unit': unit, 'oldunit': oldunit}
+
+
+def render_event(event, language, email):
+    template, context = get_event_context(event)
+    return get_notification_email(
+        language, email, template, event.unit.translation, context
+    )
+
+
+def render_digest(events, language, email):
+    items = []
+    for event in events:
+        template, context = get_event_context(event)
+        context['template'] = template
+        context['translation'] = event.unit.translation
+        items.append(context)
+    return get_notification_email(
+        language, email, 'digest', context={'events': items},
+        info='{0} notifications'.format(len(events))
+    )
+
+
+def get_recipients(events):
+    """Return mapping of subscribed profiles to their notifications.
+
+    The access check is done once for every user and project in the batch.
+    """
+    profiles = {}
+    recipients = {}
+    access = {}
+    for event in events:
+        project = event.unit.translation.subproject.project
+        subscriptions = get_subscriptions(
+            event.action, event.unit.translation, event.user
+        ).select_related('user')
+        for profile in subscriptions:
+            key = (profile.user_id, project.pk)
+            if key not in access:
+                access[key] = can_access_project(profile.user, project)
+            if not access[key]:
+                continue
+            profiles.setdefault(profile.pk, profile)
+            recipients.setdefault(profile.pk, []).append(event)
+    return [(profiles[pk], recipients[pk]) for pk in sorted(recipients)]
+
+
+def build_mails(events):
+    """Render mails for notifications.
+
+    Every notification is rendered only once for each language and the
+    rendered mail is copied for all recipients. With NOTIFICATION_DIGEST
+    enabled, users receive single mail for all their notifications in the
+    batch.
+    """
+    rendered = {}
+    mails = []
+    for profile, user_events in get_recipients(events):
+        if settings.NOTIFICATION_DIGEST and len(user_events) > 1:
+            groups = [user_events]
+        else:
+            groups = [[event] for event in user_events]
+        for group in groups:
+            key = (profile.language, tuple(event.pk for event in group))
+            email = profile.user.email
+            if key in rendered:
+                mail = copy(rendered[key])
+                mail.to = [email]
+            elif len(group) == 1:
+                mail = render_event(group[0], profile.language, email)
+            else:
+                mail = render_digest(group, profile.language, email)
+            rendered[key] = mail
+            mails.append(mail)
+    return mails
+
+
+def process_notifications():
+    """Deliver single batch of pending notifications.
+
+    With NOTIFICATION_DIGEST set, nothing is delivered until the oldest
+    notification is that many seconds old, so that following ones can be
+    coalesced with it. The notifications are removed only once delivered,
+    failed ones are retried with backoff. Returns number of delivered
+    notifications.
+    """
+    now = timezone.now()
+    if settings.NOTIFICATION_DIGEST:
+        due = now - timedelta(seconds=settings.NOTIFICATION_DIGEST)
+        if not PendingNotification.objects.filter(
+                timestamp__lte=due, next_attempt__lte=now).exists():
+            return 0
+    events = PendingNotification.objects.claim(settings.NOTIFICATION_BATCH)
+    if not events:
+        return 0
+    try:
+        send_mails(build_mails(events), fail_silently=False)
+    except Exception as error:
+        report_error(error, sys.exc_info())
+        removed = PendingNotification.objects.fail(events)
+        LOGGER.error(
+            'failed to deliver %d notifications, giving up on %d: %s',
+            len(events), removed, error
+        )
+        return 0
+    PendingNotification.objects.finish(events)
+    return len(events)
+
+
+class NotificationSender(QueueWorkers):
+    """Single thread delivering notifications from the outbox."""
+    name = 'notification'
+
+    def get_wait(self):
+        return settings.NOTIFICATION_DIGEST or 60
+
+    def is_empty(self):
+        return not PendingNotification.objects.exists()
+
+    def process(self):
+        return process_notifications()
+
+
+SENDER = NotificationSender()
@@ -549,13 +549,18 @@ def send_parse_error(profile, subproject, translation, error, filename):
     )
 
 
-def send_mails(mails):
-    """Send multiple mails in single connection."""
+def send_mails(mails, fail_silently=True):
+    """Send multiple mails in single connection.
+
+    Errors are logged, unless fail_silently is False, when they are raised.
+    """
     try:
         connection = get_connection()
         connection.send_messages(
             [mail for mail in mails if mail is not None]
         )
     except SMTPException as error:
+        if not fail_silently:
+            raise
         LOGGER.error('Failed to send email: %s', error)
         report_error(error, sys.exc_info())
@@ -22,10 +22,21 @@
 Tests for user handling.
 """
 
+from copy import copy
+from datetime import timedelta
+from smtplib import SMTPException
+
 from django.contrib.auth.models import User
 from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test.utils import override_settings
+from django.utils import timezone
 
-from weblate.accounts.models import Profile
+from weblate.accounts.models import Profile, PendingNotification
+from weblate.accounts.notificationqueue import (
+    process_notifications, queue_notification,
+)
 from weblate.accounts.notifications import (
     notify_merge_failure,
     notify_parse_error,
@@ -41,6 +52,7 @@ from weblate.trans.tests.test_views import (
     FixtureTestCase, RegistrationTestMixin,
 )
 from weblate.trans.models import Suggestion, Comment
+from weblate.utils.state import STATE_TRANSLATED
 from weblate.lang.models import Language
 
 
@@ -262,3 +274,141 @@ class NotificationTest(FixtureTestCase, RegistrationTestMixin):
         notify_account_activity(request.user, request, 'password')
         self.assertEqual(len(mail.outbox), 1)
         self.assert_notify_mailbox(mail.outbox[0])
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException('Connection refused')
+
+
+FAILING_BACKEND = (
+    'weblate.accounts.tests.test_notifications.FailingEmailBackend'
+)
+
+
+class NotificationQueueTest(NotificationTest):
+    def change_unit_as(self, user, target, contributor=True):
+        unit = self.get_unit()
+        oldunit = copy(unit)
+        unit.target = target
+        unit.state = STATE_TRANSLATED
+        unit.save(backend=True)
+        PendingNotification.objects.enqueue(
+            PendingNotification.ACTION_NEW_TRANSLATION, unit, user, oldunit
+        )
+        if contributor:
+            PendingNotification.objects.enqueue(
+                PendingNotification.ACTION_NEW_CONTRIBUTOR, unit, user
+            )
+
+    def test_queue(self):
+        self.change_unit_as(self.second_user(), 'Nazdar svete!\n')
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command('process_notifications')
+
+        self.assertEqual(PendingNotification.objects.count(), 0)
+        self.assertEqual(len(mail.outbox), 2)
+        subjects = sorted(message.subject for message in mail.outbox)
+        self.assertEqual(
+            subjects,
+            [
+                '[Weblate] New contributor in Test/Test - Czech',
+                '[Weblate] New translation in Test/Test - Czech',
+            ]
+        )
+
+    def test_queue_changed(self):
+        second_user = self.second_user()
+        self.change_unit_as(second_user, 'Nazdar svete!\n')
+        self.change_unit_as(second_user, 'Ahoj svete!\n', False)
+        process_notifications()
+        messages = [
+            message for message in mail.outbox
+            if 'Changed translation' in message.subject
+        ]
+        self.assertEqual(len(messages), 1)
+        # The mail contains content at time of the change
+        self.assertIn('Nazdar svete!', messages[0].body)
+        self.assertIn('Ahoj svete!', messages[0].body)
+
+    def test_queue_rendered_once(self):
+        profile = Profile.objects.get(user=self.second_user())
+        profile.subscribe_any_translation = True
+        profile.subscribe_new_contributor = True
+        profile.subscriptions.add(self.project)
+        profile.languages.add(Language.objects.get(code='cs'))
+        profile.save()
+        self.change_unit_as(
+            User.objects.create_user('third', 'third@example.org', 'x'),
+            'Nazdar svete!\n'
+        )
+        process_notifications()
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            [
+                'noreply@example.org', 'noreply@example.org',
+                'noreply@weblate.org', 'noreply@weblate.org',
+            ]
+        )
+        # Both users have same language, so mails share rendered content
+        self.assertEqual(
+            len(set(id(message.alternatives) for message in mail.outbox)),
+            2
+        )
+
+    def test_queue_no_subscribers(self):
+        unit = self.get_unit()
+        # Only subscriber is the author of the change
+        queue_notification(
+            PendingNotification.ACTION_NEW_TRANSLATION,
+            unit, self.user, copy(unit)
+        )
+        self.assertFalse(PendingNotification.objects.exists())
+        queue_notification(
+            PendingNotification.ACTION_NEW_TRANSLATION,
+            unit, self.second_user(), copy(unit)
+        )
+        self.assertTrue(PendingNotification.objects.exists())
+
+    def test_queue_retry(self):
+        self.change_unit_as(self.second_user(), 'Nazdar svete!\n')
+
+        with override_settings(EMAIL_BACKEND=FAILING_BACKEND):
+            self.assertEqual(process_notifications(), 0)
+
+        # Failed notifications are kept and retried after backoff
+        self.assertEqual(PendingNotification.objects.count(), 2)
+        self.assertEqual(process_notifications(), 0)
+        PendingNotification.objects.update(next_attempt=timezone.now())
+        self.assertEqual(process_notifications(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(PendingNotification.objects.count(), 0)
+
+    @override_settings(EMAIL_BACKEND=FAILING_BACKEND, NOTIFICATION_RETRIES=2)
+    def test_queue_give_up(self):
+        self.change_unit_as(self.second_user(), 'Nazdar svete!\n')
+        self.assertEqual(process_notifications(), 0)
+        self.assertEqual(PendingNotification.objects.count(), 2)
+        PendingNotification.objects.update(next_attempt=timezone.now())
+        self.assertEqual(process_notifications(), 0)
+        self.assertEqual(PendingNotification.objects.count(), 0)
+
+    @override_settings(NOTIFICATION_DIGEST=60)
+    def test_queue_digest(self):
+        self.change_unit_as(self.second_user(), 'Nazdar svete!\n')
+
+        # Not yet due
+        self.assertEqual(process_notifications(), 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+        PendingNotification.objects.update(
+            timestamp=timezone.now() - timedelta(seconds=120)
+        )
+        self.assertEqual(process_notifications(), 2)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(
+            mail.outbox[0].subject,
+            '[Weblate] 2 notifications at Weblate'
+        )
+        self.assertIn('Nazdar svete!', mail.outbox[0].body)
@@ -54,13 +54,24 @@ class GenerateMoAddon(GettextBaseAddon):
     )
 
     def pre_commit(self, translation):
-        exporter = MoExporter(translation=translation)
-        exporter.add_units(translation)
         output = translation.get_filename()[:-2] + 'mo'
-        with open(output, 'wb') as handle:
-            handle.write(exporter.serialize())
         translation.addon_commit_files.append(output)
 
+        # Skip generating if po file was not changed since last time
+        state = self.instance.state or {}
+        revision = translation.get_git_blob_hash()
+        key = str(translation.pk)
+        if state.get(key) == revision and os.path.exists(output):
+            return
+
+        exporter = MoExporter(translation=translation)
+        with open(output, 'wb') as handle:
+            handle.write(exporter.export_translation(translation))
+
+        state[key] = revision
+        self.instance.state = state
+        self.save_state()
+
 
 class UpdateLinguasAddon(GettextBaseAddon):
     events = (EVENT_POST_ADD,)
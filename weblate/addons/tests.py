@@ -20,6 +20,7 @@
 
 from __future__ import unicode_literals
 
+from gettext import GNUTranslations
 import os
 
 from django.urls import reverse
@@ -36,6 +37,7 @@ from weblate.addons.gettext import (
 )
 from weblate.addons.properties import PropertiesSortAddon
 from weblate.lang.models import Language
+from weblate.trans.exporters import MoExporter
 from weblate.trans.models import Unit
 from weblate.utils.state import STATE_FUZZY, STATE_EMPTY
 
@@ -125,6 +127,39 @@ class GettextAddonTest(ViewTestCase):
             os.path.exists(translation.addon_commit_files[0])
         )
 
+    def test_gettext_mo_unchanged(self):
+        translation = self.get_translation()
+        addon = GenerateMoAddon.create(translation.subproject)
+        addon.pre_commit(translation)
+        filename = translation.addon_commit_files[0]
+        with open(filename, 'wb') as handle:
+            handle.write(b'unchanged')
+        # Not regenerated for same po file
+        addon.pre_commit(translation)
+        with open(filename, 'rb') as handle:
+            self.assertEqual(handle.read(), b'unchanged')
+        # Regenerated after change
+        self.edit_unit('Hello, world!\n', 'Nazdar svete!\n')
+        translation.update_units(None)
+        addon.pre_commit(translation)
+        with open(filename, 'rb') as handle:
+            catalog = GNUTranslations(handle)
+        self.assertEqual(
+            catalog.gettext('Hello, world!\n'), 'Nazdar svete!\n'
+        )
+
+    def test_gettext_mo_content(self):
+        self.edit_unit('Hello, world!\n', 'Nazdar svete!\n')
+        translation = self.get_translation()
+        exporter = MoExporter(translation=translation)
+        exporter.add_units(translation)
+        self.assertEqual(
+            MoExporter(translation=translation).export_translation(
+                translation
+            ),
+            exporter.serialize()
+        )
+
     def test_update_linguas(self):
         translation = self.get_translation()
         self.assertTrue(
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Cursor based pagination for large lists.
+
+Instead of counting all objects and skipping them using offset, the cursor
+encodes position of the last object on the page, so every page is fetched
+using an index range scan no matter how deep in the list it is.
+"""
+
+from __future__ import unicode_literals
+
+from rest_framework.pagination import CursorPagination
+
+
+class ChangePagination(CursorPagination):
+    """Newest changes first.
+
+    The cursor positions only on the first ordering field, so it has to be
+    unique. Changes are created in order, so id follows the timestamp.
+    """
+    ordering = ('-id',)
+
+
+class UnitPagination(CursorPagination):
+    """Units in order they were stored."""
+    ordering = ('id',)
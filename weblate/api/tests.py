@@ -18,12 +18,17 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 
+from io import BytesIO
+import tarfile
+
 from django.contrib.auth.models import User, Group
 from django.core.files import File
 from django.urls import reverse
 
+from rest_framework.settings import api_settings
 from rest_framework.test import APITestCase
 
+from weblate.api.pagination import ChangePagination
 from weblate.screenshots.models import Screenshot
 from weblate.trans.models import Project, Change, Unit, Source
 from weblate.trans.tests.utils import RepoTestMixin, get_test_file
@@ -78,6 +83,17 @@ class APIBaseTest(APITestCase, RepoTestMixin):
             HTTP_AUTHORIZATION='Token ' + self.user.auth_token.key
         )
 
+    def get_archive(self, name, kwargs, fmt=None):
+        """Download archive and return names of contained files."""
+        if fmt is not None:
+            kwargs = dict(kwargs, format=fmt)
+        response = self.client.get(reverse(name, kwargs=kwargs))
+        self.assertEqual(response.status_code, 200)
+        archive = tarfile.open(
+            fileobj=BytesIO(b''.join(response.streaming_content))
+        )
+        return sorted(archive.getnames())
+
     def do_request(self, name, kwargs, data=None, code=200, superuser=False,
                    get=True, request=None, skip=()):
         self.authenticate(superuser)
@@ -182,7 +198,7 @@ class ProjectAPITest(APIBaseTest):
             'api:project-changes',
             self.project_kwargs,
         )
-        self.assertEqual(request.data['count'], 8)
+        self.assertEqual(len(request.data['results']), 8)
 
     def test_statistics(self):
         request = self.do_request(
@@ -191,6 +207,44 @@ class ProjectAPITest(APIBaseTest):
         )
         self.assertEqual(len(request.data), 3)
 
+    def test_archive(self):
+        self.assertEqual(
+            self.get_archive('api:project-archive', self.project_kwargs),
+            [
+                'test/test/po/cs.po',
+                'test/test/po/de.po',
+                'test/test/po/it.po',
+            ]
+        )
+
+    def test_archive_format(self):
+        self.assertEqual(
+            self.get_archive(
+                'api:project-archive', self.project_kwargs, 'xliff'
+            ),
+            [
+                'test/test/test-test-cs.xlf',
+                'test/test/test-test-de.xlf',
+                'test/test/test-test-it.xlf',
+            ]
+        )
+
+    def test_archive_invalid_format(self):
+        response = self.client.get(
+            reverse(
+                'api:project-archive',
+                kwargs={'slug': 'test', 'format': 'invalid'}
+            )
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_archive_acl(self):
+        self.create_acl()
+        response = self.client.get(
+            reverse('api:project-archive', kwargs={'slug': 'acl'})
+        )
+        self.assertEqual(response.status_code, 404)
+
 
 class ComponentAPITest(APIBaseTest):
     def test_list_components(self):
@@ -287,6 +341,18 @@ class ComponentAPITest(APIBaseTest):
             skip=('results', 'previous', 'next'),
         )
 
+    def test_archive(self):
+        self.assertEqual(
+            self.get_archive(
+                'api:component-archive', self.component_kwargs, 'po'
+            ),
+            [
+                'test/test/test-test-cs.po',
+                'test/test/test-test-de.po',
+                'test/test/test-test-it.po',
+            ]
+        )
+
     def test_new_template_404(self):
         self.do_request(
             'api:component-new-template',
@@ -331,7 +397,7 @@ class ComponentAPITest(APIBaseTest):
             'api:component-changes',
             self.component_kwargs,
         )
-        self.assertEqual(request.data['count'], 8)
+        self.assertEqual(len(request.data['results']), 8)
 
 
 class LanguageAPITest(APIBaseTest):
@@ -526,14 +592,14 @@ class TranslationAPITest(APIBaseTest):
             'api:translation-changes',
             self.translation_kwargs,
         )
-        self.assertEqual(request.data['count'], 5)
+        self.assertEqual(len(request.data['results']), 5)
 
     def test_units(self):
         request = self.do_request(
             'api:translation-units',
             self.translation_kwargs,
         )
-        self.assertEqual(request.data['count'], 4)
+        self.assertEqual(len(request.data['results']), 4)
 
 
 class UnitAPITest(APIBaseTest):
@@ -650,7 +716,28 @@ class ChangeAPITest(APIBaseTest):
         response = self.client.get(
             reverse('api:change-list')
         )
-        self.assertEqual(response.data['count'], 8)
+        self.assertEqual(len(response.data['results']), 8)
+        self.assertIsNone(response.data['next'])
+
+    def test_list_changes_cursor(self):
+        expected = list(
+            Change.objects.order_by('-id').values_list(
+                'id', flat=True
+            )
+        )
+        ChangePagination.page_size = 3
+        try:
+            url = reverse('api:change-list')
+            result = []
+            while url:
+                response = self.client.get(url)
+                result.extend(
+                    item['id'] for item in response.data['results']
+                )
+                url = response.data['next']
+        finally:
+            ChangePagination.page_size = api_settings.PAGE_SIZE
+        self.assertEqual(result, expected)
 
     def test_get_change(self):
         response = self.client.get(
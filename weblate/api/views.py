@@ -33,6 +33,7 @@ from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from rest_framework.utils import formatting
 
+from weblate.api.pagination import ChangePagination, UnitPagination
 from weblate.api.serializers import (
     ProjectSerializer, ComponentSerializer, TranslationSerializer,
     LanguageSerializer, LockRequestSerializer, LockSerializer,
@@ -40,6 +41,7 @@ from weblate.api.serializers import (
     ChangeSerializer, SourceSerializer, ScreenshotSerializer,
     UploadRequestSerializer, ScreenshotFileSerializer,
 )
+from weblate.trans.archive import get_archive_response
 from weblate.trans.exporters import EXPORTERS
 from weblate.trans.models import (
     Project, SubProject, Translation, Change, Unit, Source,
@@ -249,6 +251,10 @@ class ProjectViewSet(WeblateViewSet):
     queryset = Project.objects.none()
     serializer_class = ProjectSerializer
     lookup_field = 'slug'
+    raw_urls = (
+        'project-archive',
+    )
+    raw_formats = EXPORTERS
 
     def get_queryset(self):
         return Project.objects.all_acl(self.request.user).prefetch_related(
@@ -278,6 +284,16 @@ class ProjectViewSet(WeblateViewSet):
         return Response(get_project_stats(obj))
 
     @detail_route(methods=['get'])
+    def archive(self, request, **kwargs):
+        obj = self.get_object()
+
+        return get_archive_response(
+            Translation.objects.prefetch().filter(subproject__project=obj),
+            obj.slug,
+            self.format_kwarg or request.query_params.get('format'),
+        )
+
+    @detail_route(methods=['get'], pagination_class=ChangePagination)
     def changes(self, request, **kwargs):
         obj = self.get_object()
 
@@ -299,6 +315,10 @@ class ComponentViewSet(MultipleFieldMixin, WeblateViewSet):
     queryset = SubProject.objects.none()
     serializer_class = ComponentSerializer
     lookup_fields = ('project__slug', 'slug')
+    raw_urls = (
+        'component-archive',
+    )
+    raw_formats = EXPORTERS
 
     def get_queryset(self):
         return SubProject.objects.prefetch().filter(
@@ -349,6 +369,16 @@ class ComponentViewSet(MultipleFieldMixin, WeblateViewSet):
             'application/binary',
         )
 
+    @detail_route(methods=['get'])
+    def archive(self, request, **kwargs):
+        obj = self.get_object()
+
+        return get_archive_response(
+            Translation.objects.prefetch().filter(subproject=obj),
+            '{0}-{1}'.format(obj.project.slug, obj.slug),
+            self.format_kwarg or request.query_params.get('format'),
+        )
+
     @detail_route(methods=['get'])
     def translations(self, request, **kwargs):
         obj = self.get_object()
@@ -380,7 +410,7 @@ class ComponentViewSet(MultipleFieldMixin, WeblateViewSet):
 
         return self.get_paginated_response(serializer.data)
 
-    @detail_route(methods=['get'])
+    @detail_route(methods=['get'], pagination_class=ChangePagination)
     def changes(self, request, **kwargs):
         obj = self.get_object()
 
@@ -432,7 +462,7 @@ class TranslationViewSet(MultipleFieldMixin, WeblateViewSet):
         project = obj.subproject.project
         if request.method == 'GET':
             fmt = self.format_kwarg or request.query_params.get('format')
-            return download_translation_file(obj, fmt)
+            return download_translation_file(request, obj, fmt)
 
         if (not can_upload_translation(request.user, obj) or
                 obj.subproject.locked):
@@ -475,7 +505,7 @@ class TranslationViewSet(MultipleFieldMixin, WeblateViewSet):
 
         return Response(serializer.data)
 
-    @detail_route(methods=['get'])
+    @detail_route(methods=['get'], pagination_class=ChangePagination)
     def changes(self, request, **kwargs):
         obj = self.get_object()
 
@@ -490,7 +520,7 @@ class TranslationViewSet(MultipleFieldMixin, WeblateViewSet):
 
         return self.get_paginated_response(serializer.data)
 
-    @detail_route(methods=['get'])
+    @detail_route(methods=['get'], pagination_class=UnitPagination)
     def units(self, request, **kwargs):
         obj = self.get_object()
 
@@ -596,6 +626,7 @@ class ChangeViewSet(viewsets.ReadOnlyModelViewSet):
 
     queryset = Change.objects.none()
     serializer_class = ChangeSerializer
+    pagination_class = ChangePagination
 
     def get_queryset(self):
         return Change.objects.last_changes(self.request.user)
@@ -30,7 +30,9 @@ from django.utils.translation import ugettext_lazy as _
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils import timezone
 
-from weblate.trans.models import Project, SubProject, Change, Unit
+from weblate.trans.models import (
+    Project, SubProject, Change, ChangeArchive, Unit,
+)
 from weblate.lang.models import Language
 
 
@@ -86,10 +88,13 @@ class Billing(models.Model):
         )
 
     def count_changes(self, interval):
-        return Change.objects.filter(
-            subproject__project__in=self.projects.all(),
-            timestamp__gt=timezone.now() - interval,
-        ).count()
+        return sum(
+            changes.filter(
+                subproject__project__in=self.projects.all(),
+                timestamp__gt=timezone.now() - interval,
+            ).count()
+            for changes in (Change.objects, ChangeArchive.objects)
+        )
 
     def count_changes_1m(self):
         return self.count_changes(timedelta(days=31))
@@ -112,6 +112,7 @@ class GitExportTest(ViewTestCase):
 
     def test_git_receive(self):
         response = self.git_receive()
+        self.assertTrue(response.streaming)
         self.assertContains(response, 'refs/heads/master')
 
     def enable_acl(self):
@@ -20,13 +20,17 @@
 
 from base64 import b64decode
 from email import message_from_string
+import os
 import os.path
 import subprocess
+import threading
 
 from django.contrib.auth.models import User
 from django.core.exceptions import PermissionDenied
 from django.http import Http404
-from django.http.response import HttpResponseServerError, HttpResponse
+from django.http.response import (
+    HttpResponseServerError, HttpResponse, StreamingHttpResponse,
+)
 from django.shortcuts import redirect
 from django.utils.encoding import force_text
 from django.views.decorators.csrf import csrf_exempt
@@ -41,6 +45,8 @@ GIT_PATHS = [
     '/usr/lib/git-core',
 ]
 
+CHUNK_SIZE = 65536
+
 
 def find_git_http_backend():
     """Find git http backend"""
@@ -132,53 +138,140 @@ def git_export(request, project, subproject, path):
     return run_git_http(request, obj, path)
 
 
+def feed_process(request, process):
+    """Pipe request body into the process."""
+    try:
+        while True:
+            data = request.read(CHUNK_SIZE)
+            if not data:
+                break
+            process.stdin.write(data)
+    except (IOError, OSError):
+        # The process has terminated without reading all input
+        pass
+    finally:
+        try:
+            process.stdin.close()
+        except (IOError, OSError):
+            pass
+
+
+def collect_errors(process, errors):
+    """Collect process error output."""
+    errors.append(process.stderr.read())
+
+
+class GitHttpBackend(object):
+    """Running git-http-backend process with streamed input and output."""
+    def __init__(self, git_http_backend, request, obj, path):
+        self.obj = obj
+        self.process = subprocess.Popen(
+            [git_http_backend],
+            env={
+                'REQUEST_METHOD': request.method,
+                'PATH_TRANSLATED': os.path.join(obj.get_path(), path),
+                'GIT_HTTP_EXPORT_ALL': '1',
+                'CONTENT_TYPE': request.META.get('CONTENT_TYPE', ''),
+                'QUERY_STRING': request.META.get('QUERY_STRING', ''),
+                'HTTP_CONTENT_ENCODING': request.META.get(
+                    'HTTP_CONTENT_ENCODING', ''
+                ),
+            },
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self.errors = []
+        self.threads = [
+            threading.Thread(
+                target=feed_process, args=(request, self.process)
+            ),
+            threading.Thread(
+                target=collect_errors, args=(self.process, self.errors)
+            ),
+        ]
+        for thread in self.threads:
+            thread.daemon = True
+            thread.start()
+
+    def read(self):
+        """Read available output, returns empty string on end of file."""
+        return os.read(self.process.stdout.fileno(), CHUNK_SIZE)
+
+    def read_headers(self):
+        """Read CGI headers from the output.
+
+        Returns tuple of headers and already read content, headers are None
+        if the output has ended before them.
+        """
+        output = b''
+        while b'\r\n\r\n' not in output:
+            data = self.read()
+            if not data:
+                return None, output
+            output += data
+        return output.split(b'\r\n\r\n', 1)
+
+    def finish(self):
+        """Wait for the process and log errors, returns exit code."""
+        self.process.stdout.close()
+        retcode = self.process.wait()
+        for thread in self.threads:
+            thread.join()
+        self.process.stderr.close()
+        output_err = b''.join(self.errors)
+        if output_err:
+            self.obj.log_error('git: {0}'.format(force_text(output_err)))
+        return retcode, output_err
+
+    def stream(self, content):
+        """Generator of the remaining output."""
+        try:
+            if content:
+                yield content
+            while True:
+                data = self.read()
+                if not data:
+                    break
+                yield data
+        finally:
+            self.finish()
+
+
 def run_git_http(request, obj, path):
-    """Git HTTP backend execution wrapper."""
+    """Git HTTP backend execution wrapper.
+
+    Both request body and the output are streamed, so the memory usage
+    does not depend on repository size.
+    """
     # Find Git HTTP backend
     git_http_backend = find_git_http_backend()
     if git_http_backend is None:
         return HttpResponseServerError('git-http-backend not found')
 
     # Invoke Git HTTP backend
-    process = subprocess.Popen(
-        [git_http_backend],
-        env={
-            'REQUEST_METHOD': request.method,
-            'PATH_TRANSLATED': os.path.join(obj.get_path(), path),
-            'GIT_HTTP_EXPORT_ALL': '1',
-            'CONTENT_TYPE': request.META.get('CONTENT_TYPE', ''),
-            'QUERY_STRING': request.META.get('QUERY_STRING', ''),
-            'HTTP_CONTENT_ENCODING': request.META.get(
-                'HTTP_CONTENT_ENCODING', ''
-            ),
-        },
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
-    output, output_err = process.communicate(request.body)
-    retcode = process.poll()
+    backend = GitHttpBackend(git_http_backend, request, obj, path)
 
-    # Log error
-    if output_err:
-        obj.log_error('git: {0}'.format(force_text(output_err)))
+    headers, content = backend.read_headers()
 
     # Handle failure
-    if retcode:
-        return HttpResponseServerError(output_err)
+    if headers is None:
+        retcode, output_err = backend.finish()
+        if retcode:
+            return HttpResponseServerError(output_err)
+        return HttpResponseServerError('Invalid git-http-backend output')
 
-    headers, content = output.split(b'\r\n\r\n', 1)
     message = message_from_string(headers.decode('utf-8'))
 
     # Handle status in response
     if 'status' in message:
+        backend.finish()
         return HttpResponse(
             status=int(message['status'].split()[0])
         )
 
     # Send content
-    response = HttpResponse(
+    return StreamingHttpResponse(
+        backend.stream(content),
         content_type=message['content-type']
     )
-    response.write(content)
-    return response
@@ -21,72 +21,29 @@
 Permissions abstract layer for Weblate.
 """
 from django.conf import settings
-from django.contrib.auth.models import Permission
-from django.db.models import Q
 from django.http import Http404
 
 from weblate.accounts.models import get_anonymous
-from weblate.permissions.models import GroupACL
+from weblate.permissions.matrix import (
+    check_permission, get_project_scopes, get_translation_scopes,
+)
 
 
 def has_group_perm(user, permission, translation=None, project=None):
     """Check whether GroupACL rules allow user to have given permission."""
     if user.is_superuser:
         return True
-    if not hasattr(user, 'acl_permissions_groups'):
-        user.acl_permissions_groups = {}
     if translation is not None:
-        key = ('t', translation.pk)
-        groups = GroupACL.objects.filter(
-            (Q(language=translation.language) | Q(language=None)) &
-            (Q(project=translation.subproject.project) | Q(project=None)) &
-            (Q(subproject=translation.subproject) | Q(subproject=None)) &
-            (~Q(language=None, project=None, subproject=None))
-        )
+        scopes = get_translation_scopes(translation)
     elif project is not None:
-        key = ('p', project.pk)
-        groups = GroupACL.objects.filter(
-            project=project, subproject=None, language=None
-        )
+        scopes = get_project_scopes(project)
     else:
         return user.has_perm(permission)
 
-    if key in user.acl_permissions_groups:
-        groupacls = user.acl_permissions_groups[key]
-    else:
-        groupacls = []
-        # Force fetching query
-        acls = list(groups)
-        if acls:
-            # more specific rules are more important:
-            # subproject > project > language
-            acls.sort(reverse=True, key=lambda a: (
-                a.subproject is not None,
-                a.project is not None,
-                a.language is not None))
-            for acl in acls:
-                groupacls.append((
-                    acl.groups.all() & user.groups.all(),
-                    acl.permissions.values_list('id', flat=True)
-                ))
-        user.acl_permissions_groups[key] = groupacls
-
-    # Get permission object
-    app, perm = permission.split('.')
-    perm_obj = Permission.objects.get(
-        content_type__app_label=app,
-        codename=perm
-    )
-
-    for membership, permissions in groupacls:
-        # Does this GroupACL affect this permission?
-        if perm_obj.pk not in permissions:
-            continue
-
-        # Check if group has asked permission
-        return membership.filter(permissions=perm_obj).exists()
-
-    return user.has_perm(permission)
+    result = check_permission(user, permission, scopes)
+    if result is None:
+        return user.has_perm(permission)
+    return result
 
 
 def cache_permission(func):
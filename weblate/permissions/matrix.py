@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Compiled Group ACL permissions.
+
+All Group ACL rules are evaluated for the user at once into a matrix
+mapping (project, component, language) scopes to set of permissions
+filtered by the rule and set of those granted to the user. The matrix is
+stored in the cache under global ACL version, which is increased on any
+change of Group ACL, groups or their membership.
+"""
+
+from __future__ import unicode_literals
+
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+
+from weblate.permissions.models import GroupACL
+from weblate.utils.cacheversion import get_version, invalidate_version
+
+ACL_VERSION_KEY = 'acl-version'
+
+
+def get_acl_version():
+    return get_version(ACL_VERSION_KEY)
+
+
+def invalidate_acl():
+    """Invalidate compiled permissions of all users."""
+    invalidate_version(ACL_VERSION_KEY)
+
+
+def get_permission_names(through, key, **kwargs):
+    """Return mapping of key to set of permission names."""
+    result = {}
+    values = through.objects.filter(**kwargs).values_list(
+        key, 'permission__content_type__app_label', 'permission__codename'
+    )
+    for item, app, codename in values:
+        result.setdefault(item, set()).add('.'.join((app, codename)))
+    return result
+
+
+def compile_permissions(user):
+    """Evaluate all Group ACL rules for the user."""
+    group_ids = list(user.groups.values_list('id', flat=True))
+    group_perms = get_permission_names(
+        Group.permissions.through, 'group_id', group_id__in=group_ids
+    )
+    acl_perms = get_permission_names(
+        GroupACL.permissions.through, 'groupacl_id'
+    )
+    acl_groups = {}
+    memberships = GroupACL.groups.through.objects.filter(
+        group_id__in=group_ids
+    ).values_list(
+        'groupacl_id', 'group_id'
+    )
+    for acl_id, group_id in memberships:
+        acl_groups.setdefault(acl_id, []).append(group_id)
+
+    # Share same sets between rules to keep the cached matrix small
+    shared = {}
+    matrix = {}
+    for acl_id, project, subproject, language in GroupACL.objects.values_list(
+            'id', 'project_id', 'subproject_id', 'language_id'):
+        granted = set()
+        for group_id in acl_groups.get(acl_id, ()):
+            granted.update(group_perms.get(group_id, ()))
+        filtered = frozenset(acl_perms.get(acl_id, ()))
+        granted = frozenset(granted)
+        matrix[(project, subproject, language)] = (
+            shared.setdefault(filtered, filtered),
+            shared.setdefault(granted, granted),
+        )
+    return matrix
+
+
+def get_permission_matrix(user):
+    """Return compiled permissions for user.
+
+    The matrix is loaded from the cache once per request.
+    """
+    if not hasattr(user, 'acl_permissions_matrix'):
+        key = 'acl-matrix-{0}-{1}'.format(user.pk, get_acl_version())
+        matrix = cache.get(key)
+        if matrix is None:
+            matrix = compile_permissions(user)
+            cache.set(key, matrix, 86400)
+        user.acl_permissions_matrix = matrix
+    return user.acl_permissions_matrix
+
+
+def get_translation_scopes(translation):
+    """Return scopes of rules applying to translation.
+
+    They are ordered by importance, more specific rules are more important:
+    subproject > project > language
+    """
+    subproject = translation.subproject
+    project_id = subproject.project_id
+    language_id = translation.language_id
+    return (
+        (project_id, subproject.pk, language_id),
+        (project_id, subproject.pk, None),
+        (None, subproject.pk, language_id),
+        (None, subproject.pk, None),
+        (project_id, None, language_id),
+        (project_id, None, None),
+        (None, None, language_id),
+    )
+
+
+def get_project_scopes(project):
+    return ((project.pk, None, None),)
+
+
+def check_permission(user, permission, scopes):
+    """Check permission using the most specific rule affecting it.
+
+    Returns None if no rule affects the permission.
+    """
+    matrix = get_permission_matrix(user)
+    for scope in scopes:
+        if scope not in matrix:
+            continue
+        filtered, granted = matrix[scope]
+        # Does this GroupACL affect this permission?
+        if permission in filtered:
+            return permission in granted
+    return None
+
+
+def get_acl_projects(user, permission):
+    """Return IDs of projects filtered and granted for the permission."""
+    filtered = set()
+    granted = set()
+    for scope, perms in get_permission_matrix(user).items():
+        project = scope[0]
+        if project is None or permission not in perms[0]:
+            continue
+        filtered.add(project)
+        if permission in perms[1]:
+            granted.add(project)
+    return filtered, granted
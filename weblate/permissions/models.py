@@ -27,7 +27,9 @@ from django.conf import settings
 from django.contrib.auth.models import Group, User, Permission
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models.signals import post_save, post_migrate, m2m_changed
+from django.db.models.signals import (
+    post_save, post_delete, post_migrate, m2m_changed,
+)
 from django.dispatch import receiver
 from django.utils.encoding import python_2_unicode_compatible, force_text
 from django.utils.translation import ugettext_lazy as _
@@ -229,3 +231,24 @@ def change_acl_groups(sender, instance, action, reverse, model, pk_set,
         # Update their permissions
         for update in related:
             update.permissions.set(perms)
+
+
+@receiver(post_save, sender=GroupACL)
+@receiver(post_delete, sender=GroupACL)
+@receiver(post_delete, sender=Group)
+def invalidate_acl_change(sender, **kwargs):
+    """Invalidate compiled permissions on Group ACL change."""
+    from weblate.permissions.matrix import invalidate_acl
+    invalidate_acl()
+
+
+@receiver(m2m_changed, sender=GroupACL.groups.through)
+@receiver(m2m_changed, sender=GroupACL.permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_acl_membership(sender, action, **kwargs):
+    """Invalidate compiled permissions on group or membership change."""
+    if action.split('_')[0] != 'post':
+        return
+    from weblate.permissions.matrix import invalidate_acl
+    invalidate_acl()
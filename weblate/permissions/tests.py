@@ -27,6 +27,7 @@ from django.utils.encoding import force_text
 from weblate.lang.models import Language
 from weblate.trans.models import Project, Translation, Comment
 from weblate.permissions.data import DEFAULT_GROUPS, ADMIN_PERMS
+from weblate.permissions.matrix import get_permission_matrix
 from weblate.permissions.models import AutoGroup, GroupACL
 from weblate.permissions.helpers import (
     has_group_perm, can_delete_comment, can_edit, can_author_translation,
@@ -185,6 +186,24 @@ class GroupACLTest(ModelTestCase):
         self.assertTrue(
             can_edit(self.privileged, self.trans, self.PERMISSION))
 
+    def test_acl_cached(self):
+        acl = GroupACL.objects.create(subproject=self.subproject)
+        acl.groups.add(self.group)
+        self.assertTrue(can_edit(self.privileged, self.trans, self.PERMISSION))
+
+        # Compiled permissions are shared across requests
+        user = User.objects.get(pk=self.privileged.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                get_permission_matrix(user),
+                get_permission_matrix(self.privileged)
+            )
+
+        # Membership change invalidates them
+        self.privileged.groups.remove(self.group)
+        user = User.objects.get(pk=self.privileged.pk)
+        self.assertFalse(can_edit(user, self.trans, self.PERMISSION))
+
     def test_acl_str(self):
         acl = GroupACL()
         self.assertIn(
@@ -309,7 +328,7 @@ class GroupACLTest(ModelTestCase):
             '_group_perm_cache',
             'acl_permissions_cache',
             'acl_permissions_owner',
-            'acl_permissions_groups',
+            'acl_permissions_matrix',
         )
         for cache in attribs:
             for user in (self.user, self.privileged):
@@ -65,6 +65,12 @@ ADMINS = (('Weblate test', 'noreply@weblate.org'), )
 # Different root for test repos
 DATA_DIR = os.path.join(BASE_DIR, 'data-test')
 
+# Do not render widgets in background threads
+WIDGET_PRERENDER = False
+
+# Process updates of saved units immediately
+BACKGROUND_UNIT_UPDATES = False
+
 # Silent logging setup
 LOGGING = {
     'version': 1,
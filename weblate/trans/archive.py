@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Archives with multiple translation files.
+
+The archive is generated on the fly as a compressed tar stream, which
+does not need seekable output or temporary files.
+"""
+
+from __future__ import unicode_literals
+
+from io import BytesIO
+import tarfile
+import time
+
+from django.http import StreamingHttpResponse
+
+from weblate.trans.exporters import get_exporter
+
+
+class ArchiveBuffer(object):
+    """File like object collecting data written by tarfile."""
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    def pop(self):
+        """Return and forget data written so far."""
+        result = b''.join(self.chunks)
+        self.chunks = []
+        return result
+
+
+def get_archive_name(translation, exporter=None):
+    """Return name of translation file inside the archive."""
+    subproject = translation.subproject
+    if exporter is None:
+        name = translation.filename
+    else:
+        name = exporter.get_filename(
+            '{{project}}-{0}-{{language}}.{{extension}}'.format(
+                subproject.slug
+            )
+        )
+    return '/'.join((subproject.project.slug, subproject.slug, name))
+
+
+def add_translation(archive, translation, fmt=None):
+    """Add translation file to the archive."""
+    if fmt is None:
+        # Force flushing pending units
+        author = translation.get_last_author(True)
+        translation.update_units(author)
+
+        filename = translation.get_filename()
+        info = archive.gettarinfo(filename, get_archive_name(translation))
+        # Do not leak server side ownership
+        info.uid = info.gid = 0
+        info.uname = info.gname = ''
+        info.mode = 0o644
+        with open(filename, 'rb') as handle:
+            archive.addfile(info, handle)
+    else:
+        exporter = get_exporter(fmt)(translation=translation)
+        data = b''.join(
+            exporter.iterate_content(exporter.get_units(translation))
+        )
+        info = tarfile.TarInfo(get_archive_name(translation, exporter))
+        info.size = len(data)
+        info.mtime = time.time()
+        info.mode = 0o644
+        archive.addfile(info, BytesIO(data))
+
+
+def iterate_archive(translations, fmt=None):
+    """Generator of tar.gz archive content with translation files.
+
+    Translations are written as they are in the repository or exported
+    to given format. Only single file is kept in memory at time.
+    """
+    output = ArchiveBuffer()
+    archive = tarfile.open(fileobj=output, mode='w|gz')
+    for translation in translations.iterator():
+        add_translation(archive, translation, fmt)
+        yield output.pop()
+    archive.close()
+    yield output.pop()
+
+
+def get_archive_response(translations, name, fmt=None):
+    """Return response streaming archive with translation files."""
+    response = StreamingHttpResponse(
+        iterate_archive(translations, fmt),
+        content_type='application/x-gzip'
+    )
+    response['Content-Disposition'] = 'attachment; filename={0}'.format(
+        name + '.tar.gz'
+    )
+    return response
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Validators and on-disk cache for translation downloads.
+
+Downloads are identified by an ETag derived from the file content hash and
+the last change done in Weblate. Files exported to other formats are stored
+under DATA_DIR using this ETag, so repeated downloads of unchanged
+translations do not need to export them again. Least recently used entries
+are removed once the cache exceeds DOWNLOAD_CACHE_SIZE.
+"""
+
+from __future__ import unicode_literals
+
+import calendar
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.db.models import Max
+
+from weblate.logger import LOGGER
+from weblate.trans.storecache import TEMP_PREFIX, cleanup_cache, remove_entry
+import weblate
+
+
+def get_cache_dir():
+    return os.path.join(settings.DATA_DIR, 'cache', 'downloads')
+
+
+def get_last_change(translation):
+    """Return timestamp of the newest change of any kind in translation.
+
+    Content changes are not enough, editing monolingual template changes
+    source strings of the translation as well.
+    """
+    return translation.change_set.aggregate(
+        Max('timestamp')
+    )['timestamp__max']
+
+
+def get_etag(translation, last_change, fmt=None):
+    """Return ETag for translation download in given format.
+
+    The file itself is identified by its content, exported formats by the
+    revision of the file and the last change in the database, as returned
+    by get_last_change.
+    """
+    if fmt is None:
+        return translation.get_git_blob_hash()
+    key = ':'.join((
+        weblate.VERSION,
+        fmt,
+        translation.revision,
+        last_change.isoformat() if last_change else '',
+    ))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def get_last_modified(translation, last_change):
+    """Return timestamp of last modification of the translation.
+
+    This is the later of last change in Weblate, as returned by
+    get_last_change, and file modification, which covers updates from the
+    repository.
+    """
+    result = int(os.path.getmtime(translation.get_filename()))
+    if last_change is not None:
+        result = max(result, calendar.timegm(last_change.utctimetuple()))
+    return result
+
+
+def get_artifact_path(translation, fmt, etag):
+    return os.path.join(
+        get_cache_dir(),
+        '{0}-{1}-{2}'.format(translation.pk, fmt, etag)
+    )
+
+
+def open_artifact(path):
+    """Open cached artifact, returns None if it does not exist."""
+    try:
+        handle = open(path, 'rb')
+    except (IOError, OSError):
+        return None
+    # Mark entry as recently used
+    os.utime(path, None)
+    return handle
+
+
+def store_artifact(path, chunks):
+    """Pass through content chunks while storing them in the cache.
+
+    The entry is stored only if all the content was generated and it fits
+    into the cache.
+    """
+    dirname = os.path.dirname(path)
+    try:
+        if not os.path.exists(dirname):
+            os.makedirs(dirname)
+        handle, temp = tempfile.mkstemp(dir=dirname, prefix=TEMP_PREFIX)
+    except (IOError, OSError) as error:
+        LOGGER.warning('failed to store download %s: %s', path, error)
+        for chunk in chunks:
+            yield chunk
+        return
+
+    size = 0
+    complete = False
+    try:
+        with os.fdopen(handle, 'wb') as temp_handle:
+            for chunk in chunks:
+                if size <= settings.DOWNLOAD_CACHE_SIZE:
+                    temp_handle.write(chunk)
+                size += len(chunk)
+                yield chunk
+        complete = size <= settings.DOWNLOAD_CACHE_SIZE
+    finally:
+        if complete:
+            try:
+                os.rename(temp, path)
+            except (IOError, OSError) as error:
+                LOGGER.warning(
+                    'failed to store download %s: %s', path, error
+                )
+                complete = False
+        if complete:
+            cleanup_cache(dirname, settings.DOWNLOAD_CACHE_SIZE)
+        else:
+            remove_entry(temp)
@@ -21,14 +21,19 @@
 from __future__ import unicode_literals
 
 import string
+import struct
 
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
+
+from lxml import etree
 
 import six
 
 from translate.misc.multistring import multistring
 from translate.storage.po import pofile
-from translate.storage.mo import mofile, mounit
+from translate.storage.mo import (
+    mofile, mounit, hashpjw, get_next_prime_number, MO_MAGIC_NUMBER,
+)
 from translate.storage.poxliff import PoXliffFile
 from translate.storage.xliff import xlifffile
 from translate.storage.tbx import tbxfile
@@ -37,7 +42,9 @@ from translate.storage.csvl10n import csvfile
 
 import weblate
 from weblate.trans.formats import FileFormat
+from weblate.trans.util import split_plural, is_plural
 from weblate.utils.site import get_site_url
+from weblate.utils.state import STATE_TRANSLATED
 
 if six.PY2:
     _CHARMAP2 = string.maketrans('', '')[:32]
@@ -57,12 +64,76 @@ def get_exporter(name):
     return EXPORTERS[name]
 
 
+def serialize_mo(messages, count):
+    """Serialize Gettext MO file.
+
+    The messages are dictionary of encoded keys and values, count is
+    number of units used to size the hash table. The output is same as
+    translate-toolkit produces, but the content is built in linear time.
+    """
+    # Hash table size is the smallest prime greater than 4 / 3 * count
+    hash_size = max(3, get_next_prime_number(int((count * 4) / 3)))
+    hash_table = [0] * hash_size
+
+    keys = sorted(messages.keys())
+    offsets = []
+    ids = []
+    strs = []
+    ids_length = strs_length = 0
+    for i, key in enumerate(keys):
+        # Add to hash table, see gettext-tools/src/write-mo.c
+        value = hashpjw(key)
+        cursor = value % hash_size
+        increment = 1 + (value % (hash_size - 2))
+        while hash_table[cursor] != 0:
+            cursor = (cursor + increment) % hash_size
+        hash_table[cursor] = i + 1
+
+        string = messages[key]
+        offsets.append((ids_length, len(key), strs_length, len(string)))
+        ids.append(key)
+        strs.append(string)
+        ids_length += len(key) + 1
+        strs_length += len(string) + 1
+
+    # Strings table starts with keys, then values
+    keystart = 7 * 4 + 16 * len(keys) + hash_size * 4
+    valuestart = keystart + ids_length
+    koffsets = []
+    voffsets = []
+    for key_offset, key_length, value_offset, value_length in offsets:
+        koffsets.extend((key_length, key_offset + keystart))
+        voffsets.extend((value_length, value_offset + valuestart))
+
+    output = [
+        struct.pack(
+            'Iiiiiii',
+            MO_MAGIC_NUMBER,
+            0,
+            len(keys),
+            7 * 4,
+            7 * 4 + len(keys) * 8,
+            hash_size,
+            7 * 4 + 2 * (len(keys) * 8)
+        )
+    ]
+    if keys:
+        offsets = koffsets + voffsets
+        output.append(struct.pack('{0}i'.format(len(offsets)), *offsets))
+        output.append(struct.pack('{0}I'.format(hash_size), *hash_table))
+        output.extend(key + b'\0' for key in ids)
+        output.extend(string + b'\0' for string in strs)
+    return b''.join(output)
+
+
 class BaseExporter(object):
     content_type = 'text/plain'
     extension = 'txt'
     name = ''
     has_lang = False
     set_id = False
+    # Whether the file can be sent while it is being generated
+    can_stream = True
 
     def __init__(self, project=None, language=None, url=None,
                  translation=None, fieldnames=None):
@@ -105,11 +176,17 @@ class BaseExporter(object):
             unit.target = self.string_filter(word.target)
         self.storage.addunit(unit)
 
+    @staticmethod
+    def get_units(translation):
+        """Iterate over translation units."""
+        return translation.unit_set.iterator()
+
     def add_units(self, translation):
-        for unit in translation.unit_set.iterator():
+        for unit in self.get_units(translation):
             self.add_unit(unit)
 
-    def add_unit(self, unit):
+    def build_unit(self, unit):
+        """Create translate-toolkit unit for given unit."""
         output = self.storage.UnitClass(
             self.handle_plurals(unit.get_source_plurals())
         )
@@ -139,27 +216,87 @@ class BaseExporter(object):
                     output.settypecomment(flag)
         if unit.fuzzy:
             output.markfuzzy(True)
-        self.storage.addunit(output)
+        return output
 
-    def get_response(self, filetemplate='{project}-{language}.{extension}'):
-        filename = filetemplate.format(
+    def add_unit(self, unit):
+        self.storage.addunit(self.build_unit(unit))
+
+    def remove_unit(self, output):
+        self.storage.units.remove(output)
+
+    def serialize_unit(self, output, head, tail=b''):
+        """Serialize single unit as it appears between head and tail.
+
+        The unit is temporarily added to the storage, which otherwise
+        contains only the file header.
+        """
+        self.storage.addunit(output)
+        try:
+            content = self.serialize()
+            return content[len(head):len(content) - len(tail)]
+        finally:
+            self.remove_unit(output)
+
+    def iterate_content(self, units):
+        """Generator of serialized file content for given units."""
+        head = self.serialize()
+        yield head
+        for unit in units:
+            yield self.serialize_unit(self.build_unit(unit), head)
+
+    def get_filename(self, filetemplate):
+        return filetemplate.format(
             project=self.project.slug,
             language=self.language.code,
             extension=self.extension
         )
 
+    def set_headers(self, response, filetemplate):
+        response['Content-Disposition'] = 'attachment; filename={0}'.format(
+            self.get_filename(filetemplate)
+        )
+        return response
+
+    def get_response(self, filetemplate='{project}-{language}.{extension}'):
         response = HttpResponse(
             content_type='{0}; charset=utf-8'.format(self.content_type)
         )
-        response['Content-Disposition'] = 'attachment; filename={0}'.format(
-            filename
-        )
+        self.set_headers(response, filetemplate)
 
         # Save to response
         response.write(FileFormat.serialize(self.storage))
 
         return response
 
+    def get_streaming_response(
+            self, content, filetemplate='{project}-{language}.{extension}'):
+        """Return response sending content as it is being generated.
+
+        The content is iterable of file chunks, typically returned by
+        iterate_content, which avoids building whole file in memory for
+        big translations.
+        """
+        response = StreamingHttpResponse(
+            content,
+            content_type='{0}; charset=utf-8'.format(self.content_type)
+        )
+        return self.set_headers(response, filetemplate)
+
+    def get_content_response(
+            self, content, filetemplate='{project}-{language}.{extension}'):
+        """Return response for content chunks.
+
+        Formats which can not be written incrementally are sent at once,
+        others use get_streaming_response.
+        """
+        if self.can_stream:
+            return self.get_streaming_response(content, filetemplate)
+        response = HttpResponse(
+            b''.join(content),
+            content_type='{0}; charset=utf-8'.format(self.content_type)
+        )
+        return self.set_headers(response, filetemplate)
+
     def serialize(self):
         """Return storage content"""
         return FileFormat.serialize(self.storage)
@@ -201,6 +338,25 @@ class XMLExporter(BaseExporter):
             return text.translate(None, _CHARMAP2)
         return text.translate(_CHARMAP)
 
+    def remove_unit(self, output):
+        output.xmlelement.getparent().remove(output.xmlelement)
+        super(XMLExporter, self).remove_unit(output)
+
+    def iterate_content(self, units):
+        # Split empty document at the place where units belong
+        marker = etree.Comment('units')
+        self.storage.body.append(marker)
+        head, tail = self.serialize().split(etree.tostring(marker))
+        self.storage.body.remove(marker)
+        separator = b'\n' + head[head.rfind(b'\n') + 1:]
+
+        yield head
+        for i, unit in enumerate(units):
+            if i:
+                yield separator
+            yield self.serialize_unit(self.build_unit(unit), head, tail)
+        yield tail
+
     def get_storage(self):
         raise NotImplementedError()
 
@@ -257,6 +413,8 @@ class MoExporter(BaseExporter):
     content_type = 'application/x-gettext-catalog'
     extension = 'mo'
     has_lang = False
+    # The hash table needs all units
+    can_stream = False
 
     def get_storage(self):
         store = mofile()
@@ -283,6 +441,48 @@ class MoExporter(BaseExporter):
             return
         super(MoExporter, self).add_unit(unit)
 
+    def iterate_content(self, units):
+        # The hash table needs all units, so the file can not be written
+        # incrementally
+        for unit in units:
+            self.add_unit(unit)
+        yield self.serialize()
+
+    def get_messages(self, translation):
+        """Return encoded messages for translated units.
+
+        This works on database rows and avoids creating translate-toolkit
+        units for them, the result is same as for add_units.
+        """
+        header = self.storage.header()
+        messages = {b'': header.target.encode('utf-8')}
+        count = 1
+
+        units = translation.unit_set.filter(
+            state__gte=STATE_TRANSLATED
+        ).values_list(
+            'context', 'source', 'target'
+        )
+        plurals = translation.plural.number
+        for context, source, target in units.iterator():
+            count += 1
+            targets = split_plural(target)
+            if is_plural(source) or is_plural(target):
+                # Pad or strip to expected number of plurals
+                targets = (targets + [''] * plurals)[:plurals]
+            if not targets[0]:
+                continue
+            key = '\0'.join(split_plural(source))
+            if context:
+                key = '\x04'.join((context, key))
+            messages[key.encode('utf-8')] = '\0'.join(targets).encode('utf-8')
+
+        return messages, count
+
+    def export_translation(self, translation):
+        """Return MO file content for translation."""
+        return serialize_mo(*self.get_messages(translation))
+
 
 @register_exporter
 class CSVExporter(BaseExporter):
@@ -32,6 +32,8 @@ import tempfile
 import traceback
 
 
+from django.conf import settings
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 
 import six
@@ -42,16 +44,18 @@ from translate.misc.multistring import multistring
 from translate.storage.lisa import LISAfile
 from translate.storage.php import phpunit, phpfile
 from translate.storage.po import pounit, pofile
-from translate.storage.poheader import default_header
+from translate.storage.poheader import default_header, parseheaderstring
 from translate.storage.properties import propunit, propfile
 from translate.storage.ts2 import tsfile, tsunit
 from translate.storage.xliff import xlifffile, ID_SEPARATOR
 from translate.storage.poxliff import PoXliffFile
 from translate.storage.resx import RESXFile
-from translate.storage import factory
+from translate.storage import factory, pypo
 
 from weblate.lang.models import Plural
 
+from weblate.trans import poreader
+from weblate.trans.storecache import load_store
 from weblate.trans.util import get_string, join_plural, add_configuration_error
 
 from weblate.utils.hash import calculate_hash
@@ -62,6 +66,7 @@ import weblate
 FILE_FORMATS = {}
 FILE_DETECT = []
 FLAGS_RE = re.compile(r'\b[-\w:]+\b')
+FUZZY_RE = re.compile(r'\bfuzzy\b')
 LOCATIONS_RE = re.compile(r'^([+-]|.*, [+-]|.*:[+-])')
 SUPPORTS_FUZZY = (pounit, tsunit)
 
@@ -85,6 +90,30 @@ def move_atomic(source, target):
         os.rename(source, target)
 
 
+def get_language_plural(language, formula):
+    """Return plural object for language matching the formula.
+
+    The plural is created if there is none matching.
+    """
+    if formula is None:
+        return language.plural
+
+    number, equation = formula
+
+    # Find matching one
+    for plural in language.plural_set.all():
+        if plural.same_plural(number, equation):
+            return plural
+
+    # Create new one
+    return Plural.objects.create(
+        language=language,
+        source=Plural.SOURCE_GETTEXT,
+        number=number,
+        equation=equation,
+    )
+
+
 class ParseError(Exception):
     """Generic error for parsing."""
 
@@ -154,6 +183,18 @@ def try_load(filename, content, original_format, template_store):
     raise failure
 
 
+def reformat_flags(typecomments):
+    """Process flags from PO file to nicer form."""
+    # Grab flags
+    flags = set(FLAGS_RE.findall('\n'.join(typecomments)))
+
+    # Discard fuzzy flag, we don't care about that one
+    flags.discard('fuzzy')
+
+    # Join into string
+    return ', '.join(flags)
+
+
 class FileUnit(object):
     """Wrapper for translate-toolkit unit.
 
@@ -181,26 +222,15 @@ class FileUnit(object):
             [x for x in self.mainunit.getlocations() if x is not None]
         )
 
-    def reformat_flags(self, typecomments):
-        """Processe flags from PO file to nicer form."""
-        # Grab flags
-        flags = set(FLAGS_RE.findall('\n'.join(typecomments)))
-
-        # Discard fuzzy flag, we don't care about that one
-        flags.discard('fuzzy')
-
-        # Join into string
-        return ', '.join(flags)
-
     def get_flags(self):
         """Return flags (typecomments) from units.
 
         This is Gettext (po) specific feature."""
         # Merge flags
         if hasattr(self.unit, 'typecomments'):
-            return self.reformat_flags(self.unit.typecomments)
+            return reformat_flags(self.unit.typecomments)
         elif hasattr(self.template, 'typecomments'):
-            return self.reformat_flags(self.template.typecomments)
+            return reformat_flags(self.template.typecomments)
         return ''
 
     def get_comments(self):
@@ -544,6 +574,115 @@ class PHPUnit(FileUnit):
         return self.unit.getsource()
 
 
+class ParsedUnit(object):
+    """Plain copy of unit attributes used when importing to the database.
+
+    Unlike FileUnit, it does not reference translate-toolkit objects, so it
+    can be passed between processes.
+    """
+    def __init__(self, unit):
+        self.id_hash = unit.get_id_hash()
+        self.content_hash = unit.get_content_hash()
+        self.source = unit.get_source()
+        self.target = unit.get_target()
+        self.context = unit.get_context()
+        self.flags = unit.get_flags()
+        self.locations = unit.get_locations()
+        self.comments = unit.get_comments()
+        self.previous_source = unit.get_previous_source()
+        self.translated = unit.is_translated()
+        # None indicates that the format does not store the state
+        self.fuzzy = unit.is_fuzzy(None)
+        self.approved = unit.is_approved(None)
+        # Only presence of template is needed for the import
+        self.template = None if unit.template is None else True
+
+    def get_id_hash(self):
+        return self.id_hash
+
+    def get_content_hash(self):
+        return self.content_hash
+
+    def get_source(self):
+        return self.source
+
+    def get_target(self):
+        return self.target
+
+    def get_context(self):
+        return self.context
+
+    def get_flags(self):
+        return self.flags
+
+    def get_locations(self):
+        return self.locations
+
+    def get_comments(self):
+        return self.comments
+
+    def get_previous_source(self):
+        return self.previous_source
+
+    def is_translated(self):
+        return self.translated
+
+    def is_fuzzy(self, fallback=False):
+        if self.fuzzy is None:
+            return fallback
+        return self.fuzzy
+
+    def is_approved(self, fallback=False):
+        if self.approved is None:
+            return fallback
+        return self.approved
+
+    @staticmethod
+    def is_translatable():
+        return True
+
+
+class ParsedStore(object):
+    """Translatable units and plural formula extracted from parsed file.
+
+    This provides subset of FileFormat interface needed for importing
+    translations to the database.
+    """
+    def __init__(self, store):
+        self.plural_formula = store.get_plural_formula()
+        self.units = [
+            ParsedUnit(unit)
+            for unit in store.all_units() if unit.is_translatable()
+        ]
+
+    def get_plural(self, language):
+        """Return matching plural object."""
+        return get_language_plural(language, self.plural_formula)
+
+    def all_units(self):
+        return self.units
+
+
+# Template stores parsed in current process
+PARSED_TEMPLATES = {}
+
+
+def parse_file(format_id, filename, template=None, language_code=None):
+    """Parse translation file into ParsedStore.
+
+    This is intended to be executed in worker processes.
+    """
+    file_format = FILE_FORMATS[format_id]
+    template_store = None
+    if template is not None:
+        key = (format_id, template)
+        if key not in PARSED_TEMPLATES:
+            PARSED_TEMPLATES[key] = file_format.parse(template)
+        template_store = PARSED_TEMPLATES[key]
+    store = file_format.get_reader(filename, template_store, language_code)
+    return ParsedStore(store)
+
+
 class FileFormat(object):
     """Generic object defining file format loader."""
     name = ''
@@ -570,6 +709,15 @@ class FileFormat(object):
         """Perform optional fixups on store."""
         return store
 
+    @classmethod
+    def get_reader(cls, storefile, template_store=None, language_code=None):
+        """Return object for reading units from the file.
+
+        This parses the file by default, formats can provide lighter
+        alternative for cases where the file is not going to be modified.
+        """
+        return cls.parse(storefile, template_store, language_code)
+
     @classmethod
     def load(cls, storefile):
         """Load file using defined loader."""
@@ -578,6 +726,13 @@ class FileFormat(object):
                 not hasattr(storefile, 'mode')):
             storefile.mode = 'r'
 
+        if (settings.PARSED_STORE_CACHE_SIZE and
+                isinstance(storefile, six.string_types)):
+            return load_store(
+                cls, storefile,
+                lambda data: cls.parse_store(StringIOMode(storefile, data))
+            )
+
         return cls.parse_store(storefile)
 
     @classmethod
@@ -623,9 +778,13 @@ class FileFormat(object):
                 self.store.gettargetlanguage() is None):
             self.store.settargetlanguage(language_code)
 
+    def get_plural_formula(self):
+        """Return plural formula defined in the file, if any."""
+        return None
+
     def get_plural(self, language):
         """Return matching plural object."""
-        return language.plural
+        return get_language_plural(language, self.get_plural_formula())
 
     @property
     def has_template(self):
@@ -635,28 +794,75 @@ class FileFormat(object):
             self.template_store is not None
         )
 
-    def _find_unit_mono(self, context, store):
-        # We search by ID when using template
-        ttkit_unit = store.findid(context)
+    @cached_property
+    def id_index(self):
+        """Index of store units by their ID.
+
+        Units found by translate-toolkit's ID index take precedence,
+        remaining ones are matched by first occurence as findid does not
+        work for empty translations.
+        """
+        result = {}
+        for ttkit_unit in self.store.units:
+            result.setdefault(ttkit_unit.getid(), ttkit_unit)
+        self.store.require_index()
+        result.update(self.store.id_index)
+        return result
 
-        if ttkit_unit is not None:
-            return ttkit_unit
+    @cached_property
+    def source_index(self):
+        """Index of store units by their source strings."""
+        result = {}
+        for ttkit_unit in self.store.units:
+            self._add_source_index(result, ttkit_unit)
+        return result
 
-        # Do not use findid as it does not work for empty translations
-        for search_unit in store.units:
-            if search_unit.getid() == context:
-                return search_unit
+    @cached_property
+    def value_index(self):
+        """Index of store units by source as seen by Weblate."""
+        result = {}
+        for ttkit_unit in self.store.units:
+            result.setdefault(
+                self.unit_class(ttkit_unit).get_source(), ttkit_unit
+            )
+        return result
 
-        return None
+    @staticmethod
+    def _add_source_index(index, ttkit_unit):
+        """Add unit to source index the same way translate-toolkit does."""
+        if ttkit_unit.isheader() or ttkit_unit.isblank():
+            return
+        if ttkit_unit.hasplural():
+            sources = ttkit_unit.source.strings
+        else:
+            sources = [ttkit_unit.source]
+        for source in sources:
+            index.setdefault(source, []).append(ttkit_unit)
+
+    def _update_indexes(self, ttkit_unit):
+        """Add unit to already built indexes."""
+        if 'id_index' in self.__dict__:
+            self.id_index.setdefault(ttkit_unit.getid(), ttkit_unit)
+        if 'source_index' in self.__dict__:
+            self._add_source_index(self.source_index, ttkit_unit)
+        if 'value_index' in self.__dict__:
+            self.value_index.setdefault(
+                self.unit_class(ttkit_unit).get_source(), ttkit_unit
+            )
+
+    @staticmethod
+    def _find_unit_mono(context, store):
+        """Find unit by ID in given FileFormat object."""
+        return store.id_index.get(context)
 
     def _find_unit_template(self, context):
         # Need to create new unit based on template
         template_ttkit_unit = self._find_unit_mono(
-            context, self.template_store.store
+            context, self.template_store
         )
         # We search by ID when using template
         ttkit_unit = self._find_unit_mono(
-            context, self.store
+            context, self
         )
 
         # We always need new unit to translate
@@ -672,7 +878,7 @@ class FileFormat(object):
 
     def _find_unit_bilingual(self, context, source):
         # Find all units with same source
-        found_units = self.store.findunits(source)
+        found_units = self.source_index.get(source)
         # Find is broken for propfile, ignore results
         if found_units and not isinstance(self.store, propfile):
             for ttkit_unit in found_units:
@@ -680,11 +886,10 @@ class FileFormat(object):
                 if ttkit_unit.getcontext() == context:
                     return (self.unit_class(ttkit_unit), False)
         else:
-            # Fallback to manual find for value based files
-            for ttkit_unit in self.store.units:
-                ttkit_unit = self.unit_class(ttkit_unit)
-                if ttkit_unit.get_source() == source:
-                    return (ttkit_unit, False)
+            # Fallback to lookup by value for value based files
+            ttkit_unit = self.value_index.get(source)
+            if ttkit_unit is not None:
+                return (self.unit_class(ttkit_unit), False)
         return (None, False)
 
     def find_unit(self, context, source):
@@ -704,6 +909,7 @@ class FileFormat(object):
             self.store.addunit(ttkit_unit, new=True)
         else:
             self.store.addunit(ttkit_unit)
+        self._update_indexes(ttkit_unit)
 
     def update_header(self, **kwargs):
         """Update store header if available."""
@@ -737,7 +943,7 @@ class FileFormat(object):
 
     def find_matching(self, template_unit):
         """Find matching store unit for template"""
-        return self.store.findid(template_unit.getid())
+        return self.id_index.get(template_unit.getid())
 
     def all_units(self):
         """Generator of all units."""
@@ -761,20 +967,40 @@ class FileFormat(object):
             return len(self.store.units)
         return len(self.template_store.store.units)
 
+    @staticmethod
+    def get_store_mimetype(storeclass):
+        """Return most common mime type for translate-toolkit store."""
+        if storeclass is None or storeclass.Mimetypes is None:
+            # Properties files do not expose mimetype
+            return 'text/plain'
+        return storeclass.Mimetypes[0]
+
+    @staticmethod
+    def get_store_extension(storeclass):
+        """Return most common file extension for translate-toolkit store."""
+        if storeclass is None or storeclass.Extensions is None:
+            return 'txt'
+        return storeclass.Extensions[0]
+
+    @classmethod
+    def get_mimetype(cls):
+        """Return most common mime type for format."""
+        return cls.get_store_mimetype(cls.get_class())
+
+    @classmethod
+    def get_extension(cls):
+        """Return most common file extension for format."""
+        return cls.get_store_extension(cls.get_class())
+
     @property
     def mimetype(self):
         """Return most common mime type for format."""
-        if self.store.Mimetypes is None:
-            # Properties files do not expose mimetype
-            return 'text/plain'
-        return self.store.Mimetypes[0]
+        return self.get_mimetype()
 
     @property
     def extension(self):
         """Return most common file extension for format."""
-        if self.store.Extensions is None:
-            return 'txt'
-        return self.store.Extensions[0]
+        return self.get_extension()
 
     @classmethod
     def is_valid(cls, store):
@@ -922,6 +1148,19 @@ class AutoFormat(FileFormat):
                 return storeclass(storefile, template_store, language_code)
         return cls(storefile, template_store, language_code)
 
+    @classmethod
+    def get_reader(cls, storefile, template_store=None, language_code=None):
+        """Return object for reading units using detected format."""
+        if isinstance(storefile, six.string_types):
+            storeclass = detect_filename(storefile)
+            if storeclass is not None:
+                return storeclass.get_reader(
+                    storefile, template_store, language_code
+                )
+        return super(AutoFormat, cls).get_reader(
+            storefile, template_store, language_code
+        )
+
     @classmethod
     def parse_store(cls, storefile):
         """Directly loads using translate-toolkit."""
@@ -931,6 +1170,132 @@ class AutoFormat(FileFormat):
     def get_class(cls):
         return None
 
+    @property
+    def mimetype(self):
+        """Return most common mime type for detected format."""
+        return self.get_store_mimetype(type(self.store))
+
+    @property
+    def extension(self):
+        """Return most common file extension for detected format."""
+        return self.get_store_extension(type(self.store))
+
+
+class PoEntryUnit(object):
+    """Wrapper for entry read by the streaming PO reader.
+
+    It provides same attributes as PoUnit for the same entry, but only
+    subset of its interface needed for importing translations.
+    """
+    template = None
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.fuzzy = any(FUZZY_RE.search(line) for line in entry.flags)
+
+    def get_id_hash(self):
+        return calculate_hash(self.get_source(), self.get_context())
+
+    def get_content_hash(self):
+        return self.get_id_hash()
+
+    def get_source(self):
+        if self.entry.msgid_plural is None:
+            return self.entry.msgid
+        return join_plural([self.entry.msgid, self.entry.msgid_plural])
+
+    def get_target(self):
+        return join_plural(self.entry.msgstr)
+
+    def get_context(self):
+        return (self.entry.msgctxt or '') + self.entry.msgid_comment
+
+    def get_flags(self):
+        return reformat_flags(self.entry.flags)
+
+    def get_locations(self):
+        locations = []
+        for line in self.entry.references:
+            locations.extend(line.rstrip('\r\n')[3:].split())
+        return ', '.join([poreader.unquote_plus(loc) for loc in locations])
+
+    def get_comments(self):
+        comments = ''.join(
+            [line[2:] for line in self.entry.translator_comments] +
+            [line[3:] for line in self.entry.automatic_comments]
+        )
+        return comments[:-1]
+
+    def get_previous_source(self):
+        if not self.fuzzy:
+            return ''
+        if self.entry.msgid_plural is None:
+            return self.entry.prev_msgid or ''
+        return join_plural([
+            self.entry.prev_msgid or '', self.entry.prev_msgid_plural or ''
+        ])
+
+    def is_translated(self):
+        return bool(self.entry.msgstr and self.entry.msgstr[0]) and \
+            not self.fuzzy
+
+    def is_fuzzy(self, fallback=False):
+        return self.fuzzy
+
+    @staticmethod
+    def is_approved(fallback=False):
+        return fallback
+
+    def is_translatable(self):
+        return not (
+            self.entry.obsolete or
+            poreader.is_header(self.entry) or
+            poreader.is_blank(self.entry)
+        )
+
+
+class PoReader(object):
+    """Streaming read only access to Gettext PO file.
+
+    The file is read line by line using weblate.trans.poreader, without
+    building translate-toolkit units. This provides subset of FileFormat
+    interface needed for importing translations to the database.
+    """
+    def __init__(self, storefile):
+        self.storefile = storefile
+
+    def read_entries(self):
+        """Generator of entries in the file."""
+        with open(self.storefile, 'rb') as handle:
+            try:
+                for entry in poreader.read_entries(handle):
+                    yield entry
+            except (ValueError, LookupError) as error:
+                raise ParseError(
+                    'Failed to parse {0}: {1}'.format(self.storefile, error)
+                )
+
+    def get_plural_formula(self):
+        """Return plural formula defined in the file header."""
+        for entry in self.read_entries():
+            if not poreader.is_header(entry):
+                break
+            header = parseheaderstring(join_plural(entry.msgstr))
+            try:
+                return Plural.parse_formula(header['Plural-Forms'])
+            except (ValueError, KeyError):
+                break
+        return None
+
+    def get_plural(self, language):
+        """Return matching plural object."""
+        return get_language_plural(language, self.get_plural_formula())
+
+    def all_units(self):
+        """Generator of all units."""
+        for entry in self.read_entries():
+            yield PoEntryUnit(entry)
+
 
 @register_fileformat
 class PoFormat(FileFormat):
@@ -950,26 +1315,24 @@ class PoFormat(FileFormat):
         except Exception:
             return False
 
-    def get_plural(self, language):
-        """Return matching plural object."""
+    @classmethod
+    def get_reader(cls, storefile, template_store=None, language_code=None):
+        """Return streaming reader for bilingual files."""
+        if (template_store is None and
+                isinstance(storefile, six.string_types) and
+                issubclass(cls.get_class(), pypo.pofile)):
+            return PoReader(storefile)
+        return super(PoFormat, cls).get_reader(
+            storefile, template_store, language_code
+        )
+
+    def get_plural_formula(self):
+        """Return plural formula defined in the file header."""
         header = self.store.parseheader()
         try:
-            number, equation = Plural.parse_formula(header['Plural-Forms'])
+            return Plural.parse_formula(header['Plural-Forms'])
         except (ValueError, KeyError):
-            return super(PoFormat, self).get_plural(language)
-
-        # Find matching one
-        for plural in language.plural_set.all():
-            if plural.same_plural(number, equation):
-                return plural
-
-        # Create new one
-        return Plural.objects.create(
-            language=language,
-            source=Plural.SOURCE_GETTEXT,
-            number=number,
-            equation=equation,
-        )
+            return None
 
     @classmethod
     def untranslate_store(cls, store, language, fuzzy=False):
@@ -1085,7 +1448,7 @@ class XliffFormat(FileFormat):
         """Find matching store unit for template"""
         return self._find_unit_mono(
             template_unit.source,
-            self.store
+            self
         )
 
     def find_unit(self, context, source):
@@ -1095,7 +1458,7 @@ class XliffFormat(FileFormat):
 
     def _find_unit_bilingual(self, context, source):
         return (
-            self.unit_class(self._find_unit_mono(context, self.store)),
+            self.unit_class(self._find_unit_mono(context, self)),
             False
         )
 
@@ -1191,13 +1554,13 @@ class PhpFormat(FileFormat):
     autoload = ('.php',)
     unit_class = PHPUnit
 
-    @property
-    def mimetype(self):
+    @classmethod
+    def get_mimetype(cls):
         """Return most common mime type for format."""
         return 'text/x-php'
 
-    @property
-    def extension(self):
+    @classmethod
+    def get_extension(cls):
         """Return most common file extension for format."""
         return 'php'
 
@@ -1282,13 +1645,13 @@ class JSONFormat(FileFormat):
     autoload = ('.json',)
     new_translation = '{}\n'
 
-    @property
-    def mimetype(self):
+    @classmethod
+    def get_mimetype(cls):
         """Return most common mime type for format."""
         return 'application/json'
 
-    @property
-    def extension(self):
+    @classmethod
+    def get_extension(cls):
         """Return most common file extension for format."""
         return 'json'
 
@@ -1334,13 +1697,13 @@ class CSVFormat(FileFormat):
                 not isinstance(template_store, CSVFormat)):
             self.template_store = None
 
-    @property
-    def mimetype(self):
+    @classmethod
+    def get_mimetype(cls):
         """Return most common mime type for format."""
         return 'text/csv'
 
-    @property
-    def extension(self):
+    @classmethod
+    def get_extension(cls):
         """Return most common file extension for format."""
         return 'csv'
 
@@ -1394,8 +1757,8 @@ class CSVSimpleFormat(CSVFormat):
     autoload = ('.txt',)
     encoding = 'auto'
 
-    @property
-    def extension(self):
+    @classmethod
+    def get_extension(cls):
         """Return most common file extension for format."""
         return 'txt'
 
@@ -1440,13 +1803,13 @@ class YAMLFormat(FileFormat):
     autoload = ('.pyml',)
     new_translation = '{}\n'
 
-    @property
-    def mimetype(self):
+    @classmethod
+    def get_mimetype(cls):
         """Return most common mime type for format."""
         return 'text/yaml'
 
-    @property
-    def extension(self):
+    @classmethod
+    def get_extension(cls):
         """Return most common file extension for format."""
         return 'yml'
 
@@ -1468,13 +1831,13 @@ class DTDFormat(FileFormat):
     unit_class = MonolingualSimpleUnit
     new_translation = '\n'
 
-    @property
-    def mimetype(self):
+    @classmethod
+    def get_mimetype(cls):
         """Return most common mime type for format."""
         return 'application/xml-dtd'
 
-    @property
-    def extension(self):
+    @classmethod
+    def get_extension(cls):
         """Return most common file extension for format."""
         return 'dtd'
 
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""In-memory matcher of glossary terms.
+
+Glossary of a project and language is compiled into mapping of lowercase
+words to terms containing them, so terms matching a string are found by
+single pass over its words. Compiled glossaries are kept in the process
+memory under glossary version stored in the cache, which is increased on
+any change of the glossary.
+"""
+
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+import threading
+
+from weblate.trans.models.dictionary import Dictionary
+from weblate.utils.cacheversion import get_version, invalidate_version
+
+# Number of compiled glossaries kept in the memory
+GLOSSARY_LIMIT = 32
+
+GLOSSARIES = OrderedDict()
+GLOSSARIES_LOCK = threading.Lock()
+
+
+def get_version_key(project_id, language_id):
+    return 'glossary-version-{0}-{1}'.format(project_id, language_id)
+
+
+def get_glossary_version(project_id, language_id):
+    return get_version(get_version_key(project_id, language_id))
+
+
+def invalidate_glossary(project_id, language_id):
+    """Invalidate compiled glossary in all processes."""
+    invalidate_version(get_version_key(project_id, language_id))
+
+
+def compile_glossary(project_id, language_id):
+    """Return mapping of words to primary keys of terms containing them.
+
+    Whole terms are included as well, so that tokens spanning several
+    words match.
+    """
+    result = {}
+    terms = Dictionary.objects.filter(
+        project_id=project_id, language_id=language_id
+    ).values_list(
+        'pk', 'source'
+    )
+    for pk, source in terms.iterator():
+        source = source.lower()
+        for word in set(source.split()) | {source}:
+            result.setdefault(word, []).append(pk)
+    return result
+
+
+def get_glossary(project_id, language_id):
+    """Return compiled glossary, compiling it if needed."""
+    key = (project_id, language_id)
+    version = get_glossary_version(project_id, language_id)
+    with GLOSSARIES_LOCK:
+        if key in GLOSSARIES and GLOSSARIES[key][0] == version:
+            # Mark glossary as recently used
+            GLOSSARIES[key] = GLOSSARIES.pop(key)
+            return GLOSSARIES[key][1]
+    glossary = compile_glossary(project_id, language_id)
+    with GLOSSARIES_LOCK:
+        GLOSSARIES.pop(key, None)
+        GLOSSARIES[key] = (version, glossary)
+        while len(GLOSSARIES) > GLOSSARY_LIMIT:
+            GLOSSARIES.popitem(last=False)
+    return glossary
+
+
+def match_glossary(project_id, language_id, words):
+    """Return primary keys of glossary terms containing any of words."""
+    glossary = get_glossary(project_id, language_id)
+    result = set()
+    for word in words:
+        result.update(glossary.get(word, ()))
+    return result
@@ -26,12 +26,16 @@ from django.db import transaction
 
 from weblate.lang.models import Language
 from weblate.trans.models import Unit, SubProject, Translation
+from weblate.utils.backgroundqueue import no_threads
 from weblate.logger import LOGGER
 
 
 class WeblateCommand(BaseCommand):
     def execute(self, *args, **options):
-        """Wrapper to configure logging prior execution."""
+        """Wrapper to configure logging prior execution.
+
+        The command does not start any background threads, see no_threads.
+        """
         verbosity = int(options['verbosity'])
         if verbosity > 1:
             LOGGER.setLevel(logging.DEBUG)
@@ -39,7 +43,8 @@ class WeblateCommand(BaseCommand):
             LOGGER.setLevel(logging.INFO)
         else:
             LOGGER.setLevel(logging.ERROR)
-        super(WeblateCommand, self).execute(*args, **options)
+        with no_threads():
+            super(WeblateCommand, self).execute(*args, **options)
 
     def handle(self, *args, **options):
         """
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from __future__ import unicode_literals
+
+from datetime import timedelta
+import gzip
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from weblate.trans.models import Change
+
+
+class Command(BaseCommand):
+    help = 'archives changes older than given age'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--age',
+            action='store',
+            type=int,
+            dest='age',
+            default=settings.CHANGE_ARCHIVE_DAYS,
+            help='Age of changes to archive in days'
+        )
+        parser.add_argument(
+            '--output',
+            dest='output',
+            default=None,
+            help=(
+                'File where to write changes as compressed JSON lines '
+                'instead of archive table'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if not options['age']:
+            raise CommandError('Please specify age of changes to archive!')
+
+        if (options['output'] and
+                'weblate.billing' in settings.INSTALLED_APPS):
+            raise CommandError(
+                'Can not write changes to file with billing enabled, '
+                'billing needs them in the archive table!'
+            )
+
+        cutoff = timezone.now() - timedelta(days=options['age'])
+
+        if options['output']:
+            with gzip.open(options['output'], 'wb') as output:
+                count = Change.objects.archive(cutoff, output)
+        else:
+            count = Change.objects.archive(cutoff)
+
+        if int(options['verbosity']) >= 1:
+            self.stdout.write('Archived {0} changes'.format(count))
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from multiprocessing import Pipe, Process
+import resource
+import time
+
+from django.core.management.base import BaseCommand
+
+from weblate.trans.formats import FILE_FORMATS, ParsedUnit
+
+
+class Command(BaseCommand):
+    """Compare parsing files with reading them by streaming reader."""
+    help = 'benchmarks parsing and reading of translation files'
+
+    def add_arguments(self, parser):
+        super(Command, self).add_arguments(parser)
+        parser.add_argument(
+            '--format',
+            default='auto',
+            choices=sorted(FILE_FORMATS.keys()),
+            help='file format to use',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=1,
+            help='number of repetitions',
+        )
+        parser.add_argument(
+            'files',
+            nargs='+',
+            help='translation files to read',
+        )
+
+    @staticmethod
+    def read_units(store):
+        count = 0
+        for unit in store.all_units():
+            if unit.is_translatable():
+                ParsedUnit(unit)
+                count += 1
+        return count
+
+    def parse(self, file_format, filename):
+        return self.read_units(file_format.parse(filename))
+
+    def read(self, file_format, filename):
+        return self.read_units(file_format.get_reader(filename))
+
+    @staticmethod
+    def get_maxrss():
+        """Return peak resident memory of current process in kB."""
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    def run_measure(self, pipe, method, file_format, filename, repeat):
+        initial = self.get_maxrss()
+        start = time.time()
+        for dummy in range(repeat):
+            count = method(file_format, filename)
+        duration = (time.time() - start) / repeat
+        pipe.send((count, duration, self.get_maxrss() - initial))
+        pipe.close()
+
+    def measure(self, method, file_format, filename, repeat):
+        """Measure method in separate process.
+
+        The peak memory usage is tracked by the operating system, so
+        each measurement needs fresh process to not be affected by the
+        previous ones.
+        """
+        receiver, sender = Pipe(False)
+        process = Process(
+            target=self.run_measure,
+            args=(sender, method, file_format, filename, repeat)
+        )
+        process.start()
+        result = receiver.recv()
+        process.join()
+        return result
+
+    def handle(self, *args, **options):
+        file_format = FILE_FORMATS[options['format']]
+        self.stdout.write(
+            '{0:40} {1:8} {2:>8} {3:>10} {4:>12}'.format(
+                'File', 'Method', 'Units', 'Time [s]', 'Memory [kB]'
+            )
+        )
+        for filename in options['files']:
+            for name, method in (('parse', self.parse), ('read', self.read)):
+                count, duration, peak = self.measure(
+                    method, file_format, filename, options['repeat']
+                )
+                self.stdout.write(
+                    '{0:40} {1:8} {2:8d} {3:10.3f} {4:12d}'.format(
+                        filename[-40:], name, count, duration, peak
+                    )
+                )
@@ -18,12 +18,15 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 
+from datetime import timedelta
 import os.path
 import time
 
+from django.conf import settings
 from django.core.files.storage import DefaultStorage
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.utils import timezone
 
 from social_django.models import Partial
 
@@ -49,6 +52,14 @@ class Command(BaseCommand):
         self.cleanup_fulltext()
         self.cleanup_files()
         self.cleanup_social()
+        self.cleanup_changes()
+
+    def cleanup_changes(self):
+        """Archive old changes."""
+        if settings.CHANGE_ARCHIVE_DAYS:
+            Change.objects.archive(
+                timezone.now() - timedelta(days=settings.CHANGE_ARCHIVE_DAYS)
+            )
 
     def cleanup_social(self):
         """Cleanup expired partial social authentications."""
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from django.core.management.base import CommandError
+
+from weblate.trans.archive import iterate_archive
+from weblate.trans.exporters import EXPORTERS
+from weblate.trans.management.commands import WeblateLangCommand
+
+
+class Command(WeblateLangCommand):
+    help = 'Export tar.gz archive with translation files'
+
+    def add_arguments(self, parser):
+        super(Command, self).add_arguments(parser)
+        parser.add_argument(
+            '--format',
+            default=None,
+            choices=sorted(EXPORTERS.keys()),
+            help='Export files in given format instead of original files',
+        )
+        parser.add_argument(
+            '--output',
+            required=True,
+            help='File to write archive to',
+        )
+
+    def handle(self, *args, **options):
+        translations = self.get_translations(**options)
+        if not translations.exists():
+            raise CommandError('No translations found!')
+        content = iterate_archive(translations, options['format'])
+
+        with open(options['output'], 'wb') as output:
+            for chunk in content:
+                output.write(chunk)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from __future__ import unicode_literals
+
+import argparse
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.http.request import HttpRequest
+
+from weblate.lang.models import Language
+from weblate.trans.models import Dictionary, Project
+
+
+class Command(BaseCommand):
+    help = 'imports glossary'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--author',
+            default='noreply@weblate.org',
+            help=(
+                'Email address of author (has to be registered in Weblate)'
+            )
+        )
+        method = parser.add_mutually_exclusive_group()
+        method.add_argument(
+            '--overwrite',
+            action='store_const',
+            const='overwrite',
+            dest='method',
+            default='',
+            help='Overwrite existing glossary entries'
+        )
+        method.add_argument(
+            '--add',
+            action='store_const',
+            const='add',
+            dest='method',
+            help='Add as other translation of existing glossary entries'
+        )
+        parser.add_argument(
+            'project',
+            help='Project slug',
+        )
+        parser.add_argument(
+            'language',
+            help='Language code',
+        )
+        parser.add_argument(
+            'file',
+            type=argparse.FileType('rb'),
+            help='File to import',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.get(slug=options['project'])
+        except Project.DoesNotExist:
+            raise CommandError('Project does not exist!')
+        try:
+            language = Language.objects.get(code=options['language'])
+        except Language.DoesNotExist:
+            raise CommandError('Language does not exist!')
+        try:
+            user = User.objects.get(email=options['author'])
+        except User.DoesNotExist:
+            raise CommandError('Import user does not exist!')
+
+        # Create fake request object
+        request = HttpRequest()
+        request.user = user
+
+        try:
+            count = Dictionary.objects.upload(
+                request, project, language, options['file'],
+                options['method']
+            )
+        except Exception as error:
+            raise CommandError(
+                'Failed to import glossary file: {0}'.format(error)
+            )
+        finally:
+            options['file'].close()
+
+        if int(options['verbosity']) >= 1:
+            self.stdout.write('Imported {0} glossary entries'.format(count))
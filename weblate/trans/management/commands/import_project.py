@@ -35,6 +35,7 @@ from weblate.trans.models import SubProject, Project
 from weblate.trans.formats import FILE_FORMATS
 from weblate.trans.util import is_repo_link, path_separator
 from weblate.trans.vcs import VCS_REGISTRY
+from weblate.utils.backgroundqueue import no_threads
 from weblate.logger import LOGGER
 
 
@@ -145,6 +146,11 @@ class Command(BaseCommand):
         self.logger = LOGGER
         self._mask_regexp = None
 
+    def execute(self, *args, **options):
+        """Wrapper not starting background threads, see no_threads."""
+        with no_threads():
+            return super(Command, self).execute(*args, **options)
+
     def format_string(self, template, match):
         """Format template string with match."""
         if '%s' in template:
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from weblate.trans.management.commands import WeblateCommand
+from weblate.trans.models import PendingUnitUpdate
+from weblate.trans.unitqueue import process_unit_update
+
+
+class Command(WeblateCommand):
+    help = 'processes queued updates of saved translations'
+
+    def add_arguments(self, parser):
+        super(Command, self).add_arguments(parser)
+        parser.add_argument(
+            '--limit',
+            action='store',
+            type=int,
+            dest='limit',
+            default=1000,
+            help='number of updates to process in one run'
+        )
+        parser.add_argument(
+            '--status',
+            action='store_true',
+            dest='status',
+            default=False,
+            help='only display queue status'
+        )
+
+    def handle(self, *args, **options):
+        if options['status']:
+            stats = PendingUnitUpdate.objects.stats()
+            for key in ('pending', 'due', 'failing'):
+                self.stdout.write('{0}: {1}'.format(key, stats[key]))
+            self.stdout.write('oldest: {0:.0f}s'.format(stats['age']))
+            return
+
+        for dummy in range(options['limit']):
+            if not process_unit_update():
+                break
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from django.core.management.base import BaseCommand
+
+from weblate.trans.vcsprofile import get_profile, reset_profile
+
+
+class Command(BaseCommand):
+    help = 'lists timing of VCS operations and repository locking'
+
+    def add_arguments(self, parser):
+        super(Command, self).add_arguments(parser)
+        parser.add_argument(
+            '--limit',
+            action='store',
+            type=int,
+            dest='limit',
+            default=50,
+            help='number of entries to list'
+        )
+        parser.add_argument(
+            '--component',
+            action='store',
+            dest='component',
+            default=None,
+            help='limit output to <project/component>'
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            dest='reset',
+            default=False,
+            help='remove collected data'
+        )
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            reset_profile()
+            return
+
+        profile = get_profile()
+        if options['component']:
+            profile = [
+                item for item in profile
+                if item['component'] == options['component']
+            ]
+
+        self.stdout.write(
+            '{0:<40} {1:<12} {2:>7} {3:>6} {4:>10} {5:>9} {6:>12} '
+            '{7:>10}'.format(
+                'Component', 'Operation', 'Count', 'Errors', 'Time [s]',
+                'Max [s]', 'Output [B]', 'Lock [s]',
+            )
+        )
+        for item in profile[:options['limit']]:
+            self.stdout.write(
+                '{component:<40} {operation:<12} {count:>7} {errors:>6} '
+                '{time:>10.2f} {max_time:>9.2f} {bytes:>12} '
+                '{lock_wait:>10.2f}'.format(**item)
+            )
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.10 on 2018-02-07 10:41
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+import django.db.models.deletion
+
+
+def fill_activity(apps, schema_editor):
+    """Aggregate existing changes into daily activity."""
+    Change = apps.get_model('trans', 'Change')
+    DailyActivity = apps.get_model('trans', 'DailyActivity')
+    db_alias = schema_editor.connection.alias
+    changes = Change.objects.using(db_alias).annotate(
+        day=TruncDate('timestamp')
+    ).values(
+        'day',
+        'translation',
+        'translation__subproject',
+        'translation__subproject__project',
+        'translation__language',
+        'user',
+    ).annotate(
+        count=Count('id')
+    ).order_by()
+    activity = []
+    for item in changes.iterator():
+        activity.append(DailyActivity(
+            day=item['day'],
+            translation_id=item['translation'],
+            subproject_id=item['translation__subproject'],
+            project_id=item['translation__subproject__project'],
+            language_id=item['translation__language'],
+            user_id=item['user'],
+            count=item['count'],
+        ))
+        if len(activity) >= 1000:
+            DailyActivity.objects.using(db_alias).bulk_create(activity)
+            activity = []
+    DailyActivity.objects.using(db_alias).bulk_create(activity)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lang', '0010_auto_20180129_1443'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('trans', '0123_pendingupdate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyActivity',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(db_index=True)),
+                ('count', models.IntegerField(default=0)),
+                ('language', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='lang.Language')),
+                ('project', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='trans.Project')),
+                ('subproject', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='trans.SubProject')),
+                ('translation', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='trans.Translation')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(
+            fill_activity, migrations.RunPython.noop, elidable=True
+        ),
+    ]
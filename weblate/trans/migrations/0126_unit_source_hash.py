@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.10 on 2018-02-09 09:12
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import F
+
+from weblate.utils.hash import calculate_hash
+
+
+BATCH_SIZE = 1000
+
+
+def fill_source_hash(apps, schema_editor):
+    """Calculate hash of source for existing units.
+
+    Units with context are processed in batches ordered by primary key, so
+    that neither the loaded sources nor the updated keys grow with the size
+    of the database.
+    """
+    Unit = apps.get_model('trans', 'Unit')
+    db_alias = schema_editor.connection.alias
+    units = Unit.objects.using(db_alias)
+    # Content hash without context is the source hash
+    units.filter(context='').update(source_hash=F('content_hash'))
+    with_context = units.exclude(context='').order_by('pk')
+    last = 0
+    while True:
+        batch = list(
+            with_context.filter(pk__gt=last).values_list(
+                'pk', 'source'
+            )[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+        hashes = {}
+        for pk, source in batch:
+            hashes.setdefault(calculate_hash(source, ''), []).append(pk)
+        for source_hash, pks in hashes.items():
+            units.filter(pk__in=pks).update(source_hash=source_hash)
+        last = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trans', '0125_changearchive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='unit',
+            name='source_hash',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            fill_source_hash, migrations.RunPython.noop, elidable=True
+        ),
+        migrations.AlterIndexTogether(
+            name='unit',
+            index_together=set([('translation', 'source_hash'), ('translation', 'content_hash'), ('translation', 'position')]),
+        ),
+    ]
@@ -44,13 +44,17 @@ from weblate.trans.models.comment import Comment
 from weblate.trans.models.suggestion import Suggestion, Vote
 from weblate.trans.models.check import Check
 from weblate.trans.models.search import IndexUpdate
-from weblate.trans.models.change import Change
+from weblate.trans.models.updatequeue import PendingUpdate
+from weblate.trans.models.unitqueue import PendingUnitUpdate
+from weblate.trans.models.change import Change, ChangeArchive
+from weblate.trans.models.activity import DailyActivity
 from weblate.trans.models.dictionary import Dictionary
 from weblate.trans.models.source import Source
 from weblate.trans.models.whiteboard import WhiteboardMessage
 from weblate.trans.models.componentlist import (
     ComponentList, AutoComponentList,
 )
+from weblate.trans.glossary import invalidate_glossary
 from weblate.trans.signals import (
     vcs_post_push, vcs_post_update, vcs_pre_commit, vcs_post_commit,
     user_pre_delete, translation_post_add,
@@ -64,7 +68,8 @@ from weblate.utils.decorators import disable_for_loaddata
 __all__ = [
     'Project', 'SubProject', 'Translation', 'Unit', 'Check', 'Suggestion',
     'Comment', 'Vote', 'IndexUpdate', 'Change', 'Dictionary', 'Source',
-    'WhiteboardMessage', 'ComponentList',
+    'WhiteboardMessage', 'ComponentList', 'PendingUpdate', 'DailyActivity',
+    'ChangeArchive', 'PendingUnitUpdate',
     'WeblateConf',
 ]
 
@@ -140,6 +145,13 @@ def update_suggestion_flag(sender, instance, **kwargs):
         unit.translation.invalidate_cache()
 
 
+@receiver(post_delete, sender=Dictionary)
+@receiver(post_save, sender=Dictionary)
+def update_glossary(sender, instance, **kwargs):
+    """Invalidate compiled glossary."""
+    invalidate_glossary(instance.project_id, instance.language_id)
+
+
 @receiver(vcs_post_push)
 def post_push(sender, component, **kwargs):
     run_post_push_script(component)
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models import F, Sum
+from django.utils import timezone
+from django.utils.encoding import python_2_unicode_compatible
+
+import six.moves
+
+
+def get_day(value=None):
+    """Return day of given time in current time zone."""
+    if value is None:
+        value = timezone.now()
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date()
+
+
+def bucket_counts(counts, start, days, step):
+    """Sum daily counts into intervals of step days.
+
+    Returns list of interval start and number of changes in it.
+    """
+    result = []
+    for offset in six.moves.range(0, days, step):
+        int_start = start + timedelta(days=offset)
+        result.append((
+            int_start,
+            sum(
+                counts.get(int_start + timedelta(days=day), 0)
+                for day in six.moves.range(step)
+            )
+        ))
+    return result
+
+
+class DailyActivityQuerySet(models.QuerySet):
+    # pylint: disable=no-init
+
+    def filter_stats(self, project=None, subproject=None, translation=None,
+                     language=None, user=None):
+        """Filter activity for given object."""
+        result = self
+        if translation is not None:
+            result = result.filter(translation=translation)
+        elif subproject is not None:
+            result = result.filter(subproject=subproject)
+        elif project is not None:
+            result = result.filter(project=project)
+
+        if language is not None:
+            result = result.filter(language=language)
+
+        if user is not None:
+            result = result.filter(user=user)
+
+        return result
+
+    def count_stats(self, days, step):
+        """Count number of changes in last days grouped by step days.
+
+        All days are fetched using single query on aggregated rows.
+        """
+        start = get_day() - timedelta(days=days - 1)
+        counts = dict(
+            self.filter(
+                day__gte=start
+            ).values_list(
+                'day'
+            ).annotate(
+                Sum('count')
+            ).order_by()
+        )
+        return bucket_counts(counts, start, days, step)
+
+    def record(self, change, count=1):
+        """Count change in the daily activity."""
+        day = get_day(change.timestamp)
+        lookup = {
+            'day': day,
+            'translation': change.translation,
+            'user': change.user,
+        }
+        # Only single row is updated in case concurrent creation
+        # has created duplicate one
+        pks = self.filter(**lookup).values_list('pk', flat=True)[:1]
+        if pks:
+            self.filter(pk=pks[0]).update(count=F('count') + count)
+            return
+        if change.translation is not None:
+            subproject = change.translation.subproject
+            lookup['subproject'] = subproject
+            lookup['project_id'] = subproject.project_id
+            lookup['language_id'] = change.translation.language_id
+        self.create(count=count, **lookup)
+
+    def record_changes(self, changes):
+        """Count changes in the daily activity.
+
+        The changes are counted per day, translation and user first, so
+        that there is single update for each of these.
+        """
+        buckets = OrderedDict()
+        for change in changes:
+            key = (
+                get_day(change.timestamp),
+                change.translation_id,
+                change.user_id,
+            )
+            if key in buckets:
+                buckets[key][1] += 1
+            else:
+                buckets[key] = [change, 1]
+        for change, count in buckets.values():
+            self.record(change, count)
+
+
+@python_2_unicode_compatible
+class DailyActivity(models.Model):
+    """Number of changes done by user in translation during a day.
+
+    This is used for activity charts, which would otherwise need to
+    aggregate whole Change table.
+    """
+    day = models.DateField(db_index=True)
+    project = models.ForeignKey(
+        'Project', null=True, on_delete=models.deletion.CASCADE
+    )
+    subproject = models.ForeignKey(
+        'SubProject', null=True, on_delete=models.deletion.CASCADE
+    )
+    translation = models.ForeignKey(
+        'Translation', null=True, on_delete=models.deletion.CASCADE
+    )
+    language = models.ForeignKey(
+        'lang.Language', null=True, on_delete=models.deletion.CASCADE
+    )
+    user = models.ForeignKey(
+        User, null=True, on_delete=models.deletion.CASCADE
+    )
+    count = models.IntegerField(default=0)
+
+    objects = DailyActivityQuerySet.as_manager()
+
+    class Meta(object):
+        app_label = 'trans'
+
+    def __str__(self):
+        return '{0}: {1}'.format(self.day, self.count)
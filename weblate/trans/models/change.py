@@ -19,16 +19,16 @@
 #
 from __future__ import unicode_literals
 
-from django.db import models
-from django.db.models import Count, Q
+import json
+
+from django.db import models, transaction
+from django.db.models import Max, Q
 from django.contrib.auth.models import User
-from django.utils import timezone
 from django.utils.encoding import python_2_unicode_compatible, force_text
 from django.utils.translation import ugettext as _, ugettext_lazy
 
-import six.moves
-
 from weblate.trans.mixins import UserDisplayMixin
+from weblate.trans.models.activity import DailyActivity
 from weblate.trans.models.project import Project
 
 
@@ -45,59 +45,16 @@ class ChangeQuerySet(models.QuerySet):
             user__isnull=False,
         )
 
-    @staticmethod
-    def count_stats(days, step, dtstart, base):
-        """Count number of changes in given dataset and period grouped by
-        step days.
-        """
-
-        # Count number of changes
-        result = []
-        for dummy in six.moves.range(0, days, step):
-            # Calculate interval
-            int_start = dtstart
-            int_end = int_start + timezone.timedelta(days=step)
-
-            # Count changes
-            int_base = base.filter(timestamp__range=(int_start, int_end))
-            count = int_base.aggregate(Count('id'))
-
-            # Append to result
-            result.append((int_start, count['id__count']))
-
-            # Advance to next interval
-            dtstart = int_end
-
-        return result
-
     def base_stats(self, days, step,
                    project=None, subproject=None, translation=None,
                    language=None, user=None):
-        """Core of daily/weekly/monthly stats calculation."""
-
-        # Get range (actually start)
-        dtstart = timezone.now() - timezone.timedelta(days=days + 1)
-
-        # Base for filtering
-        base = self.all()
-
-        # Filter by translation/project
-        if translation is not None:
-            base = base.filter(translation=translation)
-        elif subproject is not None:
-            base = base.filter(translation__subproject=subproject)
-        elif project is not None:
-            base = base.filter(translation__subproject__project=project)
-
-        # Filter by language
-        if language is not None:
-            base = base.filter(translation__language=language)
-
-        # Filter by language
-        if user is not None:
-            base = base.filter(user=user)
+        """Core of daily/weekly/monthly stats calculation.
 
-        return self.count_stats(days, step, dtstart, base)
+        The stats are calculated from daily aggregated activity.
+        """
+        return DailyActivity.objects.filter_stats(
+            project, subproject, translation, language, user
+        ).count_stats(days, step)
 
     def prefetch(self):
         """Fetch related fields in a big chungs to avoid loading them
@@ -140,17 +97,82 @@ class ChangeQuerySet(models.QuerySet):
         )
 
     def authors_list(self, translation, date_range=None):
-        """Return list of authors."""
-        authors = self.content().filter(
-            translation=translation
-        )
-        if date_range is not None:
-            authors = authors.filter(
-                timestamp__range=date_range
+        """Return list of authors.
+
+        Archived changes are included as well.
+        """
+        querysets = [self]
+        if self.model is Change:
+            querysets.append(ChangeArchive.objects.all())
+        result = []
+        for changes in querysets:
+            authors = changes.content().filter(
+                translation=translation
             )
-        return authors.values_list(
-            'author__email', 'author__first_name'
+            if date_range is not None:
+                authors = authors.filter(
+                    timestamp__range=date_range
+                )
+            result.extend(authors.values_list(
+                'author__email', 'author__first_name'
+            ))
+        return result
+
+    def archive(self, cutoff, output=None, batch=1000):
+        """Move changes older than cutoff to the archive.
+
+        With output file given, the changes are written to it as JSON lines
+        instead of storing them in the archive table, so these are no longer
+        included in the billing counts. Returns number of archived changes.
+
+        The last change and the last content change of every translation are
+        kept, these are used to find author of pending changes and to
+        validate cached downloads.
+        """
+        # The kept changes are looked up once, there are at most two of them
+        # for every translation
+        kept = set()
+        for base in (self, self.content()):
+            kept.update(
+                base.exclude(
+                    translation=None
+                ).values(
+                    'translation'
+                ).annotate(
+                    latest=Max('id')
+                ).values_list(
+                    'latest', flat=True
+                ).order_by()
+            )
+        changes = self.filter(
+            timestamp__lt=cutoff
+        ).order_by(
+            'pk'
         )
+        total = 0
+        last = 0
+        while True:
+            with transaction.atomic():
+                values = list(
+                    changes.filter(pk__gt=last).values(*ARCHIVE_FIELDS)[:batch]
+                )
+                if not values:
+                    return total
+                last = values[-1]['id']
+                values = [item for item in values if item['id'] not in kept]
+                if not values:
+                    continue
+                if output is None:
+                    ChangeArchive.objects.bulk_create(
+                        [ChangeArchive(**item) for item in values]
+                    )
+                else:
+                    for item in values:
+                        item['timestamp'] = item['timestamp'].isoformat()
+                        output.write(json.dumps(item).encode('utf-8'))
+                        output.write(b'\n')
+                self.filter(pk__in=[item['id'] for item in values]).delete()
+            total += len(values)
 
 
 class ChangeManager(models.Manager):
@@ -160,6 +182,14 @@ class ChangeManager(models.Manager):
             user = None
         return super(ChangeManager, self).create(user=user, **kwargs)
 
+    def bulk_create(self, objs, *args, **kwargs):
+        """Wrapper doing same updates as Change.save for all changes."""
+        for change in objs:
+            change.fill_related()
+        result = super(ChangeManager, self).bulk_create(objs, *args, **kwargs)
+        DailyActivity.objects.record_changes(objs)
+        return result
+
 
 @python_2_unicode_compatible
 class Change(models.Model, UserDisplayMixin):
@@ -379,10 +409,72 @@ class Change(models.Model, UserDisplayMixin):
             self.ACTION_NEW_UNIT,
         )
 
-    def save(self, *args, **kwargs):
+    def fill_related(self):
+        """Fill in translation and component based on unit."""
         if self.unit:
             self.translation = self.unit.translation
         if self.translation:
             self.subproject = self.translation.subproject
             self.translation.invalidate_last_change()
+
+    def save(self, *args, **kwargs):
+        self.fill_related()
+        created = self.pk is None
         super(Change, self).save(*args, **kwargs)
+        if created:
+            DailyActivity.objects.record(self)
+
+
+ARCHIVE_FIELDS = (
+    'id', 'unit_id', 'subproject_id', 'translation_id', 'dictionary_id',
+    'user_id', 'author_id', 'timestamp', 'action', 'target', 'old',
+)
+
+
+@python_2_unicode_compatible
+class ChangeArchive(models.Model):
+    """Changes moved out of the Change table after CHANGE_ARCHIVE_DAYS.
+
+    These are not used for listing changes, only reports include them.
+    """
+    id = models.IntegerField(primary_key=True)
+    unit = models.ForeignKey(
+        'Unit', null=True, on_delete=models.deletion.CASCADE,
+        related_name='+',
+    )
+    subproject = models.ForeignKey(
+        'SubProject', null=True, on_delete=models.deletion.CASCADE,
+        related_name='+',
+    )
+    translation = models.ForeignKey(
+        'Translation', null=True, on_delete=models.deletion.CASCADE,
+        related_name='+',
+    )
+    dictionary = models.ForeignKey(
+        'Dictionary', null=True, on_delete=models.deletion.CASCADE,
+        related_name='+',
+    )
+    user = models.ForeignKey(
+        User, null=True, on_delete=models.deletion.CASCADE,
+        related_name='+',
+    )
+    author = models.ForeignKey(
+        User, null=True, on_delete=models.deletion.CASCADE,
+        related_name='+',
+    )
+    timestamp = models.DateTimeField(db_index=True)
+    action = models.IntegerField(
+        choices=Change.ACTION_CHOICES,
+        default=Change.ACTION_CHANGE
+    )
+    target = models.TextField(default='', blank=True)
+    old = models.TextField(default='', blank=True)
+
+    objects = ChangeQuerySet.as_manager()
+
+    class Meta(object):
+        ordering = ['-timestamp']
+        app_label = 'trans'
+
+    def __str__(self):
+        return '{0} at {1}'.format(self.get_action_display(), self.timestamp)
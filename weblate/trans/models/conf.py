@@ -99,6 +99,30 @@ class WeblateConf(AppConf):
     # Whether to run hooks in background
     BACKGROUND_HOOKS = True
 
+    # Number of threads processing background hooks
+    BACKGROUND_HOOKS_WORKERS = 4
+
+    # Retries and backoff (in seconds) for failed background updates
+    BACKGROUND_HOOKS_RETRIES = 5
+    BACKGROUND_HOOKS_BACKOFF = 60
+
+    # Time (in seconds) after which stalled background update is retried
+    BACKGROUND_HOOKS_TIMEOUT = 3600
+
+    # Process side effects of saving translations in background
+    BACKGROUND_UNIT_UPDATES = True
+
+    # Retries, backoff and stall timeout (in seconds) for unit updates
+    BACKGROUND_UNIT_UPDATES_RETRIES = 5
+    BACKGROUND_UNIT_UPDATES_BACKOFF = 10
+    BACKGROUND_UNIT_UPDATES_TIMEOUT = 600
+
+    # Locking of VCS repositories
+    VCS_LOCK_BACKEND = 'weblate.utils.filelock.FileLock'
+
+    # Threshold (in seconds) for logging slow VCS operations
+    VCS_SLOW_OPERATION = 10
+
     # Number of nearby messages to show in each direction
     NEARBY_MESSAGES = 5
 
@@ -112,6 +136,24 @@ class WeblateConf(AppConf):
     # Offload indexing
     OFFLOAD_INDEXING = False
 
+    # Size (in bytes) of cache of parsed translation files, 0 to disable
+    PARSED_STORE_CACHE_SIZE = 0
+
+    # Number of processes used to parse translation files on import
+    PARSE_PROCESSES = 1
+
+    # Timeout (in seconds) for waiting on file parsed by worker process
+    PARSE_TIMEOUT = 300
+
+    # Size (in bytes) of cache of exported translation files, 0 to disable
+    DOWNLOAD_CACHE_SIZE = 0
+
+    # Age (in days) of changes to move to archive, 0 to disable
+    CHANGE_ARCHIVE_DAYS = 0
+
+    # Render commonly used widgets in background when stats change
+    WIDGET_PRERENDER = True
+
     # List of quality checks
     CHECK_LIST = (
         'weblate.trans.checks.same.SameCheck',
@@ -242,6 +284,15 @@ class WeblateConf(AppConf):
     ADMINS_CONTACT = []
     ADMINS_HOSTING = []
 
+    # Notifications delivery
+    NOTIFICATION_BATCH = 100
+    NOTIFICATION_DIGEST = 0
+
+    # Retries, backoff and lease (in seconds) for failed notifications
+    NOTIFICATION_RETRIES = 5
+    NOTIFICATION_BACKOFF = 60
+    NOTIFICATION_TIMEOUT = 600
+
     # Special chars for visual keyboard
     SPECIAL_CHARS = ('\t', '\n', '…')
 
@@ -24,7 +24,8 @@ import re
 import sys
 
 from django.urls import reverse
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import Case, Value, When
 from django.utils.encoding import python_2_unicode_compatible
 
 from whoosh.analysis import LanguageAnalyzer, NgramAnalyzer, SimpleAnalyzer
@@ -33,7 +34,6 @@ from weblate.lang.models import Language
 from weblate.trans.checks.same import strip_string
 from weblate.trans.formats import AutoFormat
 from weblate.trans.models.project import Project
-from weblate.utils.db import re_escape
 from weblate.utils.errors import report_error
 
 
@@ -45,62 +45,129 @@ class DictionaryManager(models.Manager):
 
     def upload(self, request, project, language, fileobj, method):
         """Handle dictionary upload."""
-        from weblate.trans.models.change import Change
         store = AutoFormat.parse(fileobj)
+        return self.bulk_upload(
+            request.user, project, language,
+            (
+                (unit.get_source(), unit.get_target())
+                for dummy, unit in store.iterate_merge(False)
+            ),
+            method
+        )
 
+    def bulk_upload(self, user, project, language, entries, method,
+                    batch=1000):
+        """Import glossary entries.
+
+        Existing entries are loaded at once, new ones are created and
+        overwritten ones are updated in batches. Single change is recorded
+        for the whole import. Returns number of imported entries.
+        """
+        words = self.get_existing(project, language)
+        created = []
+        updated = {}
         ret = 0
-
-        # process all units
-        for dummy, unit in store.iterate_merge(False):
-            source = unit.get_source()
-            target = unit.get_target()
-
+        for source, target in entries:
             # Ignore too long words
             if len(source) > 190 or len(target) > 190:
                 continue
 
-            # Get object
-            try:
-                word, created = self.get_or_create(
+            if source not in words:
+                word = Dictionary(
                     project=project,
                     language=language,
                     source=source,
-                    defaults={
-                        'target': target,
-                    },
+                    target=target,
                 )
-            except Dictionary.MultipleObjectsReturned:
-                word = self.filter(
-                    project=project,
-                    language=language,
-                    source=source
-                )[0]
-                created = False
+                created.append(word)
+                words[source] = (word, {target})
+                ret += 1
+                continue
 
             # Already existing entry found
-            if not created:
-                # Same as current -> ignore
-                if target == word.target:
-                    continue
-                if method == 'add':
-                    # Add word
-                    word = self.create(
-                        user=request.user,
-                        action=Change.ACTION_DICTIONARY_UPLOAD,
-                        project=project,
-                        language=language,
-                        source=source,
-                        target=target
-                    )
-                elif method == 'overwrite':
-                    # Update word
-                    word.target = target
-                    word.save()
-
+            word, targets = words[source]
+            # Same as current -> ignore
+            if target in targets:
+                continue
+            if method == 'add':
+                # Add word
+                created.append(Dictionary(
+                    project=project,
+                    language=language,
+                    source=source,
+                    target=target,
+                ))
+                targets.add(target)
+            elif method == 'overwrite':
+                # Update word
+                targets.discard(word.target)
+                targets.add(target)
+                word.target = target
+                if word.pk is not None:
+                    updated[word.pk] = target
             ret += 1
 
+        if created or updated:
+            self.bulk_save(user, project, language, created, updated, batch)
+
         return ret
 
+    def get_existing(self, project, language):
+        """Return mapping of source to first entry and set of targets."""
+        words = {}
+        existing = self.filter(
+            project=project, language=language
+        ).values_list(
+            'pk', 'source', 'target'
+        )
+        for pk, source, target in existing.iterator():
+            if source in words:
+                words[source][1].add(target)
+            else:
+                words[source] = (
+                    Dictionary(pk=pk, source=source, target=target),
+                    {target}
+                )
+        return words
+
+    @transaction.atomic
+    def bulk_save(self, user, project, language, created, updated, batch):
+        """Store imported entries and record the upload."""
+        from weblate.trans.glossary import invalidate_glossary
+        from weblate.trans.models.change import Change
+
+        self.bulk_create(created, batch_size=batch)
+        pks = sorted(updated)
+        # Every updated entry needs three query parameters, primary key in
+        # the filter and both in the CASE expression
+        limit = connections[self.db].ops.bulk_batch_size(
+            ('pk', 'pk', 'target'), pks
+        )
+        update_batch = max(1, min(batch, limit))
+        for offset in range(0, len(pks), update_batch):
+            chunk = pks[offset:offset + update_batch]
+            self.filter(pk__in=chunk).update(target=Case(
+                *[When(pk=pk, then=Value(updated[pk])) for pk in chunk]
+            ))
+
+        # Link the change to one of imported entries
+        if updated:
+            word = self.get(pk=pks[0])
+        else:
+            word = self.filter(
+                project=project,
+                language=language,
+                source=created[0].source,
+                target=created[0].target,
+            )[0]
+        Change.objects.create(
+            action=Change.ACTION_DICTIONARY_UPLOAD,
+            dictionary=word,
+            user=user,
+            target=word.target,
+        )
+        invalidate_glossary(project.pk, language.pk)
+
     def create(self, user, **kwargs):
         """Create new dictionary object."""
         from weblate.trans.models.change import Change
@@ -116,6 +183,7 @@ class DictionaryManager(models.Manager):
 
     def get_words(self, unit):
         """Return list of word pairs for an unit."""
+        from weblate.trans.glossary import match_glossary
         words = set()
         source_language = unit.translation.subproject.project.source_language
 
@@ -151,13 +219,12 @@ class DictionaryManager(models.Manager):
             # No extracted words, no dictionary
             return self.none()
 
-        # Build the query for fetching the words
-        # We want case insensitive lookup
+        # Find matching terms in compiled glossary
         return self.filter(
-            project=unit.translation.subproject.project,
-            language=unit.translation.language,
-            source__iregex=r'(^|[ \t\n\r\f\v])({0})($|[ \t\n\r\f\v])'.format(
-                '|'.join([re_escape(word) for word in words])
+            pk__in=match_glossary(
+                unit.translation.subproject.project_id,
+                unit.translation.language_id,
+                words
             )
         )
 
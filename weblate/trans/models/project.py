@@ -28,10 +28,11 @@ from django.utils.translation import ugettext as _, ugettext_lazy, pgettext
 from django.utils.encoding import python_2_unicode_compatible
 from django.core.exceptions import ValidationError
 from django.urls import reverse
-from django.contrib.auth.models import Permission, User, Group
+from django.contrib.auth.models import User, Group
 
 from weblate.accounts.models import Profile
 from weblate.lang.models import Language, get_english_lang
+from weblate.permissions.matrix import get_acl_projects
 from weblate.trans.mixins import URLMixin, PathMixin
 from weblate.utils.stats import ProjectStats
 from weblate.utils.site import get_site_url
@@ -48,26 +49,21 @@ class ProjectManager(models.Manager):
         if user.is_superuser:
             return self.values_list('id', flat=True)
         if not hasattr(user, 'acl_ids_cache'):
-            permission = Permission.objects.get(codename='access_project')
+            # Projects where access is filtered by GroupACL and those
+            # where current user has GroupACL based access
+            filtered, have_access = get_acl_projects(
+                user, 'trans.access_project'
+            )
 
             not_filtered = set()
             # Projects where access is not filtered by GroupACL
             if user.has_perm('trans.access_project'):
                 not_filtered = set(self.exclude(
-                    groupacl__permissions=permission
+                    pk__in=filtered
                 ).values_list(
                     'id', flat=True
                 ))
 
-            # Projects where current user has GroupACL based access
-            have_access = set(self.filter(
-                groupacl__permissions=permission,
-                groupacl__groups__permissions=permission,
-                groupacl__groups__user=user,
-            ).values_list(
-                'id', flat=True
-            ))
-
             user.acl_ids_cache = not_filtered | have_access
 
         return user.acl_ids_cache
@@ -21,6 +21,7 @@
 from __future__ import unicode_literals
 
 from glob import glob
+from multiprocessing import Pool
 import os
 import sys
 import time
@@ -39,10 +40,13 @@ from django.core.cache import cache
 from django.utils import timezone
 
 from weblate.utils import messages
-from weblate.trans.formats import FILE_FORMAT_CHOICES, FILE_FORMATS, ParseError
+from weblate.trans.formats import (
+    FILE_FORMAT_CHOICES, FILE_FORMATS, ParseError, parse_file,
+)
 from weblate.trans.mixins import URLMixin, PathMixin
 from weblate.trans.fields import RegexField
 from weblate.utils.site import get_site_url
+from weblate.utils.backgroundqueue import threads_allowed
 from weblate.utils.errors import report_error
 from weblate.trans.util import (
     is_repo_link, cleanup_repo_url, cleanup_path, path_separator,
@@ -1014,6 +1018,96 @@ class SubProject(models.Model, URLMixin, PathMixin):
         translations = set()
         languages = set()
         matches = self.get_mask_matches()
+        pool, parsed = self.parse_translations(matches, force, langs)
+        try:
+            self.sync_translations(
+                matches, parsed, translations, languages,
+                force, langs, request, changed_template
+            )
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+        # Delete possibly no longer existing translations
+        if langs is None:
+            todelete = self.translation_set.exclude(id__in=translations)
+            if todelete.exists():
+                with transaction.atomic():
+                    self.log_info(
+                        'removing stale translations: %s',
+                        ','.join([trans.language.code for trans in todelete])
+                    )
+                    todelete.delete()
+
+        # Process linked repos
+        for subproject in self.get_linked_childs():
+            self.log_info(
+                'updating linked project %s',
+                subproject
+            )
+            subproject.create_translations(force, langs, request=request)
+
+        self.log_info('updating completed')
+
+    def parse_translations(self, matches, force=False, langs=None):
+        """Start parsing of changed translation files in worker processes.
+
+        Returns the pool and dictionary of pending results indexed by
+        filename. Parsing in parallel is used only if enabled by
+        PARSE_PROCESSES and there is more than one file to parse.
+
+        The workers are forked, so this is used only by management commands,
+        which do not start background threads, see no_threads.
+        """
+        if settings.PARSE_PROCESSES <= 1 or threads_allowed():
+            return None, {}
+
+        existing = {
+            translation.filename: translation
+            for translation in self.translation_set.all()
+        }
+        if self.has_template():
+            template = self.get_template_filename()
+        else:
+            template = None
+
+        paths = []
+        for path in matches:
+            code = self.get_lang_code(path)
+            if langs is not None and code not in langs:
+                continue
+            translation = existing.get(path)
+            if (force or translation is None or
+                    translation.revision !=
+                    translation.get_git_blob_hash()):
+                paths.append((path, code))
+
+        if len(paths) <= 1:
+            return None, {}
+
+        self.log_info(
+            'parsing %d files using %d processes',
+            len(paths), settings.PARSE_PROCESSES
+        )
+        pool = Pool(settings.PARSE_PROCESSES)
+        parsed = {}
+        for path, code in paths:
+            parsed[path] = pool.apply_async(
+                parse_file,
+                (
+                    self.file_format,
+                    os.path.join(self.get_path(), path),
+                    template,
+                    code,
+                )
+            )
+        pool.close()
+        return pool, parsed
+
+    def sync_translations(self, matches, parsed, translations, languages,
+                          force, langs, request, changed_template):
+        """Update translations in the database from the files."""
         for pos, path in enumerate(matches):
             with transaction.atomic():
                 code = self.get_lang_code(path)
@@ -1033,7 +1127,8 @@ class SubProject(models.Model, URLMixin, PathMixin):
                     self.log_error('duplicate language found: %s', lang.code)
                     continue
                 translation = Translation.objects.check_sync(
-                    self, lang, code, path, force, request=request
+                    self, lang, code, path, force, request=request,
+                    store=self.get_parsed_store(parsed, path),
                 )
                 translations.add(translation.id)
                 languages.add(lang.code)
@@ -1041,26 +1136,19 @@ class SubProject(models.Model, URLMixin, PathMixin):
                 if changed_template:
                     translation.unit_set.update(fuzzy=False)
 
-        # Delete possibly no longer existing translations
-        if langs is None:
-            todelete = self.translation_set.exclude(id__in=translations)
-            if todelete.exists():
-                with transaction.atomic():
-                    self.log_info(
-                        'removing stale translations: %s',
-                        ','.join([trans.language.code for trans in todelete])
-                    )
-                    todelete.delete()
-
-        # Process linked repos
-        for subproject in self.get_linked_childs():
-            self.log_info(
-                'updating linked project %s',
-                subproject
-            )
-            subproject.create_translations(force, langs, request=request)
+    def get_parsed_store(self, parsed, path):
+        """Return store parsed by worker process, if any.
 
-        self.log_info('updating completed')
+        On failure or timeout the file is parsed again in the current
+        process, which takes care of the error handling.
+        """
+        if path not in parsed:
+            return None
+        try:
+            return parsed.pop(path).get(settings.PARSE_TIMEOUT)
+        except Exception as error:
+            self.log_warning('failed to parse %s in worker: %s', path, error)
+            return None
 
     def get_lang_code(self, path):
         """Parse language code from path."""
@@ -1425,18 +1513,28 @@ class SubProject(models.Model, URLMixin, PathMixin):
 
     def repo_needs_commit(self):
         """Check whether there are some not committed changes"""
-        for translation in self.translation_set.all():
-            if translation.unit_set.filter(pending=True).exists():
-                return True
-        return self.repository.needs_commit()
+        pending = Translation.objects.filter(
+            subproject=self, unit__pending=True
+        )
+        if pending.exists():
+            return True
+        return self.repository.get_changes().needs_commit()
 
     def repo_needs_merge(self):
         """Check whether there is something to merge from remote repository"""
-        return self.repository.needs_merge()
+        result = self.repository.get_status().needs_merge
+        if result is None:
+            # Status without remote information, let VCS raise the error
+            return self.repository.needs_merge()
+        return result
 
     def repo_needs_push(self):
         """Check whether there is something to push to remote repository"""
-        return self.repository.needs_push()
+        result = self.repository.get_status().needs_push
+        if result is None:
+            # Status without remote information, let VCS raise the error
+            return self.repository.needs_push()
+        return result
 
     @property
     def file_format_name(self):
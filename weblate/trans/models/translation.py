@@ -24,7 +24,7 @@ import os
 import codecs
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import ugettext as _
 from django.utils.encoding import python_2_unicode_compatible, force_text
 from django.utils.functional import cached_property
@@ -39,6 +39,7 @@ from weblate.trans.checks import CHECKS
 from weblate.trans.models.unit import (
     Unit, STATE_TRANSLATED, STATE_FUZZY, STATE_APPROVED,
 )
+from weblate.utils.backgroundqueue import threads_allowed
 from weblate.utils.stats import TranslationStats
 from weblate.trans.models.suggestion import Suggestion
 from weblate.trans.signals import vcs_pre_commit, vcs_post_commit
@@ -53,7 +54,7 @@ from weblate.trans.checklists import TranslationChecklist
 
 class TranslationManager(models.Manager):
     def check_sync(self, subproject, lang, code, path, force=False,
-                   request=None):
+                   request=None, store=None):
         """Parse translation meta info and updates translation object"""
         translation, dummy = self.get_or_create(
             language=lang,
@@ -68,7 +69,7 @@ class TranslationManager(models.Manager):
             force = True
             translation.filename = path
             translation.language_code = code
-        translation.check_sync(force, request=request)
+        translation.check_sync(force, request=request, store=store)
 
         return translation
 
@@ -141,6 +142,14 @@ class Translation(models.Model, URLMixin, LoggerMixin):
         """
         return self.filename == self.subproject.template
 
+    def is_complete(self):
+        """Check whether all strings are translated.
+
+        This is queried from the database as the cached stats might not be
+        updated yet.
+        """
+        return not self.unit_set.filter(state__lt=STATE_TRANSLATED).exists()
+
     def clean(self):
         """Validate that filename exists and can be opened using
         translate-toolkit.
@@ -232,8 +241,31 @@ class Translation(models.Model, URLMixin, LoggerMixin):
         except Exception as exc:
             self.subproject.handle_parse_error(exc, self)
 
-    def check_sync(self, force=False, request=None, change=None):
-        """Check whether database is in sync with git and possibly updates"""
+    def get_reader(self):
+        """Return object for reading units from the file.
+
+        Already loaded store is used if available, otherwise the file format
+        can provide lighter alternative to parsing whole file.
+        """
+        if 'store' in self.__dict__:
+            return self.store
+        try:
+            return self.subproject.file_format_cls.get_reader(
+                self.get_filename(),
+                self.subproject.template_store,
+                language_code=self.language_code
+            )
+        except ParseError:
+            raise
+        except Exception as exc:
+            self.subproject.handle_parse_error(exc, self)
+
+    def check_sync(self, force=False, request=None, change=None, store=None):
+        """Check whether database is in sync with git and possibly updates
+
+        The store can be passed to avoid parsing the file, it can be either
+        FileFormat or ParsedStore object.
+        """
 
         if change is None:
             change = Change.ACTION_UPDATE
@@ -256,11 +288,53 @@ class Translation(models.Model, URLMixin, LoggerMixin):
             reason,
         )
 
+        store = self.get_reader() if store is None else store
+
+        try:
+            # Units are not updated if parsing fails in the middle of file
+            with transaction.atomic():
+                created_units, was_new = self.update_from_store(store, user)
+        except ParseError as error:
+            # Streaming readers report errors while iterating over units
+            self.subproject.handle_parse_error(error, self)
+
+        # Following query can get huge, so we should find better way
+        # to delete stale units, probably sort of garbage collection
+
+        # We should also do cleanup on source strings tracking objects
+
+        # Delete stale units
+        self.unit_set.exclude(
+            id__in=created_units
+        ).delete()
+
+        # Update revision and stats
+        self.invalidate_cache()
+        self.store_hash()
+
+        # Store change entry
+        Change.objects.create(
+            translation=self,
+            action=change,
+            user=user,
+            author=user
+        )
+
+        # Notify subscribed users
+        if was_new:
+            notify_new_string(self)
+
+    def update_from_store(self, store, user):
+        """Update units from the store.
+
+        Returns IDs of all units in the store and whether there is new
+        string to translate.
+        """
         # List of created units (used for cleanup and duplicates detection)
         created_units = set()
 
         # Store plural
-        plural = self.store.get_plural(self.language)
+        plural = store.get_plural(self.language)
         if plural != self.plural:
             self.plural = plural
             self.save(update_fields=['plural'])
@@ -273,7 +347,7 @@ class Translation(models.Model, URLMixin, LoggerMixin):
         # Select all current units for update
         self.unit_set.select_for_update()
 
-        for unit in self.store.all_units():
+        for unit in store.all_units():
             if not unit.is_translatable():
                 continue
 
@@ -315,31 +389,7 @@ class Translation(models.Model, URLMixin, LoggerMixin):
             # Store current unit ID
             created_units.add(newunit.id)
 
-        # Following query can get huge, so we should find better way
-        # to delete stale units, probably sort of garbage collection
-
-        # We should also do cleanup on source strings tracking objects
-
-        # Delete stale units
-        self.unit_set.exclude(
-            id__in=created_units
-        ).delete()
-
-        # Update revision and stats
-        self.invalidate_cache()
-        self.store_hash()
-
-        # Store change entry
-        Change.objects.create(
-            translation=self,
-            action=change,
-            user=user,
-            author=user
-        )
-
-        # Notify subscribed users
-        if was_new:
-            notify_new_string(self)
+        return created_units, was_new
 
     def get_last_remote_commit(self):
         return self.subproject.get_last_remote_commit()
@@ -493,7 +543,9 @@ class Translation(models.Model, URLMixin, LoggerMixin):
         """Check whether there are some not committed changes."""
         return (
             self.unit_set.filter(pending=True).exists() or
-            self.subproject.repository.needs_commit(self.filename)
+            self.subproject.repository.get_changes().needs_commit(
+                self.filename
+            )
         )
 
     def repo_needs_merge(self):
@@ -936,6 +988,13 @@ class Translation(models.Model, URLMixin, LoggerMixin):
         # Invalidate summary stats
         self.stats.invalidate()
 
+        # Render widgets with updated stats once they are stored, this is
+        # done in server processes only
+        if settings.WIDGET_PRERENDER and threads_allowed():
+            from weblate.trans.widgetqueue import queue_widgets
+            project = self.subproject.project
+            transaction.on_commit(lambda: queue_widgets(project))
+
     def get_kwargs(self):
         return {
             'lang': self.language.code,
@@ -26,13 +26,16 @@ import traceback
 import multiprocessing
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models
-from django.db.models import Q
+from django.db.models import F, Q
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext as _
 
-from weblate.accounts.models import get_author_name
+from weblate.accounts.models import (
+    get_author_name, PendingNotification, Profile,
+)
 from weblate.permissions.helpers import can_translate
 from weblate.trans.checks import CHECKS
 from weblate.trans.models.source import Source
@@ -40,11 +43,13 @@ from weblate.trans.models.check import Check
 from weblate.trans.models.comment import Comment
 from weblate.trans.models.suggestion import Suggestion
 from weblate.trans.models.change import Change
-from weblate.trans.search import update_index_unit, fulltext_search, more_like
-from weblate.trans.signals import unit_pre_create
-from weblate.accounts.notifications import (
-    notify_new_contributor, notify_new_translation
+from weblate.trans.search import (
+    update_index_unit, update_index_units, fulltext_search, more_like,
 )
+from weblate.trans.signals import unit_pre_create
+from weblate.trans.unitqueue import queue_unit_update
+from weblate.trans.vcsprofile import profile_phase
+from weblate.accounts.notificationqueue import queue_notification
 from weblate.trans.mixins import LoggerMixin
 from weblate.trans.util import (
     is_plural, split_plural, join_plural, get_distinct_translations,
@@ -123,6 +128,107 @@ class UnitManager(models.Manager):
 
 
 class UnitQuerySet(models.QuerySet):
+    def get_wanted_checks(self):
+        """Run checks for units.
+
+        Returns mapping of (content_hash, project, language) to names of
+        failing checks. Target checks are run only on translated units.
+        """
+        wanted = {}
+        for unit in self.prefetch():
+            project_id = unit.translation.subproject.project_id
+            src = unit.get_source_plurals()
+            key = (unit.content_hash, project_id, None)
+            if key not in wanted:
+                wanted[key] = {
+                    check for check, check_obj in CHECKS.data.items()
+                    if check_obj.source and check_obj.check_source(src, unit)
+                }
+            if (unit.translation.is_template or
+                    unit.state < STATE_TRANSLATED):
+                continue
+            tgt = unit.get_target_plurals()
+            key = (unit.content_hash, project_id, unit.translation.language_id)
+            wanted.setdefault(key, set()).update(
+                check for check, check_obj in CHECKS.data.items()
+                if check_obj.target and
+                check_obj.check_target(src, tgt, unit)
+            )
+        return wanted
+
+    def run_checks(self):
+        """Update checks for all units at once.
+
+        Existing checks are loaded with single query and only differences
+        are written.
+        """
+        wanted = self.get_wanted_checks()
+        if not wanted:
+            return
+
+        hashes = {key[0] for key in wanted}
+        projects = {key[1] for key in wanted}
+        existing = {}
+        checks = Check.objects.filter(
+            content_hash__in=hashes,
+            project_id__in=projects,
+        ).values_list(
+            'pk', 'content_hash', 'project_id', 'language_id', 'check'
+        )
+        for pk, content_hash, project_id, language_id, check in checks:
+            key = (content_hash, project_id, language_id)
+            if key in wanted:
+                existing.setdefault(key, {})[check] = pk
+
+        create = []
+        delete = []
+        for key, names in wanted.items():
+            current = existing.get(key, {})
+            create.extend(
+                Check(
+                    content_hash=key[0],
+                    project_id=key[1],
+                    language_id=key[2],
+                    check=check,
+                    ignore=False,
+                )
+                for check in names if check not in current
+            )
+            delete.extend(
+                pk for check, pk in current.items() if check not in names
+            )
+        Check.objects.bulk_create(create)
+        Check.objects.filter(pk__in=delete).delete()
+
+        Unit.objects.update_failing_checks(hashes, projects)
+
+    def update_failing_checks(self, hashes, projects):
+        """Update failing check flag on units with given sources."""
+        failing = set(Check.objects.filter(
+            content_hash__in=hashes,
+            project_id__in=projects,
+            language__isnull=False,
+            ignore=False,
+        ).values_list('content_hash', 'project_id', 'language_id'))
+        units = self.filter(
+            content_hash__in=hashes,
+            translation__subproject__project_id__in=projects,
+        ).values_list(
+            'pk', 'content_hash', 'translation__subproject__project_id',
+            'translation__language_id', 'state', 'has_failing_check',
+        )
+        update = {True: [], False: []}
+        for pk, content_hash, project_id, language_id, state, flag in units:
+            has_failing_check = (
+                state >= STATE_TRANSLATED and
+                (content_hash, project_id, language_id) in failing
+            )
+            if has_failing_check != flag:
+                update[has_failing_check].append(pk)
+        for value, ids in update.items():
+            if ids:
+                self.filter(pk__in=ids).update(has_failing_check=value)
+
     def filter_checks(self, rqtype, project, language, ignored=False,
                       strict=False):
         """Filtering for checks."""
@@ -349,6 +455,52 @@ class UnitQuerySet(models.QuerySet):
             )
         return result
 
+    def related(self, unit):
+        """Units with same content, key or source within project language.
+
+        All are looked up in single query using composite indexes on
+        translation and hashes. Keys of the found units are cached for a
+        short time, so that repeated editor loads need single query by
+        primary keys.
+        """
+        key = 'related-units-{0}-{1}'.format(unit.pk, unit.content_hash)
+        pks = cache.get(key)
+        if pks is not None:
+            return list(self.prefetch().filter(pk__in=pks))
+        translation = unit.translation
+        translations = list(translation.language.translation_set.filter(
+            subproject__project_id=translation.subproject.project_id
+        ).values_list('pk', flat=True))
+        result = list(self.prefetch().filter(
+            Q(content_hash=unit.content_hash) |
+            Q(id_hash=unit.id_hash) |
+            Q(source_hash=unit.source_hash),
+            translation_id__in=translations,
+        ))
+        # Hash collisions are possible for the source
+        result = [
+            item for item in result
+            if item.source == unit.source or
+            item.content_hash == unit.content_hash or
+            item.id_hash == unit.id_hash
+        ]
+        cache.set(key, [item.pk for item in result], 300)
+        return result
+
+    def other_translations(self, unit):
+        """Units with same key in other translations of the component."""
+        translations = list(
+            unit.translation.subproject.translation_set.values_list(
+                'pk', flat=True
+            )
+        )
+        return self.filter(
+            id_hash=unit.id_hash,
+            translation_id__in=translations,
+        ).exclude(
+            pk=unit.pk
+        )
+
     def get_unit(self, ttunit):
         """Find unit matching translate-toolkit unit
 
@@ -378,6 +530,7 @@ class Unit(models.Model, LoggerMixin):
     )
     id_hash = models.BigIntegerField(db_index=True)
     content_hash = models.BigIntegerField(db_index=True)
+    source_hash = models.BigIntegerField(default=0)
     location = models.TextField(default='', blank=True)
     context = models.TextField(default='', blank=True)
     comment = models.TextField(default='', blank=True)
@@ -419,6 +572,11 @@ class Unit(models.Model, LoggerMixin):
         ordering = ['priority', 'position']
         app_label = 'trans'
         unique_together = ('translation', 'id_hash')
+        index_together = [
+            ('translation', 'content_hash'),
+            ('translation', 'source_hash'),
+            ('translation', 'position'),
+        ]
 
     def __init__(self, *args, **kwargs):
         """Constructor to initialize some cache properties."""
@@ -599,17 +757,162 @@ class Unit(models.Model, LoggerMixin):
 
         return ret
 
-    def propagate(self, request, change_action=None):
-        """Propagate current translation to all others."""
-        allunits = Unit.objects.same(self).filter(
+    def propagate(self, request, change_action=None, user=None, source=None):
+        """Propagate current translation to all others.
+
+        The units are matched against source unit, which defaults to this
+        one. All of them are updated at once, see propagate_units.
+        """
+        if user is None:
+            user = request.user
+        allunits = Unit.objects.same(source or self).filter(
             translation__subproject__allow_translation_propagation=True
+        ).exclude(
+            target=self.target,
+            state=self.state,
         )
+        units = []
         for unit in allunits:
-            if not can_translate(request.user, unit):
+            if not can_translate(user, unit):
+                continue
+            if unit.translation.is_template:
+                # Editing template changes source strings as well
+                unit.target = self.target
+                unit.state = self.state
+                unit.save_backend(
+                    request, False, change_action=change_action, user=user
+                )
                 continue
+            units.append(unit)
+        if units:
+            self.propagate_units(request, user, change_action, units)
+
+    def propagate_units(self, request, user, change_action, units):
+        """Store current translation to units at once."""
+        # Commit possible previous changes by other author
+        author = get_author_name(user)
+        translations = {
+            unit.translation_id: unit.translation for unit in units
+        }
+        for translation in translations.values():
+            translation.commit_pending(request, author)
+
+        # Lock the units and fetch their current state
+        ids = [unit.pk for unit in units]
+        list(Unit.objects.select_for_update().filter(pk__in=ids).values_list(
+            'pk', flat=True
+        ))
+        old_units = list(Unit.objects.prefetch().filter(pk__in=ids))
+
+        Unit.objects.filter(pk__in=ids).update(
+            target=self.target,
+            state=self.state,
+            pending=True,
+        )
+
+        changes = []
+        for old_unit in old_units:
+            if change_action is not None:
+                action = change_action
+            elif old_unit.state >= STATE_TRANSLATED:
+                action = Change.ACTION_CHANGE
+            else:
+                action = Change.ACTION_NEW
+            kwargs = {}
+            if old_unit.translation.subproject.save_history:
+                kwargs['target'] = self.target
+                kwargs['old'] = old_unit.target
+            changes.append(Change(
+                unit=old_unit,
+                action=action,
+                user=user,
+                author=user,
+                **kwargs
+            ))
+        # Translations where user has contributed before, looked up before
+        # adding the new changes
+        contributed = set(Change.objects.filter(
+            translation_id__in=list(translations),
+            user=user,
+        ).values_list(
+            'translation_id', flat=True
+        ).distinct())
+        Change.objects.bulk_create(changes)
+
+        self.post_propagate(
+            request, user, change_action, old_units, contributed
+        )
+
+    def post_propagate(self, request, user, change_action, old_units,
+                       contributed):
+        """Process updates depending on units changed by propagation.
+
+        Checks and fulltext index are updated at once, notifications for
+        each unit, statistics, completion and new contributor once for every
+        translation. The contributed is set of translation ids where user
+        has changes made before the propagation.
+        """
+        component = self.translation.subproject.log_prefix
+        translations = {}
+        units = []
+        for old_unit in old_units:
+            unit = copy(old_unit)
             unit.target = self.target
             unit.state = self.state
-            unit.save_backend(request, False, change_action=change_action)
+            units.append(unit)
+            translations.setdefault(unit.translation_id, []).append(
+                (unit, old_unit)
+            )
+
+        updated = Unit.objects.filter(pk__in=[unit.pk for unit in units])
+
+        with profile_phase(component, 'unit-checks'):
+            updated.run_checks()
+
+        with profile_phase(component, 'unit-index'):
+            update_index_units(updated)
+
+        with profile_phase(component, 'unit-stats'):
+            for items in translations.values():
+                translation = items[0][0].translation
+                translation.invalidate_cache()
+                translation.store_hash()
+            Profile.objects.filter(user=user).update(
+                translated=F('translated') + len(units)
+            )
+
+        with profile_phase(component, 'unit-notify'):
+            for unit, old_unit in zip(units, old_units):
+                queue_notification(
+                    PendingNotification.ACTION_NEW_TRANSLATION,
+                    unit, user, old_unit
+                )
+            # Notify about new contributor
+            for translation_id, items in translations.items():
+                if translation_id not in contributed:
+                    queue_notification(
+                        PendingNotification.ACTION_NEW_CONTRIBUTOR,
+                        items[0][0], user
+                    )
+
+        if change_action == Change.ACTION_UPLOAD:
+            return
+
+        # Force commiting on completing translation
+        with profile_phase(component, 'unit-complete'):
+            for items in translations.values():
+                translation = items[0][0].translation
+                if not any(old.state < STATE_TRANSLATED <= unit.state
+                           for unit, old in items):
+                    continue
+                if translation.is_complete():
+                    Change.objects.create(
+                        translation=translation,
+                        action=Change.ACTION_COMPLETE,
+                        user=user,
+                        author=user
+                    )
+                    translation.commit_pending(request)
 
     def save_backend(self, request, propagate=True, gen_change=True,
                      change_action=None, user=None):
@@ -617,16 +920,25 @@ class Unit(models.Model, LoggerMixin):
         Stores unit to backend.
 
         Optional user parameters defines authorship of a change.
+
+        Only the unit and change are saved immediately, the remaining
+        updates are stored and processed once the transaction is committed,
+        see deferred_save_backend.
         """
         # For case when authorship specified, use user from request
         if user is None or user.is_anonymous:
             user = request.user
+        # User doing the change
+        acting_user = user if request is None else request.user
+
+        component = self.translation.subproject.log_prefix
 
         # Commit possible previous changes by other author
         self.translation.commit_pending(request, get_author_name(user))
 
         # Fetch current copy from database and lock it for update
-        self.old_unit = Unit.objects.select_for_update().get(pk=self.pk)
+        with profile_phase(component, 'unit-lock'):
+            self.old_unit = Unit.objects.select_for_update().get(pk=self.pk)
 
         # Return if there was no change
         # We have to explicitly check for fuzzy flag change on monolingual
@@ -635,14 +947,12 @@ class Unit(models.Model, LoggerMixin):
                 self.old_unit.target == self.target):
             # Propagate if we should
             if propagate:
-                self.propagate(request, change_action)
+                queue_unit_update(
+                    request, self, copy(self.old_unit), user, acting_user,
+                    change_action, None, propagate, False
+                )
             return False
 
-        # Propagate to other projects
-        # This has to be done before changing source/content_hash for template
-        if propagate:
-            self.propagate(request, change_action)
-
         if self.translation.is_template:
             self.source = self.target
             self.content_hash = calculate_hash(self.source, self.context)
@@ -656,43 +966,92 @@ class Unit(models.Model, LoggerMixin):
         elif self.state == STATE_EMPTY and translation:
             self.state = STATE_TRANSLATED
 
-        # Save updated unit to database
-        self.save(backend=True)
+        # Save updated unit to database, fulltext index is updated later
+        with profile_phase(component, 'unit-save'):
+            self.save(backend=True, update_index=False)
 
-        # Update translation stats
-        old_translated = self.translation.stats.translated
-        if change_action != Change.ACTION_UPLOAD:
-            self.translation.invalidate_cache()
-            self.translation.store_hash()
+        # Generate Change object for this change
+        change = None
+        if gen_change:
+            with profile_phase(component, 'unit-change'):
+                change = self.generate_change(request, user, change_action)
 
-        # Notify subscribed users about new translation
-        notify_new_translation(self, self.old_unit, user)
+        queue_unit_update(
+            request, self, copy(self.old_unit), user, acting_user,
+            change_action, change, propagate, True
+        )
 
-        # Update user stats
-        user.profile.translated += 1
-        user.profile.save()
+        return True
 
-        # Generate Change object for this change
-        if gen_change:
-            self.generate_change(request, user, change_action)
+    def deferred_save_backend(self, request, acting_user, user,
+                              change_action, old_unit, change, propagate,
+                              saved):
+        """Process updates depending on saved unit.
 
-        # Force commiting on completing translation
-        translated = self.translation.stats.translated
-        if (old_translated < translated and
-                translated == self.translation.stats.all):
-            Change.objects.create(
-                translation=self.translation,
-                action=Change.ACTION_COMPLETE,
-                user=user,
-                author=user
+        This is run from the PendingUnitUpdate queue without request once
+        the saving transaction is committed. The user is author of the
+        change, while acting_user is the one who did it.
+        """
+        component = self.translation.subproject.log_prefix
+
+        # Propagate to other projects, matching them by source before
+        # editing as it could be changed for template
+        if propagate:
+            with profile_phase(component, 'unit-propagate'):
+                self.propagate(request, change_action, acting_user, old_unit)
+
+        if not saved:
+            return
+
+        with profile_phase(component, 'unit-index'):
+            update_index_unit(self)
+
+        # Update translation and user stats
+        with profile_phase(component, 'unit-stats'):
+            if change_action != Change.ACTION_UPLOAD:
+                self.translation.invalidate_cache()
+                self.translation.store_hash()
+            Profile.objects.filter(user=user).update(
+                translated=F('translated') + 1
             )
-            self.translation.commit_pending(request)
+
+        with profile_phase(component, 'unit-notify'):
+            # Notify subscribed users about new translation
+            queue_notification(
+                PendingNotification.ACTION_NEW_TRANSLATION,
+                self, user, old_unit
+            )
+            # Notify about new contributor
+            if change is not None:
+                user_changes = Change.objects.filter(
+                    translation=self.translation,
+                    user=acting_user
+                ).exclude(
+                    pk=change.pk
+                )
+                if not user_changes.exists():
+                    queue_notification(
+                        PendingNotification.ACTION_NEW_CONTRIBUTOR,
+                        self, acting_user
+                    )
+
+        # Force commiting on completing translation
+        if (change_action != Change.ACTION_UPLOAD and
+                old_unit.state < STATE_TRANSLATED <= self.state):
+            with profile_phase(component, 'unit-complete'):
+                if self.translation.is_complete():
+                    Change.objects.create(
+                        translation=self.translation,
+                        action=Change.ACTION_COMPLETE,
+                        user=user,
+                        author=user
+                    )
+                    self.translation.commit_pending(request)
 
         # Update related source strings if working on a template
         if self.translation.is_template:
-            self.update_source_units(self.old_unit.source, user)
-
-        return True
+            with profile_phase(component, 'unit-source'):
+                self.update_source_units(old_unit.source, user)
 
     def update_source_units(self, previous_source, user):
         """Update source for units withing same component.
@@ -707,11 +1066,12 @@ class Unit(models.Model, LoggerMixin):
         ).exclude(
             id=self.id
         )
-        # Update source, number of words and content_hash
+        # Update source, number of words and hashes
         same_source.update(
             source=self.source,
             num_words=self.num_words,
-            content_hash=self.content_hash
+            content_hash=self.content_hash,
+            source_hash=self.source_hash
         )
         # Find reverted units
         reverted = same_source.filter(
@@ -732,33 +1092,49 @@ class Unit(models.Model, LoggerMixin):
             state=STATE_FUZZY,
             previous_source=previous_source,
         )
-        # Update source index and stats
-        for unit in same_source.iterator():
-            unit.update_has_comment()
-            unit.update_has_suggestion()
-            unit.run_checks(False, False)
-            update_index_unit(unit)
-            Change.objects.create(
+        # Update flags, each of them with single query per value
+        project = self.translation.subproject.project
+        for flag, model in (('has_comment', Comment),
+                            ('has_suggestion', Suggestion)):
+            languages = set(model.objects.filter(
+                content_hash=self.content_hash,
+                project=project,
+            ).values_list('language_id', flat=True))
+            if None in languages:
+                same_source.update(**{flag: True})
+                continue
+            same_source.filter(
+                translation__language_id__in=languages
+            ).update(**{flag: True})
+            same_source.exclude(
+                translation__language_id__in=languages
+            ).update(**{flag: False})
+
+        # Update checks and fulltext index
+        same_source.run_checks()
+        update_index_units(same_source)
+
+        # Log changes and update stats
+        units = list(same_source.prefetch())
+        Change.objects.bulk_create([
+            Change(
                 unit=unit,
-                translation=unit.translation,
                 action=Change.ACTION_SOURCE_CHANGE,
                 user=user,
                 author=user,
                 old=previous_source,
                 target=self.source,
             )
-            unit.translation.invalidate_cache()
+            for unit in units
+        ])
+        translations = {
+            unit.translation_id: unit.translation for unit in units
+        }
+        for translation in translations.values():
+            translation.invalidate_cache()
 
     def generate_change(self, request, author, change_action):
         """Create Change entry for saving unit."""
-        # Notify about new contributor
-        user_changes = Change.objects.filter(
-            translation=self.translation,
-            user=request.user
-        )
-        if not user_changes.exists():
-            notify_new_contributor(self, request.user)
-
         # Action type to store
         if change_action is not None:
             action = change_action
@@ -775,17 +1151,17 @@ class Unit(models.Model, LoggerMixin):
             kwargs['old'] = self.old_unit.target
 
         # Create change object
-        Change.objects.create(
+        return Change.objects.create(
             unit=self,
             translation=self.translation,
             action=action,
-            user=request.user,
+            user=request.user if request is not None else author,
             author=author,
             **kwargs
         )
 
     def save(self, same_content=False, same_state=False, force_insert=False,
-             backend=False, **kwargs):
+             backend=False, update_index=True, **kwargs):
         """
         Wrapper around save to warn when save did not come from
         git backend (eg. commit or by parsing file).
@@ -797,9 +1173,11 @@ class Unit(models.Model, LoggerMixin):
                 ''.join(traceback.format_stack())
             )
 
-        # Store number of words
+        # Store number of words and hash of the source
         if not same_content or not self.num_words:
             self.num_words = len(self.get_source_plurals()[0].split())
+        if not same_content or not self.source_hash:
+            self.source_hash = calculate_hash(self.source, '')
 
         # Actually save the unit
         super(Unit, self).save(**kwargs)
@@ -809,7 +1187,7 @@ class Unit(models.Model, LoggerMixin):
             self.run_checks(same_state, same_content, force_insert)
 
         # Update fulltext index if content has changed or this is a new unit
-        if force_insert or not same_content:
+        if update_index and (force_insert or not same_content):
             update_index_unit(self)
 
     @cached_property
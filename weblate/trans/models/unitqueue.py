@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from __future__ import unicode_literals
+
+from copy import copy
+
+from django.contrib.auth.models import User
+from django.db import models
+from django.utils.encoding import python_2_unicode_compatible
+
+from weblate.utils.backgroundqueue import (
+    BackgroundQueue, BackgroundQueueManager,
+)
+
+
+class PendingUnitUpdateManager(BackgroundQueueManager):
+    # pylint: disable=no-init
+
+    def enqueue(self, unit, old_unit, user, acting_user, change_action,
+                change, propagate, saved):
+        """Store updates depending on saved unit.
+
+        This is called within the transaction saving the unit, so the
+        updates are stored only together with it.
+        """
+        return self.create(
+            unit=unit,
+            user=user,
+            acting_user=acting_user,
+            action=change_action,
+            change=change,
+            old_source=old_unit.source,
+            old_target=old_unit.target,
+            old_state=old_unit.state,
+            propagate=propagate,
+            saved=saved,
+        )
+
+
+@python_2_unicode_compatible
+class PendingUnitUpdate(BackgroundQueue):
+    """Updates depending on saved unit waiting for processing."""
+    unit = models.ForeignKey(
+        'Unit', on_delete=models.deletion.CASCADE,
+    )
+    # Author of the change and user who did it
+    user = models.ForeignKey(
+        User, null=True, on_delete=models.deletion.SET_NULL,
+        related_name='+',
+    )
+    acting_user = models.ForeignKey(
+        User, null=True, on_delete=models.deletion.SET_NULL,
+        related_name='+',
+    )
+    action = models.IntegerField(null=True)
+    change = models.ForeignKey(
+        'Change', null=True, on_delete=models.deletion.SET_NULL,
+        related_name='+',
+    )
+    # Unit before saving, the unit might change meanwhile
+    old_source = models.TextField(blank=True)
+    old_target = models.TextField(blank=True)
+    old_state = models.IntegerField(default=0)
+    propagate = models.BooleanField(default=True)
+    saved = models.BooleanField(default=True)
+
+    objects = PendingUnitUpdateManager()
+
+    settings_prefix = 'BACKGROUND_UNIT_UPDATES'
+
+    class Meta(object):
+        app_label = 'trans'
+
+    def __str__(self):
+        return '{0}:{1}'.format(self.unit_id, self.attempts)
+
+    def get_old_unit(self):
+        """Return unit as it was before saving."""
+        result = copy(self.unit)
+        result.source = self.old_source
+        result.target = self.old_target
+        result.state = self.old_state
+        return result
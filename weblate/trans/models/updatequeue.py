@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from __future__ import unicode_literals
+
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.encoding import python_2_unicode_compatible
+
+from weblate.utils.backgroundqueue import (
+    BackgroundQueue, BackgroundQueueManager,
+)
+
+
+class PendingUpdateManager(BackgroundQueueManager):
+    # pylint: disable=no-init
+
+    def enqueue(self, component):
+        """Queue repository update for component.
+
+        There is at most one pending entry per repository, repeated
+        requests only refresh the timestamp of existing one.
+        """
+        if component.is_repo_link:
+            component = component.linked_subproject
+        now = timezone.now()
+        updated = self.filter(subproject=component).update(timestamp=now)
+        if updated:
+            return False
+        with transaction.atomic():
+            obj, created = self.get_or_create(
+                subproject=component,
+                defaults={'timestamp': now, 'next_attempt': now},
+            )
+        if not created:
+            self.filter(pk=obj.pk).update(timestamp=now)
+        return created
+
+    def claim(self, exclude=()):
+        """Claim next due update for component not listed in exclude."""
+        return super(PendingUpdateManager, self).claim(
+            subproject_id__in=exclude
+        )
+
+
+@python_2_unicode_compatible
+class PendingUpdate(BackgroundQueue):
+    subproject = models.OneToOneField(
+        'SubProject', on_delete=models.deletion.CASCADE,
+    )
+
+    objects = PendingUpdateManager()
+
+    settings_prefix = 'BACKGROUND_HOOKS'
+    claim_order = 'next_attempt'
+
+    class Meta(object):
+        app_label = 'trans'
+
+    def __str__(self):
+        return '{0}:{1}'.format(self.subproject_id, self.attempts)
+
+    def finish(self):
+        """Remove processed entry.
+
+        When new update was requested meanwhile, the entry is kept
+        and scheduled for immediate processing.
+        """
+        removed = PendingUpdate.objects.filter(
+            pk=self.pk, timestamp=self.timestamp
+        ).delete()[0]
+        if not removed:
+            PendingUpdate.objects.filter(pk=self.pk).update(
+                next_attempt=timezone.now(), attempts=0, last_error='',
+            )
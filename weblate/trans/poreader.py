@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Line based read only parser for Gettext PO files.
+
+The entries are yielded as plain tuples of unquoted fields, without building
+translate-toolkit object model, so the memory usage does not grow with the
+file size. The fields follow the same rules as translate-toolkit uses.
+"""
+
+from __future__ import unicode_literals
+
+import codecs
+from collections import namedtuple
+import re
+
+from six.moves.urllib import parse
+
+# Encoding used to read the header until the charset is known
+HEADER_ENCODING = 'iso-8859-1'
+
+CHARSET_RE = re.compile(r'charset=([^\s\\]+)')
+NEXT_ENTRY = (b'#', b'msgctxt', b'msgid')
+ESCAPE_RE = re.compile(r'\\(.)')
+ESCAPES = {
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+    '\\': '\\',
+    '"': '"',
+}
+
+PoEntry = namedtuple('PoEntry', (
+    # Unquoted strings, msgid_plural is None for singular entries and
+    # msgid_comment is the KDE style context stored in msgid
+    'msgctxt', 'msgid', 'msgid_plural', 'msgid_comment',
+    # List of msgstr strings ordered by plural index
+    'msgstr',
+    # Comment lines including the leading markers
+    'translator_comments', 'automatic_comments', 'references', 'flags',
+    # Unquoted previous strings from the #| comments
+    'prev_msgid', 'prev_msgid_plural',
+    'obsolete',
+))
+
+
+class PoSyntaxError(ValueError):
+    """Line which can not be parsed."""
+
+
+def unescape(text):
+    """Resolve escape sequences, unknown ones are kept as they are."""
+    if '\\' not in text:
+        return text
+    return ESCAPE_RE.sub(
+        lambda match: ESCAPES.get(match.group(1), match.group(0)), text
+    )
+
+
+def unquote(line):
+    """Return content of quoted string on the line."""
+    line = line.rstrip('\r\n')
+    left = line.find('"')
+    right = line.rfind('"')
+    if left == right:
+        # Missing terminating quote
+        return unescape(line[left + 1:])
+    return unescape(line[left + 1:right])
+
+
+def unquote_plus(text):
+    """Unquote location, keeping it as it is when not valid."""
+    try:
+        return parse.unquote_plus(text, errors='strict')
+    except TypeError:
+        # Python 2 does not support errors argument
+        try:
+            return parse.unquote_plus(text.encode('utf-8')).decode('utf-8')
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            return text
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return text
+
+
+def is_header(entry):
+    """Check whether entry is the file header."""
+    return (
+        not entry.msgctxt and entry.msgid == '' and
+        not entry.msgid_comment and any(entry.msgstr) and not entry.obsolete
+    )
+
+
+def is_blank(entry):
+    """Check whether entry contains no strings."""
+    return (
+        not entry.msgctxt and not entry.msgid and not entry.msgid_plural and
+        not entry.msgid_comment and not any(entry.msgstr)
+    )
+
+
+def get_charset(entry):
+    """Return encoding defined in the header entry."""
+    match = CHARSET_RE.search(''.join(entry.msgstr))
+    if match is None or match.group(1) == 'CHARSET':
+        return 'utf-8'
+    return match.group(1)
+
+
+class EntryBuilder(object):
+    """Collects lines of single entry."""
+    def __init__(self):
+        self.strings = {}
+        self.prev = {}
+        self.translator_comments = []
+        self.automatic_comments = []
+        self.references = []
+        self.flags = []
+        self.section = None
+        self.prev_section = None
+        self.has_msgstr = False
+        self.obsolete = False
+
+    def add_string(self, target, section, line, start):
+        """Start new keyword section on the line."""
+        if line[start:start + 1] not in ('', ' ', '\t', '"'):
+            raise PoSyntaxError(line)
+        target.setdefault(section, []).append(unquote(line[start:]))
+        return section
+
+    def add_keyword(self, line):
+        """Process keyword or continuation line.
+
+        Returns False if the line starts next entry.
+        """
+        if line.startswith('"'):
+            if self.section is None:
+                raise PoSyntaxError(line)
+            self.strings[self.section].append(unquote(line))
+        elif line.startswith('msgctxt') or line.startswith('msgid_plural'):
+            if line.startswith('msgctxt') and self.has_msgstr:
+                return False
+            keyword = line.split(None, 1)[0].split('"', 1)[0]
+            self.section = self.add_string(
+                self.strings, keyword, line, len(keyword)
+            )
+        elif line.startswith('msgid'):
+            if self.has_msgstr:
+                return False
+            self.section = self.add_string(self.strings, 'msgid', line, 5)
+        elif line.startswith('msgstr['):
+            right = line.find(']')
+            if right == -1:
+                raise PoSyntaxError(line)
+            try:
+                index = int(line[7:right])
+            except ValueError:
+                raise PoSyntaxError(line)
+            self.section = self.add_string(
+                self.strings, index, line, right + 1
+            )
+            self.has_msgstr = True
+        elif line.startswith('msgstr'):
+            self.section = self.add_string(self.strings, 0, line, 6)
+            self.has_msgstr = True
+        else:
+            raise PoSyntaxError(line)
+        return True
+
+    def add_previous(self, line):
+        """Process line of previous strings comment."""
+        line = line.lstrip()
+        if line.startswith('"'):
+            if self.prev_section is not None:
+                self.prev[self.prev_section].append(unquote(line))
+            return
+        for keyword in ('msgid_plural', 'msgctxt', 'msgid'):
+            if line.startswith(keyword):
+                self.prev_section = self.add_string(
+                    self.prev, keyword, line, len(keyword)
+                )
+                return
+
+    def add_line(self, line):
+        """Process single line of the file.
+
+        Returns False if the line starts next entry.
+        """
+        if line.startswith('#~'):
+            content = line[2:].lstrip()
+            if content.startswith('|'):
+                # Previous strings of obsolete entry
+                return True
+            if self.has_msgstr and not self.obsolete:
+                return False
+            self.obsolete = True
+            return self.add_keyword(content)
+        if line.startswith('#') or line.startswith('|'):
+            if self.has_msgstr:
+                return False
+            marker = line[1:2]
+            if line.startswith('|') or marker == '|':
+                self.add_previous(line[2:])
+            elif marker == '.':
+                self.automatic_comments.append(line)
+            elif marker == ':':
+                self.references.append(line)
+            elif marker == ',':
+                self.flags.append(line)
+            else:
+                self.translator_comments.append(line)
+            return True
+        return self.add_keyword(line)
+
+    def get_entry(self):
+        """Return collected entry or None if there is nothing to return."""
+        if 'msgid' not in self.strings:
+            return None
+
+        def join(values, key):
+            if key not in values:
+                return None
+            return ''.join(values[key])
+
+        msgstr = [
+            ''.join(self.strings[key])
+            for key in sorted(
+                key for key in self.strings if isinstance(key, int)
+            )
+        ]
+        msgid = join(self.strings, 'msgid')
+        msgid_comment = ''
+        if msgid.startswith('_:') and '\n' in msgid:
+            msgid_comment, msgid = msgid.split('\n', 1)
+            msgid_comment = msgid_comment.replace('_: ', '', 1)
+        return PoEntry(
+            join(self.strings, 'msgctxt'),
+            msgid,
+            join(self.strings, 'msgid_plural'),
+            msgid_comment,
+            msgstr,
+            self.translator_comments,
+            self.automatic_comments,
+            self.references,
+            self.flags,
+            join(self.prev, 'msgid'),
+            join(self.prev, 'msgid_plural'),
+            self.obsolete,
+        )
+
+
+def iterate_entries(lines):
+    """Parse PO entries from iterable of unicode lines."""
+    builder = EntryBuilder()
+    for number, line in enumerate(lines):
+        line = line.lstrip()
+        if not line or line.isspace():
+            continue
+        try:
+            if not builder.add_line(line):
+                entry = builder.get_entry()
+                if entry is not None:
+                    yield entry
+                builder = EntryBuilder()
+                builder.add_line(line)
+        except PoSyntaxError:
+            raise PoSyntaxError(
+                'Invalid syntax on line {0}: {1}'.format(
+                    number + 1, line.rstrip()
+                )
+            )
+    entry = builder.get_entry()
+    if entry is not None:
+        yield entry
+
+
+def read_entries(handle):
+    """Parse PO entries from binary file handle.
+
+    The header is parsed using single byte encoding and the rest of the file
+    is decoded using the charset defined in the header.
+    """
+    header_lines = []
+    has_msgstr = False
+    for line in handle:
+        if not header_lines and line.startswith(codecs.BOM_UTF8):
+            line = line[len(codecs.BOM_UTF8):]
+        header_lines.append(line)
+        line = line.lstrip()
+        if has_msgstr and (not line or line.startswith(NEXT_ENTRY)):
+            break
+        has_msgstr |= line.startswith(b'msgstr')
+    entries = list(iterate_entries(
+        line.decode(HEADER_ENCODING) for line in header_lines
+    ))
+    encoding = 'utf-8'
+    if entries and is_header(entries[0]):
+        encoding = get_charset(entries[0])
+
+    def decoded():
+        for line in header_lines:
+            yield line.decode(encoding)
+        for line in handle:
+            yield line.decode(encoding)
+
+    return iterate_entries(decoded())
@@ -192,6 +192,33 @@ def add_index_update(unit_id, to_delete, language_code):
             return
 
 
+def update_index_units(units):
+    """Add units to index at once."""
+    # Should this happen in background?
+    if settings.OFFLOAD_INDEXING:
+        from weblate.trans.models.search import IndexUpdate
+        values = units.values_list('pk', 'translation__language__code')
+        existing = set(IndexUpdate.objects.filter(
+            unitid__in=[pk for pk, language_code in values]
+        ).values_list('unitid', flat=True))
+        updates = [
+            IndexUpdate(
+                unitid=pk, to_delete=False, language_code=language_code
+            )
+            for pk, language_code in values if pk not in existing
+        ]
+        try:
+            with transaction.atomic():
+                IndexUpdate.objects.bulk_create(updates)
+        except IntegrityError:
+            # Some of them were created meanwhile
+            for update in updates:
+                add_index_update(update.unitid, False, update.language_code)
+        return
+
+    update_index(units)
+
+
 def update_index_unit(unit):
     """Add single unit to index."""
     # Should this happen in background?
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""On-disk cache of parsed translation files.
+
+Parsed stores are pickled and stored under DATA_DIR, keyed by the file
+format and Git blob hash of the file content. Least recently used entries
+are removed once the cache exceeds PARSED_STORE_CACHE_SIZE.
+"""
+
+from __future__ import unicode_literals
+
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+
+from six.moves import cPickle as pickle
+
+import translate.__version__
+
+from weblate.logger import LOGGER
+import weblate
+
+# Store classes which can not be pickled (for example lxml based ones)
+UNPICKLABLE = set()
+
+# Prefix of files being written, these are not cache entries yet
+TEMP_PREFIX = '.tmp-'
+
+
+def get_cache_dir():
+    return os.path.join(settings.DATA_DIR, 'cache', 'stores')
+
+
+def get_blob_hash(data):
+    """Calculate hash of content the same way Git does for blobs."""
+    header = 'blob {0}\0'.format(len(data)).encode('ascii')
+    return hashlib.sha1(header + data).hexdigest()
+
+
+def get_cache_key(fileformat, data):
+    """Return cache key for given file format and file content."""
+    key = ':'.join((
+        fileformat.__module__,
+        fileformat.__name__,
+        translate.__version__.sver,
+        weblate.VERSION,
+        get_blob_hash(data),
+    ))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def load_store(fileformat, filename, loader):
+    """Load store from the cache or parse it using loader.
+
+    The loader is called with the file content.
+    """
+    with open(filename, 'rb') as handle:
+        data = handle.read()
+    path = os.path.join(get_cache_dir(), get_cache_key(fileformat, data))
+
+    try:
+        with open(path, 'rb') as handle:
+            store = pickle.load(handle)
+        # Mark entry as recently used
+        os.utime(path, None)
+        store.filename = filename
+        return store
+    except (IOError, OSError):
+        pass
+    except Exception as error:
+        LOGGER.warning('removing broken parsed store %s: %s', path, error)
+        remove_entry(path)
+
+    store = loader(data)
+    if store.__class__ not in UNPICKLABLE:
+        save_store(path, store)
+    return store
+
+
+def save_store(path, store):
+    """Store parsed store in the cache."""
+    try:
+        data = pickle.dumps(store, pickle.HIGHEST_PROTOCOL)
+    except Exception as error:
+        LOGGER.info(
+            'can not cache %s stores: %s', store.__class__.__name__, error
+        )
+        UNPICKLABLE.add(store.__class__)
+        return
+    write_entry(path, data, settings.PARSED_STORE_CACHE_SIZE)
+
+
+def write_entry(path, data, limit):
+    """Atomically write cache entry and expire old ones."""
+    if len(data) > limit:
+        return
+
+    dirname = os.path.dirname(path)
+    try:
+        if not os.path.exists(dirname):
+            os.makedirs(dirname)
+        handle, temp = tempfile.mkstemp(dir=dirname, prefix=TEMP_PREFIX)
+    except (IOError, OSError) as error:
+        LOGGER.warning('failed to store cache entry %s: %s', path, error)
+        return
+    try:
+        with os.fdopen(handle, 'wb') as temp_handle:
+            temp_handle.write(data)
+        os.rename(temp, path)
+    except (IOError, OSError) as error:
+        LOGGER.warning('failed to store cache entry %s: %s', path, error)
+        remove_entry(temp)
+        return
+    cleanup_cache(dirname, limit)
+
+
+def remove_entry(path):
+    try:
+        os.unlink(path)
+    except (IOError, OSError):
+        pass
+
+
+def cleanup_cache(dirname, limit):
+    """Remove least recently used entries over the cache size limit.
+
+    Temporary files being written by other processes are skipped.
+    """
+    entries = []
+    for name in os.listdir(dirname):
+        if name.startswith(TEMP_PREFIX):
+            continue
+        path = os.path.join(dirname, name)
+        try:
+            stat = os.stat(path)
+        except (IOError, OSError):
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(entry[1] for entry in entries)
+    for dummy, size, path in sorted(entries):
+        if total <= limit:
+            break
+        remove_entry(path)
+        total -= size
@@ -25,6 +25,7 @@ Tests for changes browsing.
 from django.urls import reverse
 
 from weblate.trans.tests.test_views import ViewTestCase
+from weblate.trans.views.changes import ChangesView
 
 
 class ChangesTest(ViewTestCase):
@@ -84,3 +85,20 @@ class ChangesTest(ViewTestCase):
         )
         self.assertContains(response, 'New translation')
         self.assertNotContains(response, 'Invalid search string!')
+
+    def test_paginate(self):
+        ChangesView.paginate_by = 1
+        try:
+            response = self.client.get(reverse('changes'))
+            self.assertEqual(len(response.context['object_list']), 1)
+            next_link = response.context['paginator'].get_next_link()
+            self.assertIn('cursor=', next_link)
+            response = self.client.get(next_link)
+            self.assertEqual(len(response.context['object_list']), 1)
+            self.assertTrue(response.context['paginator'].has_previous)
+        finally:
+            ChangesView.paginate_by = 20
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('changes'), {'cursor': 'x'})
+        self.assertEqual(response.status_code, 404)
@@ -24,6 +24,7 @@ import json
 
 from django.urls import reverse
 
+from weblate.trans.models import Change, DailyActivity
 from weblate.trans.tests.test_views import FixtureTestCase
 
 
@@ -105,3 +106,55 @@ class ChartsTest(FixtureTestCase):
             )
         )
         self.assert_json_chart_data(response)
+
+    def test_activity_stats(self):
+        """Test counting of changes in daily activity."""
+        translation = self.get_translation()
+        for dummy in range(3):
+            Change.objects.create(
+                translation=translation,
+                action=Change.ACTION_NEW,
+                user=self.user,
+            )
+        Change.objects.create(action=Change.ACTION_LOCK)
+        # Same translation and user share single row
+        self.assertEqual(
+            DailyActivity.objects.filter(translation=translation).count(),
+            1
+        )
+
+        with self.assertNumQueries(1):
+            stats = Change.objects.base_stats(31, 1)
+        self.assertEqual(len(stats), 31)
+        self.assertEqual(stats[-1][1], 4)
+        self.assertEqual(sum(item[1] for item in stats), 4)
+
+        stats = Change.objects.base_stats(364, 7, project=self.project)
+        self.assertEqual(len(stats), 52)
+        self.assertEqual(stats[-1][1], 3)
+        stats = Change.objects.base_stats(31, 1, user=self.user)
+        self.assertEqual(stats[-1][1], 3)
+
+    def test_activity_bulk(self):
+        """Test counting of bulk created changes in daily activity."""
+        translation = self.get_translation()
+        Change.objects.bulk_create([
+            Change(
+                translation=translation,
+                action=Change.ACTION_NEW,
+                user=self.user,
+            )
+            for dummy in range(5)
+        ])
+        activity = DailyActivity.objects.get(translation=translation)
+        self.assertEqual(activity.count, 5)
+        Change.objects.bulk_create([
+            Change(
+                translation=translation,
+                action=Change.ACTION_NEW,
+                user=self.user,
+            )
+            for dummy in range(2)
+        ])
+        activity.refresh_from_db()
+        self.assertEqual(activity.count, 7)
@@ -20,25 +20,37 @@
 
 """Test for management commands."""
 
+from datetime import timedelta
+import gzip
+import json
+import os
+import tarfile
 from unittest import SkipTest
 
 from six import StringIO
 
 from django.test import TestCase
+from django.test.utils import modify_settings
 from django.core.management import call_command
 from django.core.management.base import CommandError
+from django.utils import timezone
 
 from weblate.trans.tests.test_models import RepoTestCase
 from weblate.trans.models import (
-    Translation, SubProject, Suggestion, IndexUpdate
+    Translation, SubProject, Suggestion, IndexUpdate, PendingUpdate,
+    PendingUnitUpdate, Change, ChangeArchive, Dictionary, Project,
 )
 from weblate.runner import main
-from weblate.trans.tests.utils import get_test_file, create_test_user
+from weblate.trans.tests.utils import (
+    get_test_file, create_test_user, TempDirMixin,
+)
 from weblate.trans.vcs import HgRepository
 from weblate.accounts.models import Profile
+from weblate.billing.models import Billing, Plan
 
 TEST_PO = get_test_file('cs.po')
 TEST_COMPONENTS = get_test_file('components.json')
+TEST_TBX = get_test_file('terms.tbx')
 
 
 class RunnerTest(TestCase):
@@ -404,6 +416,61 @@ class PeriodicCommandTest(RepoTestCase):
         )
         self.assertEqual('', output.getvalue())
 
+    def test_process_updates(self):
+        PendingUpdate.objects.enqueue(self.subproject)
+        output = StringIO()
+        call_command(
+            'process_updates',
+            '--status',
+            stdout=output
+        )
+        self.assertIn('pending: 1', output.getvalue())
+        call_command(
+            'process_updates',
+        )
+        self.assertEqual(PendingUpdate.objects.count(), 0)
+
+    def test_process_unit_updates(self):
+        unit = Translation.objects.filter(
+            subproject=self.subproject
+        )[0].unit_set.all()[0]
+        PendingUnitUpdate.objects.enqueue(
+            unit, unit, None, None, None, None, False, False
+        )
+        output = StringIO()
+        call_command(
+            'process_unit_updates',
+            '--status',
+            stdout=output
+        )
+        self.assertIn('pending: 1', output.getvalue())
+        call_command(
+            'process_unit_updates',
+        )
+        self.assertEqual(PendingUnitUpdate.objects.count(), 0)
+
+    def test_vcs_profile(self):
+        self.subproject.do_update()
+        output = StringIO()
+        call_command(
+            'vcs_profile',
+            '--component', 'test/test',
+            stdout=output
+        )
+        self.assertIn('fetch', output.getvalue())
+        self.assertIn('lock', output.getvalue())
+        call_command(
+            'vcs_profile',
+            '--reset',
+        )
+        output = StringIO()
+        call_command(
+            'vcs_profile',
+            '--component', 'test/test',
+            stdout=output
+        )
+        self.assertNotIn('fetch', output.getvalue())
+
     def test_list_checks(self):
         output = StringIO()
         call_command(
@@ -568,6 +635,135 @@ class ListTranslatorsTest(RepoTestCase):
         self.assertEqual(output.getvalue(), '')
 
 
+class ExportArchiveTest(RepoTestCase, TempDirMixin):
+    """Test archive export."""
+    def setUp(self):
+        super(ExportArchiveTest, self).setUp()
+        self.create_subproject()
+        self.create_temp()
+
+    def tearDown(self):
+        super(ExportArchiveTest, self).tearDown()
+        self.remove_temp()
+
+    def do_export(self, *args):
+        filename = os.path.join(self.tempdir, 'export.tar.gz')
+        call_command(
+            'export_archive', '--output', filename, 'test/test', *args
+        )
+        with tarfile.open(filename) as archive:
+            return sorted(archive.getnames())
+
+    def test_export(self):
+        self.assertEqual(
+            self.do_export(),
+            ['test/test/po/cs.po', 'test/test/po/de.po', 'test/test/po/it.po']
+        )
+
+    def test_export_format(self):
+        self.assertEqual(
+            self.do_export('--format', 'tmx', '--lang', 'cs'),
+            ['test/test/test-test-cs.tmx']
+        )
+
+    def test_export_none(self):
+        self.assertRaises(
+            CommandError,
+            self.do_export,
+            '--lang', 'xx'
+        )
+
+
+class ArchiveChangesTest(RepoTestCase, TempDirMixin):
+    """Test changes archiving."""
+    def setUp(self):
+        super(ArchiveChangesTest, self).setUp()
+        self.create_subproject()
+        self.create_temp()
+        Change.objects.update(
+            timestamp=timezone.now() - timedelta(days=30)
+        )
+        Change.objects.create(action=Change.ACTION_NEW)
+        self.count = Change.objects.count()
+        # Last change of every translation is kept
+        self.kept = Translation.objects.filter(
+            change__isnull=False
+        ).distinct().count() + 1
+
+    def tearDown(self):
+        super(ArchiveChangesTest, self).tearDown()
+        self.remove_temp()
+
+    def test_archive(self):
+        output = StringIO()
+        call_command('archive_changes', '--age', '10', stdout=output)
+        self.assertEqual(
+            output.getvalue(),
+            'Archived {0} changes\n'.format(self.count - self.kept)
+        )
+        self.assertEqual(Change.objects.count(), self.kept)
+        self.assertEqual(
+            ChangeArchive.objects.count(), self.count - self.kept
+        )
+
+    def test_archive_last(self):
+        translation = Translation.objects.get(language_code='cs')
+        user = create_test_user()
+        change = Change.objects.create(
+            translation=translation,
+            action=Change.ACTION_CHANGE,
+            user=user,
+            author=user,
+        )
+        Change.objects.create(
+            translation=translation, action=Change.ACTION_LOCK
+        )
+        Change.objects.update(
+            timestamp=timezone.now() - timedelta(days=30)
+        )
+        call_command('archive_changes', '--age', '10', verbosity=0)
+        self.assertTrue(Change.objects.filter(pk=change.pk).exists())
+        self.assertIsNotNone(translation.get_last_author())
+        self.assertEqual(translation.change_set.count(), 2)
+
+    def test_archive_billing(self):
+        plan = Plan.objects.create(name='test', price=0)
+        billing = Billing.objects.create(
+            user=create_test_user(), plan=plan
+        )
+        billing.projects.add(Project.objects.get())
+        count = billing.count_changes(timedelta(days=60))
+        self.assertNotEqual(count, 0)
+        call_command('archive_changes', '--age', '10', verbosity=0)
+        self.assertEqual(billing.count_changes(timedelta(days=60)), count)
+
+    def test_archive_output_billing(self):
+        filename = os.path.join(self.tempdir, 'changes.json.gz')
+        self.assertRaises(
+            CommandError,
+            call_command,
+            'archive_changes', '--age', '10', '--output', filename,
+        )
+        self.assertEqual(Change.objects.count(), self.count)
+
+    @modify_settings(INSTALLED_APPS={'remove': 'weblate.billing'})
+    def test_archive_output(self):
+        filename = os.path.join(self.tempdir, 'changes.json.gz')
+        call_command(
+            'archive_changes', '--age', '10', '--output', filename,
+            verbosity=0
+        )
+        with gzip.open(filename, 'rb') as handle:
+            lines = handle.read().decode('utf-8').splitlines()
+        self.assertEqual(len(lines), self.count - self.kept)
+        self.assertIn('timestamp', json.loads(lines[0]))
+        self.assertEqual(Change.objects.count(), self.kept)
+        self.assertFalse(ChangeArchive.objects.exists())
+
+    def test_archive_disabled(self):
+        self.assertRaises(CommandError, call_command, 'archive_changes')
+
+
 class LockingCommandTest(RepoTestCase):
     """Test locking and unlocking."""
     def setUp(self):
@@ -615,6 +811,14 @@ class BenchmarkCommandTest(RepoTestCase):
         )
         self.assertIn('function calls', output.getvalue())
 
+    def test_benchmark_reader(self):
+        output = StringIO()
+        call_command(
+            'benchmark_reader', '--format', 'po', TEST_PO,
+            stdout=output
+        )
+        self.assertIn('read', output.getvalue())
+
 
 class SuggestionCommandTest(RepoTestCase):
     """Test suggestion addding."""
@@ -656,6 +860,67 @@ class SuggestionCommandTest(RepoTestCase):
         )
 
 
+class GlossaryCommandTest(RepoTestCase):
+    """Test glossary importing."""
+    def setUp(self):
+        super(GlossaryCommandTest, self).setUp()
+        self.project = self.create_project()
+
+    def test_import(self):
+        call_command('import_glossary', 'test', 'cs', TEST_TBX)
+        self.assertEqual(Dictionary.objects.count(), 164)
+        self.assertEqual(
+            Change.objects.filter(
+                action=Change.ACTION_DICTIONARY_UPLOAD
+            ).count(),
+            1
+        )
+        # Importing again does not change anything
+        call_command('import_glossary', 'test', 'cs', TEST_TBX)
+        self.assertEqual(Dictionary.objects.count(), 164)
+        self.assertEqual(
+            Change.objects.filter(
+                action=Change.ACTION_DICTIONARY_UPLOAD
+            ).count(),
+            1
+        )
+
+    def test_import_overwrite(self):
+        call_command('import_glossary', 'test', 'cs', TEST_TBX)
+        word = Dictionary.objects.get(target='podpůrná vrstva')
+        word.target = 'zkouška sirén'
+        word.save()
+        call_command(
+            'import_glossary', '--overwrite', 'test', 'cs', TEST_TBX
+        )
+        self.assertEqual(Dictionary.objects.count(), 164)
+        self.assertEqual(
+            Dictionary.objects.get(pk=word.pk).target, 'podpůrná vrstva'
+        )
+
+    def test_import_add(self):
+        call_command('import_glossary', 'test', 'cs', TEST_TBX)
+        word = Dictionary.objects.get(target='podpůrná vrstva')
+        word.target = 'zkouška sirén'
+        word.save()
+        call_command('import_glossary', '--add', 'test', 'cs', TEST_TBX)
+        self.assertEqual(Dictionary.objects.count(), 165)
+
+    def test_missing_project(self):
+        self.assertRaises(
+            CommandError,
+            call_command,
+            'import_glossary', 'xxx', 'cs', TEST_TBX,
+        )
+
+    def test_missing_language(self):
+        self.assertRaises(
+            CommandError,
+            call_command,
+            'import_glossary', 'test', 'xx-nonexisting', TEST_TBX,
+        )
+
+
 class ImportCommandTest(RepoTestCase):
     """Import test."""
     def setUp(self):
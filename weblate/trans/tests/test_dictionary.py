@@ -180,6 +180,26 @@ class DictionaryTest(FixtureTestCase):
         # Check number of imported objects
         self.assertEqual(Dictionary.objects.count(), 164)
 
+    def test_bulk_upload_overwrite(self):
+        """Test overwriting more entries than fit into single query."""
+        language = self.get_translation().language
+        count = Dictionary.objects.bulk_upload(
+            self.user, self.project, language,
+            [('word {0}'.format(i), 'old') for i in range(1200)],
+            'add'
+        )
+        self.assertEqual(count, 1200)
+        count = Dictionary.objects.bulk_upload(
+            self.user, self.project, language,
+            [('word {0}'.format(i), 'new {0}'.format(i)) for i in range(1200)],
+            'overwrite'
+        )
+        self.assertEqual(count, 1200)
+        self.assertFalse(Dictionary.objects.filter(target='old').exists())
+        self.assertEqual(
+            Dictionary.objects.get(source='word 1000').target, 'new 1000'
+        )
+
     def test_edit(self):
         """Test for manually adding words to glossary."""
         show_url = self.get_url('show_dictionary')
@@ -371,6 +391,39 @@ class DictionaryTest(FixtureTestCase):
             4
         )
 
+    def test_get_words_changed(self):
+        """Test that glossary changes are reflected in matching."""
+        translation = self.get_translation()
+        word = Dictionary.objects.create(
+            self.user,
+            project=self.project,
+            language=translation.language,
+            source='thank',
+            target='děkujeme',
+        )
+        unit = self.get_unit('Thank you for using Weblate.')
+        self.assertEqual(
+            list(Dictionary.objects.get_words(unit)),
+            [word]
+        )
+        word.source = 'hello'
+        word.save()
+        self.assertEqual(
+            Dictionary.objects.get_words(unit).count(),
+            0
+        )
+        word.source = 'Weblate'
+        word.save()
+        self.assertEqual(
+            Dictionary.objects.get_words(unit).count(),
+            1
+        )
+        word.delete()
+        self.assertEqual(
+            Dictionary.objects.get_words(unit).count(),
+            0
+        )
+
     def test_get_long(self):
         """Test parsing long source string."""
         unit = self.get_unit()
@@ -23,10 +23,15 @@
 from __future__ import unicode_literals
 import time
 
+from django.test.utils import override_settings
 from django.urls import reverse
 
+from weblate.accounts.models import PendingNotification, Profile
 from weblate.trans.tests.test_views import ViewTestCase
-from weblate.trans.models import Change
+from weblate.trans.tests.utils import create_subscriber, run_unit_updates
+from weblate.trans.unitqueue import process_unit_update
+from weblate.trans.models import Change, PendingUnitUpdate, Unit
+from weblate.trans.vcsprofile import get_profile
 from weblate.utils.hash import hash_to_checksum
 from weblate.utils.state import STATE_TRANSLATED, STATE_FUZZY
 
@@ -80,6 +85,78 @@ class EditTest(ViewTestCase):
         self.assertEqual(unit.state, STATE_TRANSLATED)
         self.assert_backend(1)
 
+    def test_edit_notification(self):
+        create_subscriber(self.project)
+        self.edit_unit(
+            'Hello, world!\n',
+            'Nazdar svete!\n'
+        )
+        # Notifications are stored for background delivery
+        notification = PendingNotification.objects.get(
+            action=PendingNotification.ACTION_NEW_TRANSLATION
+        )
+        self.assertEqual(notification.target, 'Nazdar svete!\n')
+        self.assertTrue(
+            PendingNotification.objects.filter(
+                action=PendingNotification.ACTION_NEW_CONTRIBUTOR
+            ).exists()
+        )
+
+    @override_settings(BACKGROUND_UNIT_UPDATES=True)
+    def test_edit_background(self):
+        create_subscriber(self.project)
+        translated = self.user.profile.translated
+        stats = self.get_translation().stats.translated
+        self.edit_unit(
+            'Hello, world!\n',
+            'Nazdar svete!\n'
+        )
+        # Unit and change are saved immediately
+        unit = self.get_unit()
+        self.assertEqual(unit.target, 'Nazdar svete!\n')
+        self.assertTrue(
+            Change.objects.filter(unit=unit, action=Change.ACTION_NEW).exists()
+        )
+        # Other updates are queued until the transaction is committed
+        self.assertEqual(PendingUnitUpdate.objects.count(), 1)
+        self.assertFalse(PendingNotification.objects.exists())
+        self.assertEqual(
+            Profile.objects.get(user=self.user).translated, translated
+        )
+        self.assertEqual(self.get_translation().stats.translated, stats)
+        run_unit_updates()
+        self.assertFalse(PendingUnitUpdate.objects.exists())
+        self.assertTrue(
+            PendingNotification.objects.filter(
+                unit=unit,
+                action=PendingNotification.ACTION_NEW_TRANSLATION
+            ).exists()
+        )
+        self.assertEqual(
+            Profile.objects.get(user=self.user).translated, translated + 1
+        )
+        self.assertEqual(self.get_translation().stats.translated, stats + 1)
+        operations = [item['operation'] for item in get_profile()]
+        self.assertIn('unit-save', operations)
+        self.assertIn('unit-stats', operations)
+
+    @override_settings(
+        BACKGROUND_UNIT_UPDATES=True, BACKGROUND_UNIT_UPDATES_RETRIES=2
+    )
+    def test_edit_background_retry(self):
+        self.edit_unit(
+            'Hello, world!\n',
+            'Nazdar svete!\n'
+        )
+        update = PendingUnitUpdate.objects.claim()
+        self.assertTrue(update.fail('Error'))
+        # Failed update is kept for retry
+        self.assertEqual(PendingUnitUpdate.objects.stats()['failing'], 1)
+        self.assertFalse(process_unit_update())
+        PendingUnitUpdate.objects.update(next_attempt=update.timestamp)
+        run_unit_updates()
+        self.assertFalse(PendingUnitUpdate.objects.exists())
+
     def test_plurals(self):
         """Test plural editing."""
         if not self.has_plurals:
@@ -284,6 +361,29 @@ class EditResourceSourceTest(ViewTestCase):
         unit = translation.unit_set.get(context='hello')
         self.assertEqual(unit.state, STATE_TRANSLATED)
 
+    def test_edit_source_units(self):
+        self.edit_unit(
+            'Hello, world!\n',
+            'Hello, universe!\n'
+        )
+        units = Unit.objects.filter(
+            translation__subproject=self.subproject,
+            context='hello',
+        ).exclude(
+            translation__language_code='en'
+        )
+        self.assertTrue(units.exists())
+        for unit in units:
+            self.assertEqual(unit.source, 'Hello, universe!\n')
+            self.assertFalse(unit.has_failing_check)
+            self.assertTrue(
+                Change.objects.filter(
+                    unit=unit,
+                    action=Change.ACTION_SOURCE_CHANGE,
+                    old='Hello, world!\n',
+                ).exists()
+            )
+
     def get_translation(self):
         return self.subproject.translation_set.get(
             language_code=self._language_code
@@ -68,19 +68,19 @@ class PoExporterTest(TestCase):
     def test_dictionary_special(self):
         self.check_dict(Dictionary(source='bar\x1e\x1efoo', target='br\x1eff'))
 
-    def check_unit(self, nplurals=3, **kwargs):
+    def get_unit(self, nplurals=3, **kwargs):
         if nplurals == 3:
             equation = 'n==0 ? 0 : n==1 ? 1 : 2'
         else:
             equation = '0'
-        lang = Language.objects.create(
+        lang = Language.objects.get_or_create(
             code='zz',
-        )
-        plural = Plural.objects.create(
+        )[0]
+        plural = Plural.objects.get_or_create(
             language=lang,
             number=nplurals,
             equation=equation
-        )
+        )[0]
         project = Project(
             slug='test',
             source_language=Language.objects.get(code='en'),
@@ -94,10 +94,35 @@ class PoExporterTest(TestCase):
             ),
             **kwargs
         )
-        exporter = self.get_exporter(lang)
+        return unit
+
+    def check_unit(self, nplurals=3, **kwargs):
+        unit = self.get_unit(nplurals, **kwargs)
+        exporter = self.get_exporter(unit.translation.language)
         exporter.add_unit(unit)
         return self.check_export(exporter)
 
+    def check_stream(self, streamed, serialized):
+        self.assertEqual(streamed, serialized)
+
+    def test_stream(self):
+        units = [
+            self.get_unit(source='xxx', target='yyy', state=STATE_TRANSLATED),
+            self.get_unit(source='foo', target='bar', context='ctx'),
+            self.get_unit(
+                source='xxx\x1e\x1efff',
+                target='yyy\x1e\x1efff\x1e\x1ewww',
+                state=STATE_TRANSLATED,
+            ),
+        ]
+        lang = units[0].translation.language
+        exporter = self.get_exporter(lang)
+        streamed = b''.join(exporter.iterate_content(units))
+        exporter = self.get_exporter(lang)
+        for unit in units:
+            exporter.add_unit(unit)
+        self.check_stream(streamed, exporter.serialize())
+
     def test_unit(self):
         self.check_unit(
             source='xxx',
@@ -22,13 +22,18 @@
 
 from __future__ import unicode_literals
 
+import os
+import shutil
 from unittest import SkipTest
 
 from django.contrib.messages import ERROR
 from django.test import SimpleTestCase
+from django.test.utils import override_settings
 from django.urls import reverse
 
+from weblate.trans.artifacts import get_cache_dir
 from weblate.trans.forms import SimpleUploadForm
+from weblate.trans.models import Change
 from weblate.trans.tests.test_views import ViewTestCase
 from weblate.trans.tests.utils import get_test_file
 
@@ -410,14 +415,16 @@ class ExportTest(ViewTestCase):
             )
         )
 
+    def get_streamed(self, fmt):
+        response = self.export_format(fmt)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
     def test_export_po(self):
-        response = self.export_format('po')
-        self.assertContains(
-            response, 'Orangutan has %d bananas'
-        )
-        self.assertContains(
-            response, '/projects/test/test/cs/'
-        )
+        content = self.get_streamed('po')
+        self.assertIn('Orangutan has %d bananas', content)
+        self.assertIn('/projects/test/test/cs/', content)
 
     def test_export_tmx(self):
         response = self.export_format('tmx')
@@ -432,18 +439,79 @@ class ExportTest(ViewTestCase):
         )
 
     def test_export_xliff11(self):
-        response = self.export_format('xliff11')
-        self.assertContains(
-            response, 'urn:oasis:names:tc:xliff:document:1.1'
-        )
-        self.assertContains(
-            response, 'Orangutan has %d banana'
+        content = self.get_streamed('xliff11')
+        self.assertIn('urn:oasis:names:tc:xliff:document:1.1', content)
+        self.assertIn('Orangutan has %d banana', content)
+
+    def test_export_mo(self):
+        response = self.export_format('mo')
+        self.assertEqual(response.status_code, 200)
+        # The file can not be generated incrementally
+        self.assertFalse(response.streaming)
+        self.assertIn(b'Orangutan has %d banana', response.content)
+
+    def test_export_file_type(self):
+        response = self.client.get(
+            reverse('download_translation', kwargs=self.kw_translation)
         )
+        self.assertEqual(response['Content-Type'], 'text/x-gettext-catalog')
+        self.assertIn('-cs.po', response['Content-Disposition'])
 
     def test_export_invalid(self):
         response = self.export_format('invalid')
         self.assertEqual(response.status_code, 404)
 
+    def test_export_not_modified(self):
+        url = reverse('download_translation', kwargs=self.kw_translation)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_export_format_not_modified(self):
+        kwargs = {'fmt': 'po'}
+        kwargs.update(self.kw_translation)
+        url = reverse('download_translation_format', kwargs=kwargs)
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # Changed translation is sent again
+        self.edit_unit(
+            'Thank you for using Weblate.',
+            'Děkujeme za použití Weblate.'
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_export_format_source_change(self):
+        kwargs = {'fmt': 'po'}
+        kwargs.update(self.kw_translation)
+        url = reverse('download_translation_format', kwargs=kwargs)
+        etag = self.client.get(url)['ETag']
+        # Source changes from editing template are not content changes
+        Change.objects.create(
+            unit=self.get_unit(),
+            action=Change.ACTION_SOURCE_CHANGE,
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_export_cache(self):
+        self.addCleanup(shutil.rmtree, get_cache_dir(), True)
+        with override_settings(DOWNLOAD_CACHE_SIZE=1024 * 1024):
+            content = self.get_streamed('xliff11')
+            self.assertEqual(len(os.listdir(get_cache_dir())), 1)
+            self.assertEqual(self.get_streamed('xliff11'), content)
+            self.assertEqual(self.get_streamed('po'), self.get_streamed('po'))
+            self.assertEqual(len(os.listdir(get_cache_dir())), 2)
+
 
 class FormTest(SimpleTestCase):
     def test_remove(self):
@@ -37,12 +37,13 @@ from weblate.trans.formats import (
     AutoFormat, PoFormat, AndroidFormat, PropertiesFormat, JoomlaFormat,
     JSONFormat, JSONNestedFormat, RESXFormat, PhpFormat, XliffFormat, TSFormat,
     YAMLFormat, RubyYAMLFormat, DTDFormat, FILE_FORMATS, detect_filename,
-    WebExtensionJSONFormat, UnwrappedPoFormat,
+    WebExtensionJSONFormat, UnwrappedPoFormat, PoReader, ParsedStore,
 )
 from weblate.trans.tests.utils import get_test_file, TempDirMixin
 
 
 TEST_PO = get_test_file('cs.po')
+TEST_PO_FUZZY = get_test_file('cs-fuzzy.po')
 TEST_JSON = get_test_file('cs.json')
 TEST_NESTED_JSON = get_test_file('cs-nested.json')
 TEST_WEBEXT_JSON = get_test_file('cs-webext.json')
@@ -203,6 +204,14 @@ class AutoFormatTest(SimpleTestCase, TempDirMixin):
         else:
             self.assertEqual(unit.get_target(), self.FIND_MATCH)
 
+    def test_find_added(self):
+        storage = self.FORMAT(self.FILE)
+        # Build indexes before adding unit
+        storage.find_unit('', self.FIND)
+        unit = storage.create_unit('key', 'Source string')
+        storage.add_unit(unit)
+        self.assertIs(storage.find_matching(unit), unit)
+
     def test_add(self):
         self.assertTrue(self.FORMAT.is_valid_base_for_new(self.BASE))
         out = os.path.join(self.tempdir, 'test.{0}'.format(self.EXT))
@@ -291,6 +300,18 @@ class PoFormatTest(AutoFormatTest):
             'n==1 ? 0 : n==2 ? 2 : 1'
         )
 
+    def test_reader(self):
+        for filename in (TEST_PO, TEST_PO_FUZZY, TEST_HE_CLDR):
+            reader = self.FORMAT.get_reader(filename)
+            self.assertIsInstance(reader, PoReader)
+            parsed = ParsedStore(reader)
+            expected = ParsedStore(self.FORMAT(filename))
+            self.assertEqual(parsed.plural_formula, expected.plural_formula)
+            self.assertEqual(
+                [vars(unit) for unit in parsed.units],
+                [vars(unit) for unit in expected.units],
+            )
+
 
 class UnwrappedPoFormatTest(PoFormatTest):
     FORMAT = UnwrappedPoFormat
@@ -23,7 +23,9 @@
 from django.urls import reverse
 from django.test.utils import override_settings
 
+from weblate.trans.models import PendingUpdate
 from weblate.trans.tests.test_views import ViewTestCase
+from weblate.trans.updatequeue import process_update
 
 GITHUB_PAYLOAD = '''
 {
@@ -572,3 +574,48 @@ class HooksViewTest(ViewTestCase):
             'Invalid data in json payload!',
             status_code=400
         )
+
+
+@override_settings(
+    ENABLE_HOOKS=True, BACKGROUND_HOOKS=True, BACKGROUND_HOOKS_WORKERS=0
+)
+class UpdateQueueTest(ViewTestCase):
+    def test_deduplicate(self):
+        for dummy in range(3):
+            response = self.client.get(
+                reverse('hook-subproject', kwargs=self.kw_subproject)
+            )
+            self.assertContains(response, 'Update triggered')
+        response = self.client.get(
+            reverse('hook-project', kwargs=self.kw_project)
+        )
+        self.assertContains(response, 'Update triggered')
+        self.assertEqual(PendingUpdate.objects.count(), 1)
+        self.assertEqual(PendingUpdate.objects.stats()['due'], 1)
+
+    def test_process(self):
+        PendingUpdate.objects.enqueue(self.subproject)
+        self.assertTrue(process_update())
+        self.assertFalse(process_update())
+        self.assertEqual(PendingUpdate.objects.count(), 0)
+
+    def test_requeue_while_running(self):
+        PendingUpdate.objects.enqueue(self.subproject)
+        update = PendingUpdate.objects.claim()
+        PendingUpdate.objects.enqueue(self.subproject)
+        update.finish()
+        self.assertEqual(PendingUpdate.objects.stats()['due'], 1)
+
+    @override_settings(BACKGROUND_HOOKS_RETRIES=2)
+    def test_backoff(self):
+        PendingUpdate.objects.enqueue(self.subproject)
+        update = PendingUpdate.objects.claim()
+        self.assertTrue(update.fail('Error'))
+        stats = PendingUpdate.objects.stats()
+        self.assertEqual(stats['due'], 0)
+        self.assertEqual(stats['failing'], 1)
+        self.assertFalse(process_update())
+        PendingUpdate.objects.update(next_attempt=update.timestamp)
+        update = PendingUpdate.objects.claim()
+        self.assertFalse(update.fail('Error'))
+        self.assertEqual(PendingUpdate.objects.count(), 0)
@@ -34,11 +34,13 @@ from django.core.exceptions import ValidationError
 
 from weblate.trans.models import (
     Project, Source, Unit, WhiteboardMessage, Check, ComponentList,
-    AutoComponentList,
+    AutoComponentList, SubProject, Change,
 )
+from weblate.trans.formats import ParseError
 import weblate.trans.models.subproject
 from weblate.lang.models import Language
 from weblate.permissions.helpers import can_access_project
+from weblate.utils.hash import calculate_hash
 from weblate.trans.tests.utils import (
     get_test_file, RepoTestMixin, create_test_user,
 )
@@ -189,6 +191,30 @@ class TranslationTest(RepoTestCase):
         translation = project.translation_set.get(language_code='cs')
         translation.full_clean()
 
+    def test_parse_error(self):
+        """Parse error in the middle of the file does not update units."""
+        project = self.create_subproject()
+        translation = project.translation_set.get(language_code='cs')
+        with open(translation.get_filename(), 'rb') as handle:
+            content = handle.read()
+        content = content.replace(
+            b'msgid "Hello, world!\\n"\nmsgstr ""',
+            b'msgid "Hello, world!\\n"\nmsgstr "Ahoj svete!\\n"',
+        )
+        self.assertIn(b'Ahoj svete', content)
+        with open(translation.get_filename(), 'wb') as handle:
+            handle.write(content)
+            handle.write(b'\nmsgid "Broken \xff"\nmsgstr ""\n')
+        self.assertRaises(ParseError, translation.check_sync, True)
+        self.assertTrue(
+            Change.objects.filter(
+                translation=translation, action=Change.ACTION_PARSE_ERROR
+            ).exists()
+        )
+        self.assertEqual(
+            translation.unit_set.get(source='Hello, world!\n').target, ''
+        )
+
     def test_update_stats(self):
         """Check update stats with no units."""
         project = self.create_subproject()
@@ -315,6 +341,39 @@ class UnitTest(ModelTestCase):
         unit = Unit.objects.all()[0]
         self.assertEqual(Unit.objects.more_like_this(unit).count(), 0)
 
+    def test_related(self):
+        SubProject.objects.create(
+            name='Test2',
+            slug='test2',
+            project=self.subproject.project,
+            repo='weblate://test/test',
+            file_format='po',
+            filemask='po/*.po',
+        )
+        unit = Unit.objects.get(
+            translation__subproject=self.subproject,
+            translation__language_code='cs',
+            source='Hello, world!\n',
+        )
+        related = Unit.objects.related(unit)
+        self.assertEqual(len(related), 2)
+        self.assertEqual(
+            {item.translation.subproject.slug for item in related},
+            {'test', 'test2'}
+        )
+        self.assertTrue(
+            all(item.translation.language_code == 'cs' for item in related)
+        )
+        self.assertEqual(
+            {item.source_hash for item in related},
+            {calculate_hash(unit.source, '')}
+        )
+        # Second lookup is served from the cache, units are loaded by
+        # primary keys in single query and each of six relations in
+        # UnitQuerySet.prefetch needs one more query
+        with self.assertNumQueries(1 + 6):
+            self.assertEqual(Unit.objects.related(unit), related)
+
 
 class WhiteboardMessageTest(ModelTestCase):
     """Test(s) for WhiteboardMessage model."""
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test for line based PO reader."""
+
+from __future__ import unicode_literals
+
+from io import BytesIO
+
+from django.test import SimpleTestCase
+
+from six import assertRaisesRegex
+
+from weblate.trans.poreader import (
+    read_entries, is_header, is_blank, PoSyntaxError,
+)
+from weblate.trans.tests.utils import get_test_file
+
+TEST_PO = get_test_file('cs.po')
+TEST_PO_BOM = get_test_file('cs-bom.po')
+
+TEST_CONTENT = '''msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=ISO-8859-2\\n"
+"Plural-Forms: nplurals=3; plural=(n==1) ? 0 : (n>=2 && n<=4) ? 1 : 2;\\n"
+
+# Translator comment
+#. Automatic comment
+#: file.c:10 file.c:20
+#, fuzzy, c-format
+#| msgid "Old"
+msgctxt "ctx"
+msgid "Hello"
+msgstr "Ahoj \\"světe\\"\\n"
+
+msgid "One"
+msgid_plural "Many"
+msgstr[0] "Jeden"
+msgstr[1] "Dva"
+msgstr[2] "Mnoho"
+
+#~ msgid "Obsolete"
+#~ msgstr "Zastaralé"
+'''.encode('iso-8859-2')
+
+
+class PoReaderTest(SimpleTestCase):
+    def read(self, content):
+        return list(read_entries(BytesIO(content)))
+
+    def test_read(self):
+        header, single, plural, obsolete = self.read(TEST_CONTENT)
+        self.assertTrue(is_header(header))
+        self.assertFalse(is_header(single))
+
+        self.assertEqual(single.msgctxt, 'ctx')
+        self.assertEqual(single.msgid, 'Hello')
+        self.assertIsNone(single.msgid_plural)
+        self.assertEqual(single.msgstr, ['Ahoj "světe"\n'])
+        self.assertEqual(single.prev_msgid, 'Old')
+        self.assertEqual(single.flags, ['#, fuzzy, c-format\n'])
+        self.assertEqual(single.references, ['#: file.c:10 file.c:20\n'])
+        self.assertEqual(single.automatic_comments, ['#. Automatic comment\n'])
+        self.assertEqual(
+            single.translator_comments, ['# Translator comment\n']
+        )
+
+        self.assertEqual(plural.msgid_plural, 'Many')
+        self.assertEqual(plural.msgstr, ['Jeden', 'Dva', 'Mnoho'])
+
+        self.assertTrue(obsolete.obsolete)
+        self.assertEqual(obsolete.msgid, 'Obsolete')
+
+    def test_blank(self):
+        entry = self.read(b'msgid ""\nmsgstr ""\n')[0]
+        self.assertTrue(is_blank(entry))
+        self.assertFalse(is_header(entry))
+
+    def test_file(self):
+        with open(TEST_PO, 'rb') as handle:
+            entries = list(read_entries(handle))
+        with open(TEST_PO_BOM, 'rb') as handle:
+            bom_entries = list(read_entries(handle))
+        self.assertEqual(len(entries), 5)
+        self.assertEqual(
+            [entry.msgid for entry in entries],
+            [entry.msgid for entry in bom_entries],
+        )
+
+    def test_syntax_error(self):
+        with assertRaisesRegex(self, PoSyntaxError, 'line 3'):
+            self.read(b'msgid ""\nmsgstr ""\nfoo "bar"\n')
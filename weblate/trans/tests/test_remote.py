@@ -23,10 +23,14 @@ import shutil
 import os
 from unittest import SkipTest
 
+from django.test.utils import override_settings
 from django.utils import timezone
 
-from weblate.trans.models import SubProject
-from weblate.trans.tests.utils import REPOWEB_URL
+from weblate.accounts.models import PendingNotification
+from weblate.trans.models import Change, SubProject
+from weblate.trans.tests.utils import (
+    REPOWEB_URL, create_subscriber, run_unit_updates,
+)
 from weblate.trans.tests.test_views import ViewTestCase
 from weblate.trans.vcs import VCS_REGISTRY
 from weblate.utils.state import STATE_TRANSLATED
@@ -101,6 +105,42 @@ class MultiRepoTest(ViewTestCase):
         self.assertEqual(self.get_translation().stats.translated, 1)
         self.subproject.do_push(self.request)
 
+    @override_settings(BACKGROUND_UNIT_UPDATES=True)
+    def test_propagate_background(self):
+        create_subscriber(self.project)
+        translation = self.subproject2.translation_set.get(
+            language_code='cs'
+        )
+        self.assertEqual(translation.stats.translated, 0)
+        self.assertEqual(self.get_translation().stats.translated, 0)
+
+        unit = self.get_unit()
+        unit.translate(self.request, ['Nazdar svete!\n'], STATE_TRANSLATED)
+
+        # Propagation is done once the transaction is committed
+        other = translation.unit_set.get(source='Hello, world!\n')
+        self.assertEqual(other.target, '')
+        run_unit_updates()
+        other = translation.unit_set.get(source='Hello, world!\n')
+        self.assertEqual(other.target, 'Nazdar svete!\n')
+        self.assertTrue(
+            PendingNotification.objects.filter(
+                unit=other,
+                action=PendingNotification.ACTION_NEW_TRANSLATION
+            ).exists()
+        )
+        self.assertTrue(
+            PendingNotification.objects.filter(
+                unit__translation=translation,
+                action=PendingNotification.ACTION_NEW_CONTRIBUTOR
+            ).exists()
+        )
+        self.assertEqual(self.get_translation().stats.translated, 1)
+        translation = self.subproject2.translation_set.get(
+            language_code='cs'
+        )
+        self.assertEqual(translation.stats.translated, 1)
+
     def push_replace(self, content, mode):
         """Replace content of a po file and pushes it to remote repository."""
         # Manually edit po file, adding new unit
@@ -128,6 +168,13 @@ class MultiRepoTest(ViewTestCase):
             language_code='cs'
         )
         self.assertEqual(translation.stats.translated, 1)
+        unit = translation.unit_set.get(source='Hello, world!\n')
+        self.assertEqual(unit.target, 'Nazdar svete!\n')
+        self.assertTrue(
+            Change.objects.filter(
+                unit=unit, action=Change.ACTION_NEW
+            ).exists()
+        )
 
     def test_failed_update(self):
         """Test failed remote update."""
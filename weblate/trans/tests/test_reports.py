@@ -26,6 +26,7 @@ import json
 from django.urls import reverse
 from django.utils import timezone
 
+from weblate.trans.models import Change
 from weblate.trans.tests.test_views import ViewTestCase
 from weblate.trans.views.reports import generate_credits, generate_counts
 
@@ -74,6 +75,26 @@ class ReportsTest(ViewTestCase):
             [{'Czech': [('weblate@example.org', 'Weblate Test')]}]
         )
 
+    def test_credits_archived(self):
+        self.add_change()
+        Change.objects.archive(timezone.now() + timedelta(days=1))
+        self.assertFalse(Change.objects.exists())
+        data = generate_credits(
+            self.subproject,
+            timezone.now() - timedelta(days=1),
+            timezone.now() + timedelta(days=1)
+        )
+        self.assertEqual(
+            data,
+            [{'Czech': [('weblate@example.org', 'Weblate Test')]}]
+        )
+        data = generate_counts(
+            self.subproject,
+            timezone.now() - timedelta(days=1),
+            timezone.now() + timedelta(days=1)
+        )
+        self.assertEqual(data, COUNTS_DATA)
+
     def test_credits_more(self):
         self.edit_unit(
             'Hello, world!\n',
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test for parsed store cache."""
+
+import os
+import shutil
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from weblate.trans.formats import PoFormat, XliffFormat
+from weblate.trans.storecache import (
+    get_cache_dir, TEMP_PREFIX, UNPICKLABLE,
+)
+from weblate.trans.tests.test_formats import TEST_PO, TEST_XLIFF
+from weblate.trans.tests.utils import TempDirMixin
+
+
+class StoreCacheTest(SimpleTestCase, TempDirMixin):
+    def setUp(self):
+        self.create_temp()
+        self.settings = override_settings(
+            DATA_DIR=self.tempdir,
+            PARSED_STORE_CACHE_SIZE=1024 * 1024,
+        )
+        self.settings.enable()
+
+    def tearDown(self):
+        self.settings.disable()
+        self.remove_temp()
+
+    def get_entries(self):
+        dirname = get_cache_dir()
+        if not os.path.exists(dirname):
+            return []
+        return os.listdir(dirname)
+
+    def copy_file(self, source, name):
+        target = os.path.join(self.tempdir, name)
+        shutil.copy(source, target)
+        return target
+
+    def test_cache(self):
+        filename = self.copy_file(TEST_PO, 'cs.po')
+        store = PoFormat(filename)
+        self.assertEqual(len(self.get_entries()), 1)
+        cached = PoFormat(filename)
+        self.assertEqual(len(self.get_entries()), 1)
+        self.assertEqual(bytes(cached.store), bytes(store.store))
+        self.assertEqual(cached.store.filename, filename)
+
+        # Changed content creates new entry
+        cached.new_unit('key', 'Source string')
+        changed = PoFormat(filename)
+        self.assertEqual(len(self.get_entries()), 2)
+        self.assertEqual(changed.count_units(), store.count_units() + 1)
+
+    def test_eviction(self):
+        first = self.copy_file(TEST_PO, 'first.po')
+        PoFormat(first)
+        size = os.path.getsize(
+            os.path.join(get_cache_dir(), self.get_entries()[0])
+        )
+        with override_settings(PARSED_STORE_CACHE_SIZE=size + 1):
+            second = PoFormat(first)
+            second.new_unit('key', 'Source string')
+            PoFormat(first)
+        self.assertEqual(len(self.get_entries()), 1)
+
+    def test_eviction_temp(self):
+        dirname = get_cache_dir()
+        os.makedirs(dirname)
+        temp = os.path.join(dirname, TEMP_PREFIX + 'other')
+        with open(temp, 'wb') as handle:
+            handle.write(b'x' * 1024 * 1024)
+        PoFormat(self.copy_file(TEST_PO, 'cs.po'))
+        # File being written by other process is kept and not counted
+        self.assertTrue(os.path.exists(temp))
+        self.assertEqual(len(self.get_entries()), 2)
+
+    def test_unpicklable(self):
+        filename = self.copy_file(TEST_XLIFF, 'cs.xliff')
+        store = XliffFormat(filename)
+        self.assertEqual(self.get_entries(), [])
+        self.assertIn(store.store.__class__, UNPICKLABLE)
+
+    @override_settings(PARSED_STORE_CACHE_SIZE=0)
+    def test_disabled(self):
+        PoFormat(self.copy_file(TEST_PO, 'cs.po'))
+        self.assertEqual(self.get_entries(), [])
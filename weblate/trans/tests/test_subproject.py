@@ -24,6 +24,7 @@ import os
 import shutil
 
 from django.core.exceptions import ValidationError
+from django.test.utils import override_settings
 
 from weblate.trans.formats import ParseError
 from weblate.trans.models import (
@@ -31,6 +32,7 @@ from weblate.trans.models import (
 )
 from weblate.trans.tests.test_models import RepoTestCase
 from weblate.trans.tests.test_views import ViewTestCase
+from weblate.utils.backgroundqueue import no_threads
 from weblate.utils.state import STATE_TRANSLATED
 
 
@@ -131,6 +133,40 @@ class SubProjectTest(RepoTestCase):
         project = self.create_po()
         self.verify_subproject(project, 3, 'cs', 4)
 
+    @override_settings(PARSE_PROCESSES=2)
+    def test_create_po_parallel(self):
+        with no_threads():
+            project = self.create_po()
+        self.verify_subproject(project, 3, 'cs', 4)
+
+    @override_settings(PARSE_PROCESSES=2)
+    def test_parse_server(self):
+        project = self.create_po()
+        # Workers are not forked from server processes
+        self.assertEqual(
+            project.parse_translations(
+                project.get_mask_matches(), force=True
+            ),
+            (None, {})
+        )
+
+    @override_settings(PARSE_PROCESSES=2, WIDGET_PRERENDER=True)
+    def test_parse_command(self):
+        with no_threads():
+            project = self.create_po()
+            pool, parsed = project.parse_translations(
+                project.get_mask_matches(), force=True
+            )
+        self.assertIsNotNone(pool)
+        pool.join()
+        self.assertEqual(len(parsed), 3)
+
+    @override_settings(PARSE_PROCESSES=2)
+    def test_create_po_mono_parallel(self):
+        with no_threads():
+            project = self.create_po_mono()
+        self.verify_subproject(project, 4, 'cs', 4)
+
     def test_create_po_mercurial(self):
         project = self.create_po_mercurial()
         self.verify_subproject(project, 3, 'cs', 4)
@@ -167,6 +203,12 @@ class SubProjectTest(RepoTestCase):
         project = self.create_android()
         self.verify_subproject(project, 2, 'cs', 4)
 
+    @override_settings(PARSE_PROCESSES=2)
+    def test_create_json_mono_parallel(self):
+        with no_threads():
+            project = self.create_json_mono()
+        self.verify_subproject(project, 2, 'cs', 4)
+
     def test_create_json(self):
         project = self.create_json()
         self.verify_subproject(project, 1, 'cs', 4)
@@ -271,6 +271,40 @@ class VCSGitTest(TestCase, RepoTestMixin, TempDirMixin):
         self.test_commit()
         self.assertTrue(self.repo.needs_push())
 
+    def test_status_snapshot(self):
+        status = self.repo.get_status()
+        self.assertFalse(status.needs_commit())
+        self.assertFalse(status.needs_merge)
+        self.assertFalse(status.needs_push)
+        # Writes with lock held invalidate the snapshot
+        with self.repo.lock:
+            filename = os.path.join(self.tempdir, 'README.md')
+            with open(filename, 'a') as handle:
+                handle.write('CHANGE')
+            self.assertTrue(self.repo.get_status().needs_commit())
+        status = self.repo.get_status()
+        self.assertTrue(status.needs_commit())
+        self.assertTrue(status.needs_commit('README.md'))
+        self.assertFalse(status.needs_commit('dummy'))
+
+    def test_changes_locked(self):
+        with self.repo.lock:
+            filename = os.path.join(self.tempdir, 'README.md')
+            with open(filename, 'a') as handle:
+                handle.write('CHANGE')
+            status = self.repo.get_changes()
+            self.assertTrue(status.needs_commit('README.md'))
+            # Remote branch is not compared while locked
+            self.assertIsNone(status.needs_merge)
+        self.assertTrue(self.repo.get_changes().needs_commit())
+
+    def test_status_snapshot_push(self):
+        self.repo.get_status()
+        self.test_commit()
+        status = self.repo.get_status()
+        self.assertFalse(status.needs_commit())
+        self.assertTrue(status.needs_push)
+
     def test_is_supported(self):
         self.assertTrue(self._class.is_supported())
 
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test for VCS profiling statistics."""
+
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from weblate.trans import vcsprofile
+
+
+class VCSProfileTest(SimpleTestCase):
+    def setUp(self):
+        vcsprofile.reset_profile()
+        # Avoid periodic flush while recording
+        vcsprofile.LAST_FLUSH[0] = time.time()
+
+    def tearDown(self):
+        vcsprofile.release_cache_lock()
+        vcsprofile.reset_profile()
+
+    def get_operations(self):
+        return {
+            item['operation']: item
+            for item in vcsprofile.get_profile()
+        }
+
+    def test_merge(self):
+        vcsprofile.record_operation('test', 'fetch', 0.5, size=10)
+        vcsprofile.flush_profile(True)
+        vcsprofile.record_operation('test', 'fetch', 0.25, 1, 20)
+        operation = self.get_operations()['fetch']
+        self.assertEqual(operation['count'], 2)
+        self.assertEqual(operation['errors'], 1)
+        self.assertEqual(operation['bytes'], 30)
+        self.assertEqual(operation['max_time'], 0.5)
+
+    def test_locked(self):
+        vcsprofile.record_operation('test', 'fetch', 0.5)
+        cache.add(vcsprofile.PROFILE_LOCK_KEY, True)
+        wait = vcsprofile.LOCK_WAIT
+        vcsprofile.LOCK_WAIT = 0
+        try:
+            vcsprofile.flush_profile(True)
+        finally:
+            vcsprofile.LOCK_WAIT = wait
+        # Data is kept until lock is available
+        self.assertIsNone(cache.get(vcsprofile.PROFILE_CACHE_KEY))
+        vcsprofile.release_cache_lock()
+        self.assertEqual(self.get_operations()['fetch']['count'], 1)
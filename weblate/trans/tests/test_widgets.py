@@ -23,12 +23,14 @@
 from django.test import TestCase
 from django.test.utils import override_settings
 
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from django.urls import reverse
 
 from weblate.trans.models import Translation
 from weblate.trans.tests.test_views import FixtureTestCase
 from weblate.trans.views.widgets import WIDGETS
+from weblate.trans.widgetqueue import prerender_widgets
 from weblate.trans.fonts import get_font
 import weblate.trans.fonts
 
@@ -87,6 +89,44 @@ class WidgetsTest(FixtureTestCase):
         )
         self.assertContains(response, 'Test')
 
+    def get_widget(self, **kwargs):
+        return self.client.get(
+            reverse(
+                'widget-image',
+                kwargs={
+                    'project': self.project.slug,
+                    'widget': 'svg',
+                    'color': 'badge',
+                    'extension': 'svg',
+                }
+            ),
+            **kwargs
+        )
+
+    def test_widget_not_modified(self):
+        response = self.get_widget()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('max-age=3600', response['Cache-Control'])
+        response = self.get_widget(HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_widget_changed(self):
+        etag = self.get_widget()['ETag']
+        for translation in Translation.objects.all():
+            translation.stats.store('translated', 3)
+            translation.stats.save()
+        self.subproject.stats.invalidate()
+        self.project.stats.invalidate()
+        response = self.get_widget(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_prerender(self):
+        widget = WIDGETS['287x66'](self.project, 'grey')
+        cache.delete('widget-{0}'.format(widget.version))
+        prerender_widgets(self.project)
+        self.assertIsNotNone(cache.get('widget-{0}'.format(widget.version)))
+
 
 class WidgetsMeta(type):
     def __new__(mcs, name, bases, attrs):  # noqa
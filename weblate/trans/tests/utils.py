@@ -29,9 +29,12 @@ from unittest import SkipTest
 from django.conf import settings
 from django.contrib.auth.models import User
 
+from weblate.accounts.models import Profile
+from weblate.lang.models import Language
 from weblate.trans.formats import FILE_FORMATS
 from weblate.trans.models import Project, SubProject
 from weblate.trans.search import clean_indexes
+from weblate.trans.unitqueue import process_unit_update
 from weblate.trans.vcs import VCS_REGISTRY
 
 # Directory holding test data
@@ -64,6 +67,28 @@ def create_test_user():
     )
 
 
+def create_subscriber(project):
+    """Create user subscribed to translation notifications in project."""
+    user = User.objects.create_user(
+        'subscriber',
+        'subscriber@example.org',
+        'testpassword',
+    )
+    profile = Profile.objects.get_or_create(user=user)[0]
+    profile.subscribe_any_translation = True
+    profile.subscribe_new_contributor = True
+    profile.subscriptions.add(project)
+    profile.languages.add(Language.objects.get(code='cs'))
+    profile.save()
+    return user
+
+
+def run_unit_updates():
+    """Process queued unit updates in the current thread."""
+    while process_unit_update():
+        continue
+
+
 class RepoTestMixin(object):
     """Mixin for testing with test repositories."""
     git_base_repo_path = None
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Background processing of side effects of saving units.
+
+Saving unit in the request only locks, stores it and logs the change, the
+remaining work is stored in the PendingUnitUpdate table within the same
+transaction. Once committed, it is processed by single local thread, so the
+updates survive restart of the process and failed ones are retried.
+"""
+
+from __future__ import unicode_literals
+
+import sys
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.encoding import force_text
+
+from weblate.trans.models.unitqueue import PendingUnitUpdate
+from weblate.utils.backgroundqueue import QueueWorkers
+from weblate.utils.errors import report_error
+from weblate.logger import LOGGER
+
+
+def queue_unit_update(request, unit, old_unit, user, acting_user,
+                      change_action, change, propagate, saved):
+    """Process updates depending on saved unit.
+
+    With BACKGROUND_UNIT_UPDATES the updates are stored and processed in the
+    background without access to the request, otherwise they are processed
+    immediately.
+    """
+    if settings.BACKGROUND_UNIT_UPDATES:
+        PendingUnitUpdate.objects.enqueue(
+            unit, old_unit, user, acting_user, change_action, change,
+            propagate, saved
+        )
+        transaction.on_commit(UPDATER.wake)
+    else:
+        unit.deferred_save_backend(
+            request, acting_user, user, change_action, old_unit, change,
+            propagate, saved
+        )
+
+
+def process_unit_update():
+    """Process single due unit update from the queue.
+
+    Returns False if there was nothing to process.
+    """
+    update = PendingUnitUpdate.objects.claim()
+    if update is None:
+        return False
+    try:
+        with transaction.atomic():
+            update.unit.deferred_save_backend(
+                None, update.acting_user, update.user, update.action,
+                update.get_old_unit(), update.change, update.propagate,
+                update.saved
+            )
+        update.finish()
+    except Exception as error:
+        report_error(error, sys.exc_info())
+        if not update.fail(force_text(error)):
+            LOGGER.error(
+                'giving up background unit update after %d attempts: %s',
+                update.attempts, error
+            )
+    return True
+
+
+class UnitUpdater(QueueWorkers):
+    """Single thread processing queued unit updates in order."""
+    name = 'unit update'
+
+    def get_wait(self):
+        return settings.BACKGROUND_UNIT_UPDATES_BACKOFF
+
+    def is_empty(self):
+        return not PendingUnitUpdate.objects.exists()
+
+    def process(self):
+        return process_unit_update()
+
+
+UPDATER = UnitUpdater()
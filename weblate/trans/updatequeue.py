@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Deduplicating queue of background repository updates."""
+
+from __future__ import unicode_literals
+
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.utils.encoding import force_text
+
+from weblate.trans.models import Project, PendingUpdate
+from weblate.utils.backgroundqueue import QueueWorkers
+from weblate.utils.errors import report_error
+
+RUNNING = set()
+RUNNING_LOCK = threading.Lock()
+
+
+def queue_update(obj):
+    """Queue update of project or component repositories."""
+    if isinstance(obj, Project):
+        components = obj.all_repo_components()
+    else:
+        components = [obj]
+    for component in components:
+        PendingUpdate.objects.enqueue(component)
+    WORKERS.wake()
+
+
+def process_update():
+    """Process single due update from the queue.
+
+    Returns False if there was nothing to process.
+    """
+    with RUNNING_LOCK:
+        update = PendingUpdate.objects.claim(RUNNING)
+        if update is None:
+            return False
+        RUNNING.add(update.subproject_id)
+
+    try:
+        component = update.subproject
+        start = time.time()
+        try:
+            result = component.do_update()
+            error = '' if result else 'Repository update has failed'
+        except Exception as exc:
+            report_error(exc, sys.exc_info())
+            result = False
+            error = force_text(exc)
+        component.log_info(
+            'background update took %.2f seconds', time.time() - start
+        )
+        if result:
+            update.finish()
+        elif not update.fail(error):
+            component.log_error(
+                'giving up background update after %d attempts: %s',
+                update.attempts, error
+            )
+    finally:
+        with RUNNING_LOCK:
+            RUNNING.discard(update.subproject_id)
+
+    return True
+
+
+class UpdateWorkers(QueueWorkers):
+    """Fixed size pool of threads processing the update queue."""
+    name = 'update'
+
+    def get_count(self):
+        return settings.BACKGROUND_HOOKS_WORKERS
+
+    def get_wait(self):
+        return settings.BACKGROUND_HOOKS_BACKOFF
+
+    def is_empty(self):
+        return not PendingUpdate.objects.exists()
+
+    def process(self):
+        return process_update()
+
+
+WORKERS = UpdateWorkers()
@@ -27,6 +27,7 @@ import os.path
 import re
 import sys
 import subprocess
+import time
 import logging
 
 from dateutil import parser
@@ -42,7 +43,9 @@ from six.moves.configparser import RawConfigParser
 from weblate.trans.util import (
     get_clean_env, add_configuration_error, path_separator
 )
+from weblate.utils.classloader import load_class
 from weblate.utils.filelock import FileLock
+from weblate.trans.vcsprofile import record_operation, record_lock
 from weblate.trans.ssh import get_wrapper_filename, create_ssh_wrapper
 
 LOGGER = logging.getLogger('weblate-vcs')
@@ -83,6 +86,25 @@ class RepositoryException(Exception):
         return self.get_message()
 
 
+class RepositoryStatus(object):
+    """Snapshot of repository status."""
+    def __init__(self, changed, needs_merge, needs_push, stamp=None):
+        self.changed = changed
+        self.needs_merge = needs_merge
+        self.needs_push = needs_push
+        self.stamp = stamp
+
+    def needs_commit(self, filename=None):
+        """Check whether there are uncommitted changes in given path."""
+        if filename is None:
+            return bool(self.changed)
+        prefix = filename.rstrip('/') + '/'
+        for name in self.changed:
+            if name == filename or name.startswith(prefix):
+                return True
+        return False
+
+
 class Repository(object):
     """Basic repository object."""
     _cmd = 'false'
@@ -91,6 +113,7 @@ class Repository(object):
     _cmd_update_remote = None
     _cmd_push = None
     _cmd_status = ['status']
+    _status_stamp_files = ()
 
     name = None
     req_version = None
@@ -107,9 +130,17 @@ class Repository(object):
             self.branch = branch
         self.component = component
         self.last_output = ''
-        self.lock = FileLock(
+        if local:
+            lock_class = FileLock
+        else:
+            lock_class = load_class(
+                settings.VCS_LOCK_BACKEND, 'VCS_LOCK_BACKEND'
+            )
+        self.lock = lock_class(
             self.path.rstrip('/').rstrip('\\') + '.lock',
-            timeout=120
+            timeout=120,
+            on_release=self.invalidate_status,
+            on_acquire=self.record_lock,
         )
         if not local:
             # Create ssh wrapper for possible use
@@ -121,6 +152,19 @@ class Repository(object):
     def log(cls, message):
         return LOGGER.debug('weblate: %s: %s', cls._cmd, message)
 
+    def record_lock(self, wait):
+        """Record time spent waiting for lock in profiling data."""
+        if self.component is not None:
+            record_lock(self.component.log_prefix, wait)
+
+    def record_operation(self, operation, start, retcode, size):
+        """Record executed command in profiling data."""
+        if self.component is not None:
+            record_operation(
+                self.component.log_prefix, operation, time.time() - start,
+                retcode, size
+            )
+
     def check_config(self):
         """Check VCS configuration."""
         raise NotImplementedError()
@@ -154,8 +198,8 @@ class Repository(object):
         return get_clean_env({'GIT_SSH': get_wrapper_filename()})
 
     @classmethod
-    def _popen(cls, args, cwd=None, err=False, fullcmd=False):
-        """Execute the command using popen."""
+    def _popen_raw(cls, args, cwd=None, fullcmd=False):
+        """Execute the command using popen and return undecoded output."""
         if args is None:
             raise RepositoryException(0, 'Not supported functionality', '')
         if not fullcmd:
@@ -176,6 +220,11 @@ class Repository(object):
                 retcode,
             )
         )
+        return retcode, output, output_err
+
+    @staticmethod
+    def _decode_output(retcode, output, output_err, err=False):
+        """Decode command output, raising exception on failure."""
         if retcode:
             raise RepositoryException(
                 retcode,
@@ -186,6 +235,12 @@ class Repository(object):
             return output_err.decode('utf-8')
         return output.decode('utf-8')
 
+    @classmethod
+    def _popen(cls, args, cwd=None, err=False, fullcmd=False):
+        """Execute the command using popen."""
+        retcode, output, output_err = cls._popen_raw(args, cwd, fullcmd)
+        return cls._decode_output(retcode, output, output_err, err)
+
     def execute(self, args, needs_lock=True, fullcmd=False):
         """Execute command and caches its output."""
         if needs_lock and not self.lock.is_locked:
@@ -193,7 +248,17 @@ class Repository(object):
         # On Windows we pass Unicode object, on others UTF-8 encoded bytes
         if sys.platform != "win32":
             args = [arg.encode('utf-8') for arg in args]
-        self.last_output = self._popen(args, self.path, fullcmd=fullcmd)
+        operation = force_text(args[1 if fullcmd and len(args) > 1 else 0])
+        start = time.time()
+        retcode, output, output_err = self._popen_raw(
+            args, self.path, fullcmd=fullcmd
+        )
+        # Record size of raw output, decoded text length differs for
+        # non ASCII content
+        self.record_operation(
+            operation, start, retcode, len(output) + len(output_err)
+        )
+        self.last_output = self._decode_output(retcode, output, output_err)
         return self.last_output
 
     def clean_revision_cache(self):
@@ -270,6 +335,75 @@ class Repository(object):
         """
         raise NotImplementedError()
 
+    def list_changed_files(self):
+        """Return list of files with uncommitted changes."""
+        raise NotImplementedError()
+
+    def _get_status(self):
+        """Return current repository status."""
+        try:
+            needs_merge = self.needs_merge()
+            needs_push = self.needs_push()
+        except RepositoryException:
+            needs_merge = needs_push = None
+        return RepositoryStatus(
+            self.list_changed_files(), needs_merge, needs_push
+        )
+
+    @cached_property
+    def status_cache_key(self):
+        return 'repo-status-{0}'.format(
+            hashlib.md5(self.path.encode('utf-8')).hexdigest()
+        )
+
+    def _get_status_stamp(self):
+        """Return modification times of VCS metadata.
+
+        These are used to detect changes done outside Weblate.
+        """
+        result = []
+        for name in self._status_stamp_files:
+            try:
+                result.append(os.stat(os.path.join(self.path, name)).st_mtime)
+            except OSError:
+                result.append(None)
+        return result
+
+    def get_status(self):
+        """Return snapshot of repository status.
+
+        The snapshot is shared by all users of the repository and kept until
+        next write to it. While the lock is held, the status is always
+        fetched from the VCS as the working copy might be just changing.
+        """
+        if self.lock.is_locked:
+            return self._get_status()
+        stamp = self._get_status_stamp()
+        result = cache.get(self.status_cache_key)
+        if result is not None and result.stamp == stamp:
+            return result
+        result = self._get_status()
+        # Do not cache incomplete status
+        if result.needs_merge is not None:
+            result.stamp = stamp
+            cache.set(self.status_cache_key, result, 3600)
+        return result
+
+    def get_changes(self):
+        """Return snapshot of uncommitted changes.
+
+        While the lock is held, only the changed files are listed without
+        comparing with the remote branch, otherwise this is same as
+        get_status.
+        """
+        if self.lock.is_locked:
+            return RepositoryStatus(self.list_changed_files(), None, None)
+        return self.get_status()
+
+    def invalidate_status(self):
+        """Invalidate cached status snapshot."""
+        cache.delete(self.status_cache_key)
+
     def _get_revision_info(self, revision):
         """Return dictionary with detailed revision information."""
         raise NotImplementedError()
@@ -394,8 +528,11 @@ class GitRepository(Repository):
     ]
     _cmd_update_remote = ['fetch', 'origin']
     _cmd_push = ['push', 'origin']
+    _status_stamp_files = (
+        '.git/index', '.git/logs/HEAD', '.git/FETCH_HEAD'
+    )
     name = 'Git'
-    req_version = '1.6'
+    req_version = '1.7.2'
     default_branch = 'master'
 
     def is_valid(self):
@@ -469,6 +606,49 @@ class GitRepository(Repository):
         status = self.execute(cmd, needs_lock=False)
         return status != ''
 
+    def list_changed_files(self):
+        """Return list of files with uncommitted changes."""
+        status = self.execute(
+            ['status', '--porcelain', '-z', '--untracked-files=all'],
+            needs_lock=False
+        )
+        result = []
+        entries = iter(status.split('\0'))
+        for entry in entries:
+            if not entry:
+                continue
+            result.append(entry[3:])
+            # Renames and copies are followed by the original name
+            if entry[0] in ('R', 'C'):
+                result.append(next(entries, ''))
+        return result
+
+    def _get_status(self):
+        """Return current repository status.
+
+        Compares with remote branch in single pass instead of separate
+        needs_merge and needs_push checks.
+        """
+        try:
+            ahead, behind = self.execute(
+                [
+                    'rev-list', '--left-right', '--count',
+                    'HEAD...{0}'.format(self.get_remote_branch_name()),
+                ],
+                needs_lock=False
+            ).split()
+            needs_merge = int(behind) > 0
+            needs_push = int(ahead) > 0
+        except (RepositoryException, ValueError):
+            needs_merge = needs_push = None
+        return RepositoryStatus(
+            self.list_changed_files(), needs_merge, needs_push
+        )
+
+    def get_remote_branch_name(self):
+        """Return the remote tracking branch name."""
+        return 'origin/{0}'.format(self.branch)
+
     def show(self, revision):
         """Helper method to get content of revision.
 
@@ -898,6 +1078,7 @@ class HgRepository(Repository):
         'log', '--limit', '1', '--template', '{node}', '--branch', '.'
     ]
     _cmd_update_remote = ['pull', '--branch', '.']
+    _status_stamp_files = ('.hg/dirstate', '.hg/store/00changelog.i')
     name = 'Mercurial'
     req_version = '2.8'
     default_branch = 'default'
@@ -1037,6 +1218,11 @@ class HgRepository(Repository):
         status = self.execute(cmd, needs_lock=False)
         return status != ''
 
+    def list_changed_files(self):
+        """Return list of files with uncommitted changes."""
+        status = self.execute(['status', '--print0'], needs_lock=False)
+        return [entry[2:] for entry in status.split('\0') if entry]
+
     def _get_revision_info(self, revision):
         """Return dictionary with detailed revision information."""
         template = '''
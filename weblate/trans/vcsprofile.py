@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Timing statistics for VCS operations, repository locking and saving units.
+
+The statistics are collected in the process and periodically merged into
+the cache, so that all processes sharing the cache contribute to them. The
+merge is guarded by lock stored in the cache to avoid losing updates from
+concurrent processes.
+"""
+
+from __future__ import unicode_literals
+
+from contextlib import contextmanager
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from weblate.logger import LOGGER
+
+PROFILE_CACHE_KEY = 'vcs-profile'
+PROFILE_LOCK_KEY = 'vcs-profile-lock'
+FLUSH_INTERVAL = 10
+# Expiry of the cache lock, in case process holding it dies
+LOCK_TIMEOUT = 10
+# How long to wait for the cache lock
+LOCK_WAIT = 1
+
+FIELDS = (
+    'count', 'errors', 'time', 'max_time', 'bytes', 'lock_count', 'lock_wait',
+)
+
+PROFILE = {}
+PROFILE_LOCK = threading.Lock()
+LAST_FLUSH = [time.time()]
+
+
+def get_entry(data, component, operation):
+    key = (component, operation)
+    if key not in data:
+        data[key] = dict.fromkeys(FIELDS, 0)
+    return data[key]
+
+
+def record_operation(component, operation, duration, retcode=0, size=0):
+    """Record execution of VCS command."""
+    if duration >= settings.VCS_SLOW_OPERATION:
+        LOGGER.warning(
+            '%s: slow VCS operation %s took %.2f seconds [retcode=%d]',
+            component, operation, duration, retcode
+        )
+    with PROFILE_LOCK:
+        entry = get_entry(PROFILE, component, operation)
+        entry['count'] += 1
+        entry['time'] += duration
+        entry['max_time'] = max(entry['max_time'], duration)
+        entry['bytes'] += size
+        if retcode:
+            entry['errors'] += 1
+    flush_profile()
+
+
+def record_lock(component, wait):
+    """Record time spent waiting for repository lock."""
+    if wait >= settings.VCS_SLOW_OPERATION:
+        LOGGER.warning(
+            '%s: waiting for repository lock took %.2f seconds',
+            component, wait
+        )
+    with PROFILE_LOCK:
+        entry = get_entry(PROFILE, component, 'lock')
+        entry['lock_count'] += 1
+        entry['lock_wait'] += wait
+    flush_profile()
+
+
+def record_phase(component, phase, duration):
+    """Record time spent in phase of saving translation unit."""
+    with PROFILE_LOCK:
+        entry = get_entry(PROFILE, component, phase)
+        entry['count'] += 1
+        entry['time'] += duration
+        entry['max_time'] = max(entry['max_time'], duration)
+    flush_profile()
+
+
+@contextmanager
+def profile_phase(component, phase):
+    """Context manager recording time spent in the block."""
+    start = time.time()
+    try:
+        yield
+    finally:
+        record_phase(component, phase, time.time() - start)
+
+
+def acquire_cache_lock():
+    """Acquire lock on profile data in the cache.
+
+    Returns False if the lock could not be acquired in time.
+    """
+    deadline = time.time() + LOCK_WAIT
+    while not cache.add(PROFILE_LOCK_KEY, True, LOCK_TIMEOUT):
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def release_cache_lock():
+    """Release lock on profile data in the cache."""
+    cache.delete(PROFILE_LOCK_KEY)
+
+
+def flush_profile(force=False):
+    """Merge collected data into the cache."""
+    now = time.time()
+    if not force and now - LAST_FLUSH[0] < FLUSH_INTERVAL:
+        return
+    with PROFILE_LOCK:
+        LAST_FLUSH[0] = now
+        if not PROFILE:
+            return
+        if not acquire_cache_lock():
+            # Keep the data for next flush
+            LOGGER.warning('failed to acquire lock on VCS profile data')
+            return
+        try:
+            data = cache.get(PROFILE_CACHE_KEY, {})
+            for key, values in PROFILE.items():
+                entry = get_entry(data, *key)
+                for field in FIELDS:
+                    if field == 'max_time':
+                        entry[field] = max(entry[field], values[field])
+                    else:
+                        entry[field] += values[field]
+            cache.set(PROFILE_CACHE_KEY, data, None)
+        finally:
+            release_cache_lock()
+        PROFILE.clear()
+
+
+def get_profile():
+    """Return list of collected statistics sorted by time spent."""
+    flush_profile(True)
+    result = []
+    for key, values in cache.get(PROFILE_CACHE_KEY, {}).items():
+        entry = values.copy()
+        entry['component'], entry['operation'] = key
+        entry['total'] = entry['time'] + entry['lock_wait']
+        result.append(entry)
+    return sorted(result, key=lambda item: -item['total'])
+
+
+def reset_profile():
+    """Remove all collected statistics."""
+    with PROFILE_LOCK:
+        PROFILE.clear()
+        locked = acquire_cache_lock()
+        try:
+            cache.delete(PROFILE_CACHE_KEY)
+        finally:
+            if locked:
+                release_cache_lock()
@@ -22,7 +22,6 @@ import csv
 import json
 import re
 import sys
-import threading
 
 import six
 
@@ -38,6 +37,7 @@ from django.http import (
 from weblate.trans.models import SubProject
 from weblate.trans.views.helper import get_project, get_subproject
 from weblate.trans.stats import get_project_stats
+from weblate.trans.updatequeue import queue_update
 from weblate.utils.errors import report_error
 from weblate.logger import LOGGER
 
@@ -92,8 +92,7 @@ def register_hook(handler):
 def perform_update(obj):
     """Trigger update of given object."""
     if settings.BACKGROUND_HOOKS:
-        thread = threading.Thread(target=obj.do_update)
-        thread.start()
+        queue_update(obj)
     else:
         obj.do_update()
 
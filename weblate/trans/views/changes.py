@@ -29,6 +29,10 @@ from django.db.models import Q
 from django.core.exceptions import PermissionDenied
 from django.utils.http import urlencode
 
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+
+from weblate.api.pagination import ChangePagination
 from weblate.utils import messages
 from weblate.trans.models.change import Change
 from weblate.trans.views.helper import get_project_translation
@@ -126,6 +130,23 @@ class ChangesView(ListView):
 
         return context
 
+    def paginate_queryset(self, queryset, page_size):
+        """Paginate using cursor, avoiding counting and offset scans."""
+        paginator = ChangePagination()
+        paginator.page_size = page_size
+        try:
+            object_list = paginator.paginate_queryset(
+                queryset, Request(self.request)
+            )
+        except NotFound:
+            raise Http404('Invalid cursor')
+        return (
+            paginator,
+            None,
+            object_list,
+            paginator.has_next or paginator.has_previous
+        )
+
     def _get_queryset_project(self):
         """Filtering by translation/project."""
         if 'project' in self.request.GET:
@@ -69,25 +69,7 @@ def get_other_units(unit):
         'source': [],
     }
 
-    kwargs = {
-        'translation__subproject__project':
-            unit.translation.subproject.project,
-        'translation__language':
-            unit.translation.language,
-    }
-
-    same = Unit.objects.same(unit, False)
-    same_id = Unit.objects.prefetch().filter(
-        id_hash=unit.id_hash,
-        **kwargs
-    )
-    same_source = Unit.objects.prefetch().filter(
-        source=unit.source,
-        **kwargs
-    )
-
-    units = same | same_id | same_source
-    units = units.distinct()
+    units = Unit.objects.related(unit)
 
     # Is it only this unit?
     if len(units) == 1:
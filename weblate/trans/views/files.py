@@ -42,13 +42,13 @@ from weblate.permissions.helpers import (
 def download_translation_format(request, project, subproject, lang, fmt):
     obj = get_translation(request, project, subproject, lang)
 
-    return download_translation_file(obj, fmt)
+    return download_translation_file(request, obj, fmt)
 
 
 def download_translation(request, project, subproject, lang):
     obj = get_translation(request, project, subproject, lang)
 
-    return download_translation_file(obj)
+    return download_translation_file(request, obj)
 
 
 @require_POST
@@ -19,14 +19,22 @@
 #
 """Helper methods for views."""
 
+from django.conf import settings
 from django.http import HttpResponse, Http404
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 import django.utils.translation
 from django.utils.translation import trans_real, ugettext as _
 
 from weblate.utils import messages
 from weblate.permissions.helpers import check_access
+from weblate.trans.artifacts import (
+    get_etag, get_last_change, get_last_modified, get_artifact_path,
+    open_artifact, store_artifact,
+)
 from weblate.trans.exporters import get_exporter
+from weblate.trans.formats import detect_filename
 from weblate.trans.models import Project, SubProject, Translation
 
 
@@ -109,39 +117,86 @@ def import_message(request, count, message_none, message_ok):
         messages.success(request, message_ok % count)
 
 
-def download_translation_file(translation, fmt=None):
+def export_translation(exporter, translation, fmt, etag):
+    """Return response with translation exported by exporter.
+
+    The exported file is stored in the download cache if enabled.
+    """
+    content = exporter.iterate_content(exporter.get_units(translation))
+    if settings.DOWNLOAD_CACHE_SIZE:
+        path = get_artifact_path(translation, fmt, etag)
+        cached = open_artifact(path)
+        if cached is None:
+            content = store_artifact(path, content)
+        else:
+            content = cached
+    return exporter.get_content_response(
+        content,
+        '{{project}}-{0}-{{language}}.{{extension}}'.format(
+            translation.subproject.slug
+        )
+    )
+
+
+def download_translation_file(request, translation, fmt=None):
     if fmt is not None:
         try:
             exporter = get_exporter(fmt)(translation=translation)
         except KeyError:
             raise Http404('File format not supported')
-        exporter.add_units(translation)
-        return exporter.get_response(
-            '{{project}}-{0}-{{language}}.{{extension}}'.format(
-                translation.subproject.slug
-            )
-        )
+    else:
+        # Force flushing pending units
+        author = translation.get_last_author(True)
+        translation.update_units(author)
+
+    # Handle conditional requests
+    last_change = get_last_change(translation)
+    etag = get_etag(translation, last_change, fmt)
+    last_modified = get_last_modified(translation, last_change)
+    response = get_conditional_response(
+        request, quote_etag(etag), last_modified
+    )
+
+    if response is None:
+        if fmt is None:
+            response = get_file_response(translation)
+        else:
+            response = export_translation(exporter, translation, fmt, etag)
+
+    response['ETag'] = quote_etag(etag)
+    response['Last-Modified'] = http_date(last_modified)
+    return response
 
-    # Force flushing pending units
-    author = translation.get_last_author(True)
-    translation.update_units(author)
 
+def get_file_response(translation):
     srcfilename = translation.get_filename()
 
+    # Get format details without parsing the file
+    file_format = translation.subproject.file_format_cls
+    if file_format.get_class() is None:
+        file_format = detect_filename(srcfilename)
+    if file_format is None:
+        # Format can not be detected from the file name
+        extension = translation.store.extension
+        mimetype = translation.store.mimetype
+    else:
+        extension = file_format.get_extension()
+        mimetype = file_format.get_mimetype()
+
     # Construct file name (do not use real filename as it is usually not
     # that useful)
     filename = '{0}-{1}-{2}.{3}'.format(
         translation.subproject.project.slug,
         translation.subproject.slug,
         translation.language.code,
-        translation.store.extension
+        extension
     )
 
     # Create response
-    with open(srcfilename) as handle:
+    with open(srcfilename, 'rb') as handle:
         response = HttpResponse(
             handle.read(),
-            content_type=translation.store.mimetype
+            content_type=mimetype
         )
 
     # Fill in response headers
@@ -111,12 +111,7 @@ def get_unit_translations(request, unit_id):
         'js/translations.html',
         {
             'units': sort_objects(
-                Unit.objects.filter(
-                    id_hash=unit.id_hash,
-                    translation__subproject=unit.translation.subproject,
-                ).exclude(
-                    pk=unit.pk
-                )
+                Unit.objects.other_translations(unit)
             ),
         }
     )
@@ -25,7 +25,7 @@ from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
 
-from weblate.trans.models.change import Change
+from weblate.trans.models.change import Change, ChangeArchive
 from weblate.trans.forms import ReportsForm
 from weblate.trans.util import redirect_param
 from weblate.trans.views.helper import get_subproject, show_form_errors
@@ -141,12 +141,15 @@ def generate_counts(component, start_date, end_date):
     result = {}
 
     for translation in component.translation_set.all():
-        authors = Change.objects.content().filter(
-            translation=translation,
-            timestamp__range=(start_date, end_date),
-        ).values_list(
-            'author__email', 'author__first_name', 'unit__num_words', 'action',
-        )
+        authors = []
+        for changes in (Change.objects, ChangeArchive.objects):
+            authors.extend(changes.content().filter(
+                translation=translation,
+                timestamp__range=(start_date, end_date),
+            ).values_list(
+                'author__email', 'author__first_name', 'unit__num_words',
+                'action',
+            ))
         for email, name, words, action in authors:
             if words is None:
                 continue
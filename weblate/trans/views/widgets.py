@@ -21,6 +21,8 @@
 from django.http import HttpResponse, Http404
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 
 from weblate.utils.site import get_site_url
 from weblate.lang.models import Language
@@ -32,6 +34,9 @@ from weblate.trans.views.helper import (
 )
 from weblate.trans.util import render
 
+# How long (in seconds) clients can use widget without checking for changes
+WIDGET_MAX_AGE = 3600
+
 
 def widgets_root(request):
     return render(
@@ -155,10 +160,14 @@ def render_widget(request, project, widget='287x66', color=None, lang=None,
             return redirect('widget-image', permanent=True, **kwargs)
         return redirect('widget-image', permanent=True, **kwargs)
 
-    # Render widget
-    widget_obj.render()
-
-    return HttpResponse(
-        content_type=widget_obj.content_type,
-        content=widget_obj.get_content()
-    )
+    # Render widget unless client has current one
+    etag = quote_etag(widget_obj.version)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(
+            content_type=widget_obj.content_type,
+            content=widget_obj.get_cached_content()
+        )
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=WIDGET_MAX_AGE)
+    return response
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Background rendering of commonly used widgets."""
+
+from __future__ import unicode_literals
+
+import sys
+import threading
+
+from django.conf import settings
+from django.db import connection
+from django.utils import translation
+
+from weblate.trans.models import Project
+from weblate.trans.widgets import WIDGETS, PRERENDER_WIDGETS
+from weblate.utils.errors import report_error
+from weblate.logger import LOGGER
+
+
+def prerender_widgets(project):
+    """Render commonly used widgets for project into the cache."""
+    with translation.override(settings.LANGUAGE_CODE):
+        for name, color in PRERENDER_WIDGETS:
+            WIDGETS[name](project, color).get_cached_content()
+
+
+class WidgetRenderer(object):
+    """Single thread rendering widgets for projects with changed stats."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.event = threading.Event()
+        self.pending = set()
+        self.thread = None
+
+    def queue(self, project_id):
+        """Queue project for rendering, starting worker if needed."""
+        with self.lock:
+            self.pending.add(project_id)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.worker)
+                self.thread.daemon = True
+                self.thread.start()
+        self.event.set()
+
+    def pop(self):
+        with self.lock:
+            self.event.clear()
+            result = self.pending
+            self.pending = set()
+            return result
+
+    def is_idle(self):
+        """Check whether there is nothing to do and detach the worker."""
+        with self.lock:
+            if self.pending:
+                return False
+            self.thread = None
+            return True
+
+    def worker(self):
+        try:
+            while True:
+                pending = self.pop()
+                for project in Project.objects.filter(pk__in=pending):
+                    prerender_widgets(project)
+                # Terminate idle worker, it will be started on next queue
+                if not self.event.wait(60) and self.is_idle():
+                    return
+        except Exception as error:
+            with self.lock:
+                self.thread = None
+            LOGGER.error('background widget rendering failed')
+            report_error(error, sys.exc_info())
+        finally:
+            connection.close()
+
+
+RENDERER = WidgetRenderer()
+
+
+def queue_widgets(project):
+    """Queue rendering of widgets for project."""
+    RENDERER.queue(project.pk)
@@ -18,6 +18,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 
+import hashlib
 import os.path
 from io import BytesIO
 
@@ -26,7 +27,10 @@ try:
 except ImportError:
     from django.utils.encoding import force_text as get_display
 
+from django.core.cache import cache
 from django.urls import reverse
+from django.utils.encoding import force_text
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext as _, pgettext, get_language
 from django.template.loader import render_to_string
 
@@ -61,6 +65,13 @@ COLOR_DATA = {
 
 WIDGETS = {}
 
+# Widgets which are rendered to the cache in advance
+PRERENDER_WIDGETS = (
+    ('287x66', 'grey'),
+    ('88x31', 'grey'),
+    ('svg', 'badge'),
+)
+
 
 def register_widget(widget):
     """Register widget in dictionary."""
@@ -115,6 +126,40 @@ class ContentWidget(Widget):
         """Return content of the badge."""
         raise NotImplementedError()
 
+    def get_cache_params(self):
+        """Return values which affect rendered content."""
+        return [
+            self.name,
+            self.color,
+            self.obj.__class__.__name__,
+            self.obj.pk,
+            self.lang.code if self.lang else '',
+            get_language(),
+            self.percent,
+        ]
+
+    @cached_property
+    def version(self):
+        """Return token changing whenever rendered content changes.
+
+        It is based on the statistics used for rendering, so no explicit
+        invalidation is needed.
+        """
+        params = ':'.join(
+            force_text(param) for param in self.get_cache_params()
+        )
+        return hashlib.sha1(params.encode('utf-8')).hexdigest()
+
+    def get_cached_content(self):
+        """Return content of the badge, rendering it only if needed."""
+        cache_key = 'widget-{0}'.format(self.version)
+        content = cache.get(cache_key)
+        if content is None:
+            self.render()
+            content = self.get_content()
+            cache.set(cache_key, content, 30 * 86400)
+        return content
+
 
 class BitmapWidget(ContentWidget):
     """Base class for bitmap rendering widgets."""
@@ -147,6 +192,11 @@ class BitmapWidget(ContentWidget):
             'percent': self.percent,
         }
 
+    def get_cache_params(self):
+        result = super(BitmapWidget, self).get_cache_params()
+        result.extend((self.obj.name, self.total, self.languages))
+        return result
+
     def get_filename(self):
         """Return widgets filename."""
         return os.path.join(
@@ -410,6 +460,12 @@ class MultiLanguageWidget(SVGWidget):
         'auto': None,
     }
 
+    def get_cache_params(self):
+        result = super(MultiLanguageWidget, self).get_cache_params()
+        for stats in self.obj.stats.get_language_stats():
+            result.extend((stats.language.code, stats.translated_percent))
+        return result
+
     def render(self):
         translations = []
         offset = 30
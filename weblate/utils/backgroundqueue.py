@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Database backed queues processed by background threads.
+
+Entries are claimed with a lease, so that they are retried in case the
+processing worker dies, and failed ones are retried with exponential
+backoff. The timing is configured by settings with prefix given by the
+queue model, for example BACKGROUND_HOOKS_RETRIES.
+
+Background threads are started only in server processes, management
+commands process the queues inline, see no_threads.
+"""
+
+from __future__ import unicode_literals
+
+from contextlib import contextmanager
+from datetime import timedelta
+import sys
+import threading
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from weblate.utils.errors import report_error
+from weblate.logger import LOGGER
+
+# Whether background threads can be started in this process
+THREADS_ALLOWED = [True]
+
+
+@contextmanager
+def no_threads():
+    """Do not start background threads within the block.
+
+    Used by management commands, these process queued entries inline and
+    skip prerendering widgets, so that worker processes can be safely
+    forked, see PARSE_PROCESSES.
+    """
+    previous = THREADS_ALLOWED[0]
+    THREADS_ALLOWED[0] = False
+    try:
+        yield
+    finally:
+        THREADS_ALLOWED[0] = previous
+
+
+def threads_allowed():
+    return THREADS_ALLOWED[0]
+
+
+class BackgroundQueueManager(models.Manager):
+    # pylint: disable=no-init
+
+    def claim(self, **exclude):
+        """Claim next due entry for processing.
+
+        The entry is leased for the queue TIMEOUT setting, entries matching
+        exclude are skipped.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            entries = self.select_for_update().filter(
+                next_attempt__lte=now
+            ).exclude(
+                **exclude
+            ).order_by(
+                self.model.claim_order
+            )
+            try:
+                entry = entries[0]
+            except IndexError:
+                return None
+            entry.attempts += 1
+            entry.next_attempt = now + timedelta(
+                seconds=self.model.get_setting('TIMEOUT')
+            )
+            entry.save(update_fields=['attempts', 'next_attempt'])
+        return entry
+
+    def stats(self):
+        """Return queue depth metrics."""
+        now = timezone.now()
+        result = self.aggregate(pending=Count('id'), oldest=Min('timestamp'))
+        result['due'] = self.filter(next_attempt__lte=now).count()
+        result['failing'] = self.exclude(last_error='').count()
+        if result['oldest'] is None:
+            result['age'] = 0
+        else:
+            result['age'] = (now - result['oldest']).total_seconds()
+        return result
+
+
+class BackgroundQueue(models.Model):
+    """Entry of queue processed in background."""
+    timestamp = models.DateTimeField(default=timezone.now)
+    next_attempt = models.DateTimeField(default=timezone.now, db_index=True)
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    objects = BackgroundQueueManager()
+
+    # Prefix of settings configuring the queue
+    settings_prefix = None
+    # Order in which the entries are processed
+    claim_order = 'pk'
+
+    class Meta(object):
+        abstract = True
+
+    @classmethod
+    def get_setting(cls, name):
+        return getattr(settings, '{0}_{1}'.format(cls.settings_prefix, name))
+
+    def finish(self):
+        """Remove processed entry."""
+        self.__class__.objects.filter(pk=self.pk).delete()
+
+    def fail(self, error):
+        """Schedule retry of failed entry with exponential backoff.
+
+        Returns False if the entry was removed after reaching the RETRIES
+        setting.
+        """
+        if self.attempts >= self.get_setting('RETRIES'):
+            self.finish()
+            return False
+        delay = self.get_setting('BACKOFF') * 2 ** (self.attempts - 1)
+        self.__class__.objects.filter(pk=self.pk).update(
+            next_attempt=timezone.now() + timedelta(seconds=delay),
+            last_error=error,
+        )
+        return True
+
+
+class QueueWorkers(object):
+    """Threads processing queue in the background.
+
+    The threads are started on demand and terminate once the queue is empty,
+    subclasses implement process, is_empty and get_wait.
+    """
+    name = 'queue'
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.event = threading.Event()
+        self.threads = []
+
+    def get_count(self):
+        """Return number of threads processing the queue."""
+        return 1
+
+    def get_wait(self):
+        """Return delay before checking for due entries again."""
+        raise NotImplementedError()
+
+    def is_empty(self):
+        raise NotImplementedError()
+
+    def process(self):
+        """Process due entries, returns false value if there were none."""
+        raise NotImplementedError()
+
+    def wake(self):
+        """Notify workers about new entries, starting them if needed.
+
+        Without threads allowed the due entries are processed immediately.
+        """
+        if not threads_allowed():
+            while self.process():
+                continue
+            return
+        with self.lock:
+            self.threads = [
+                thread for thread in self.threads if thread.is_alive()
+            ]
+            while len(self.threads) < self.get_count():
+                thread = threading.Thread(target=self.worker)
+                thread.daemon = True
+                thread.start()
+                self.threads.append(thread)
+        self.event.set()
+
+    def detach(self):
+        """Remove current thread from the workers."""
+        thread = threading.current_thread()
+        if thread in self.threads:
+            self.threads.remove(thread)
+
+    def is_idle(self):
+        """Check whether there is nothing to process and detach worker."""
+        with self.lock:
+            if not self.is_empty():
+                return False
+            self.detach()
+            return True
+
+    def worker(self):
+        try:
+            while True:
+                self.event.clear()
+                while self.process():
+                    continue
+                if self.event.wait(self.get_wait()):
+                    continue
+                # Terminate idle worker, it will be started on next wake
+                if self.is_idle():
+                    return
+        except Exception as error:
+            with self.lock:
+                self.detach()
+            LOGGER.error('background %s worker failed', self.name)
+            report_error(error, sys.exc_info())
+        finally:
+            connection.close()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Version counters stored in the cache.
+
+Data derived from the database can be cached under the version, which is
+increased on any change of the source data, so that all processes sharing
+the cache stop using the outdated data.
+"""
+
+from __future__ import unicode_literals
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_version(key):
+    """Return current version stored under the key."""
+    version = cache.get(key)
+    if version is None:
+        # Start with timestamp so that version does not go back in case
+        # the key was evicted from the cache
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """Increase version stored under the key."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        get_version(key)
+
+
+def invalidate_version(key):
+    """Increase version now and once more after commit.
+
+    The second increase discards data derived by other processes before
+    the change was visible to them.
+    """
+    bump_version(key)
+    transaction.on_commit(lambda: bump_version(key))
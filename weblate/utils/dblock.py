@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Database based locking usable across several servers."""
+
+from __future__ import unicode_literals
+
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import (
+    connection, connections, DEFAULT_DB_ALIAS, OperationalError,
+)
+
+from weblate.utils.filelock import FileLockBase, FileLockException
+from weblate.utils.hash import calculate_hash
+
+
+class PostgreSQLLock(FileLockBase):
+    """Lock based on PostgreSQL advisory locks.
+
+    The lock is identified by hash of the lock file name, so it can be used
+    as drop in replacement for FileLock. The lock is held by dedicated
+    database session owned by the lock object, so it is not released when
+    the connection of the thread is closed. Waiting is handled by the
+    database server, limited by lock_timeout.
+    """
+    def __init__(self, file_name, timeout=10, delay=.05, on_release=None,
+                 on_acquire=None):
+        super(PostgreSQLLock, self).__init__(
+            file_name, timeout, delay, on_release, on_acquire
+        )
+        self.key = calculate_hash(None, file_name)
+        self.connection = None
+
+    @staticmethod
+    def check_database():
+        if connection.vendor != 'postgresql':
+            raise ImproperlyConfigured(
+                'PostgreSQLLock can be used only with PostgreSQL database'
+            )
+
+    @staticmethod
+    def get_connection():
+        """Return new connection to the default database."""
+        wrapper = connections[DEFAULT_DB_ALIAS]
+        return wrapper.__class__(
+            wrapper.settings_dict.copy(),
+            DEFAULT_DB_ALIAS,
+            allow_thread_sharing=True
+        )
+
+    def close_connection(self):
+        """Close the connection, releasing locks held by it."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def acquire(self):
+        """Acquire the lock, blocking up to timeout seconds."""
+        self.check_database()
+        self.depth += 1
+        if self.is_locked:
+            return
+
+        start_time = time.time()
+        self.connection = self.get_connection()
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    'SET lock_timeout = %s',
+                    [max(1, int(self.timeout * 1000))]
+                )
+                cursor.execute('SELECT pg_advisory_lock(%s)', [self.key])
+        except OperationalError:
+            self.depth -= 1
+            self.close_connection()
+            raise FileLockException("Timeout occured.")
+
+        self.is_locked = True
+        if self.on_acquire is not None:
+            self.on_acquire(time.time() - start_time)
+
+    def check_lock(self):
+        """Check whether lock is locked by this or any other object.
+
+        The lock table is inspected instead of trying to acquire the lock,
+        as advisory locks are reentrant within the session.
+        """
+        if self.is_locked:
+            return True
+        self.check_database()
+        # Single bigint key is stored split into two oid columns
+        with connection.cursor() as cursor:
+            cursor.execute(
+                '''
+                SELECT COUNT(*) FROM pg_locks
+                WHERE locktype = 'advisory' AND granted AND objsubid = 1
+                AND classid::bigint = %s AND objid::bigint = %s
+                AND database = (
+                    SELECT oid FROM pg_database
+                    WHERE datname = current_database()
+                )
+                ''',
+                [(self.key >> 32) & 0xFFFFFFFF, self.key & 0xFFFFFFFF]
+            )
+            return cursor.fetchone()[0] > 0
+
+    def release(self):
+        """Release the lock."""
+        self.depth -= 1
+        if self.is_locked and self.depth == 0:
+            try:
+                with self.connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT pg_advisory_unlock(%s)', [self.key]
+                    )
+            finally:
+                self.close_connection()
+            self.is_locked = False
+            if self.on_release is not None:
+                self.on_release()
@@ -42,16 +42,23 @@ class FileLockBase(object):
     It can be also used as a context-manager using with statement.
     """
 
-    def __init__(self, file_name, timeout=10, delay=.05):
+    def __init__(self, file_name, timeout=10, delay=.05, on_release=None,
+                 on_acquire=None):
         """
         Prepare the file locker. Specify the file to lock and optionally
         the maximum timeout and the delay between each attempt to lock.
+
+        The on_acquire callback is invoked with time spent waiting whenever
+        the lock is acquired, the on_release callback whenever it is
+        released.
         """
         # Lock file
         self.lockfile = file_name
         # Remember parameters
         self.timeout = timeout
         self.delay = delay
+        self.on_release = on_release
+        self.on_acquire = on_acquire
         self.depth = 0
 
         # Initial state
@@ -91,6 +98,8 @@ class FileLockBase(object):
                     self.handle = self.open_file()
                 self.try_lock(self.handle)
                 self.is_locked = True
+                if self.on_acquire is not None:
+                    self.on_acquire(time.time() - start_time)
                 return
             except IOError as error:
                 if error.errno not in [errno.EACCES, errno.EAGAIN]:
@@ -133,6 +142,8 @@ class FileLockBase(object):
             except OSError:
                 pass
             self.is_locked = False
+            if self.on_release is not None:
+                self.on_release()
 
     def __enter__(self):
         """Context-manager support, executed when entering with statement.
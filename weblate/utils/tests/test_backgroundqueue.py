@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test for background queue workers."""
+
+from __future__ import unicode_literals
+
+from django.test import SimpleTestCase
+
+from weblate.utils.backgroundqueue import (
+    QueueWorkers, no_threads, threads_allowed,
+)
+
+
+class ListWorkers(QueueWorkers):
+    def __init__(self, count):
+        super(ListWorkers, self).__init__()
+        self.count = count
+        self.pending = []
+        self.processed = []
+
+    def get_count(self):
+        return self.count
+
+    def get_wait(self):
+        return 0.01
+
+    def is_empty(self):
+        return not self.pending
+
+    def process(self):
+        with self.lock:
+            if not self.pending:
+                return False
+            self.processed.append(self.pending.pop(0))
+        return True
+
+
+class QueueWorkersTest(SimpleTestCase):
+    def run_workers(self, count):
+        workers = ListWorkers(count)
+        workers.pending.extend(range(10))
+        workers.wake()
+        with workers.lock:
+            threads = list(workers.threads)
+        for thread in threads:
+            thread.join(10)
+        self.assertEqual(sorted(workers.processed), list(range(10)))
+        # Idle workers are detached and started again on wake
+        self.assertEqual(workers.threads, [])
+
+    def test_single(self):
+        self.run_workers(1)
+
+    def test_pool(self):
+        self.run_workers(3)
+
+    def test_no_threads(self):
+        workers = ListWorkers(1)
+        workers.pending.extend(range(10))
+        with no_threads():
+            self.assertFalse(threads_allowed())
+            workers.wake()
+        self.assertTrue(threads_allowed())
+        # Entries are processed inline
+        self.assertEqual(workers.threads, [])
+        self.assertEqual(workers.processed, list(range(10)))
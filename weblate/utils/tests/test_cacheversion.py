@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test for cache version counters."""
+
+from __future__ import unicode_literals
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from weblate.utils.cacheversion import (
+    get_version, bump_version, invalidate_version,
+)
+
+
+class CacheVersionTest(SimpleTestCase):
+    key = 'test-version'
+
+    def tearDown(self):
+        cache.delete(self.key)
+
+    def test_bump(self):
+        version = get_version(self.key)
+        self.assertEqual(version, get_version(self.key))
+        bump_version(self.key)
+        self.assertGreater(get_version(self.key), version)
+
+    def test_evicted(self):
+        version = get_version(self.key)
+        cache.delete(self.key)
+        self.assertGreaterEqual(get_version(self.key), version)
+
+    def test_invalidate(self):
+        version = get_version(self.key)
+        invalidate_version(self.key)
+        self.assertGreater(get_version(self.key), version)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © 2012 - 2018 Michal Čihař <michal@cihar.com>
+#
+# This file is part of Weblate <https://weblate.org/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from unittest import SkipTest
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from weblate.utils.dblock import PostgreSQLLock
+from weblate.utils.filelock import FileLockException
+
+
+class PostgreSQLLockTest(TransactionTestCase):
+    # Not using TestCase as the test closes the database connection
+    def setUp(self):
+        if connection.vendor != 'postgresql':
+            raise SkipTest('Not supported')
+
+    def test_lock(self):
+        events = []
+        lock = PostgreSQLLock(
+            'test.lock',
+            on_acquire=events.append,
+            on_release=lambda: events.append(None),
+        )
+        with lock:
+            self.assertTrue(lock.is_locked)
+            with lock:
+                self.assertTrue(lock.is_locked)
+            self.assertTrue(lock.is_locked)
+        self.assertFalse(lock.is_locked)
+        self.assertFalse(lock.check_lock())
+        self.assertEqual(len(events), 2)
+
+    def test_ownership(self):
+        lock = PostgreSQLLock('test.lock')
+        other = PostgreSQLLock('test.lock', timeout=0.1)
+        with lock:
+            self.assertTrue(lock.check_lock())
+            self.assertTrue(other.check_lock())
+            self.assertRaises(FileLockException, other.acquire)
+            self.assertFalse(other.is_locked)
+            # Closing the thread connection does not release the lock
+            connection.close()
+            self.assertTrue(other.check_lock())
+        self.assertFalse(other.check_lock())
+        with other:
+            self.assertTrue(lock.check_lock())
+
+
+class UnsupportedLockTest(TestCase):
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            raise SkipTest('Supported')
+
+    def test_unsupported(self):
+        lock = PostgreSQLLock('test.lock')
+        self.assertRaises(ImproperlyConfigured, lock.acquire)
+        self.assertFalse(lock.is_locked)
@@ -55,6 +55,22 @@ class LockTest(TestCase, TempDirMixin):
         lock.release()
         self.assertFalse(lock.is_locked)
 
+    def test_callbacks(self):
+        """Test acquire and release callbacks."""
+        events = []
+        lock = FileLock(
+            self.testfile,
+            on_acquire=lambda wait: events.append(('acquire', wait)),
+            on_release=lambda: events.append(('release', None)),
+        )
+        with lock:
+            with lock:
+                self.assertEqual(len(events), 1)
+        self.assertEqual(
+            [event[0] for event in events], ['acquire', 'release']
+        )
+        self.assertGreaterEqual(events[0][1], 0)
+
     def test_lock_invalid(self):
         """Basic locking test."""
         lock = FileLock(os.path.join(self.tempdir, 'invalid', 'lock', 'path'))
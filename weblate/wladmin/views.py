@@ -28,10 +28,13 @@ from django.utils.translation import ugettext as _
 
 import six
 
-from weblate.trans.models import SubProject, IndexUpdate
+from weblate.trans.models import (
+    SubProject, IndexUpdate, PendingUpdate, PendingUnitUpdate,
+)
 from weblate import settings_example
 from weblate.accounts.avatar import HAS_LIBRAVATAR
 from weblate.trans.util import HAS_PYUCA, check_domain
+from weblate.trans.vcsprofile import get_profile
 from weblate.trans.ssh import (
     generate_ssh_key, get_key_data, add_host_key,
     get_host_keys, can_generate_key
@@ -142,6 +145,38 @@ def performance(request, admin_site):
             'production-indexing',
             IndexUpdate.objects.count(),
         ))
+    if settings.BACKGROUND_HOOKS:
+        update_stats = PendingUpdate.objects.stats()
+        if update_stats['due'] < 20 and not update_stats['failing']:
+            pending_updates = True
+        elif update_stats['due'] < 200:
+            pending_updates = None
+        else:
+            pending_updates = False
+
+        checks.append((
+            _('Repository updates processing'),
+            pending_updates,
+            'production-hooks',
+            _('%(due)d due, %(failing)d failing, %(pending)d pending') %
+            update_stats,
+        ))
+    if settings.BACKGROUND_UNIT_UPDATES:
+        update_stats = PendingUnitUpdate.objects.stats()
+        if update_stats['due'] < 20 and not update_stats['failing']:
+            pending_updates = True
+        elif update_stats['due'] < 200:
+            pending_updates = None
+        else:
+            pending_updates = False
+
+        checks.append((
+            _('Translation updates processing'),
+            pending_updates,
+            'production-unit-updates',
+            _('%(due)d due, %(failing)d failing, %(pending)d pending') %
+            update_stats,
+        ))
     # Check for sane caching
     caches = settings.CACHES['default']['BACKEND'].split('.')[-1]
     if caches in GOOD_CACHE:
@@ -234,6 +269,7 @@ def performance(request, admin_site):
     context = admin_site.each_context(request)
     context['checks'] = checks
     context['errors'] = ConfigurationError.objects.all()
+    context['vcs_profile'] = get_profile()[:20]
 
     return render(
         request,